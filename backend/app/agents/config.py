@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -13,6 +13,18 @@ class AgentConfig:
     voice_id: str  # ElevenLabs voice ID
     temperature: float = 0.7
     max_tokens: int = 150
+    greeting: Optional[str] = None  # Spoken as soon as a caller connects
+    model: Optional[str] = None  # defaults to the latency tier's model
+    stop: Optional[List[str]] = None  # stop sequences
+    latency_tier: str = "standard"  # "fast" routes to settings.OPENAI_FAST_MODEL
+
+
+# Phrases every agent may say, pre-synthesized at startup for instant playback
+PREFETCH_PHRASES: List[str] = [
+    "Hello, how can I help you?",
+    "Could you please repeat that?",
+    "Let me check that for you.",
+]
 
 
 # Agent configurations
@@ -36,6 +48,9 @@ Guidelines:
 - If you don't know something, offer to transfer or take a message
 - Confirm important information back to the caller""",
         voice_id='EXAVITQu4vr4xnSDxMaL',
+        greeting="Thank you for calling. How can I help you today?",
+        max_tokens=100,
+        latency_tier="fast",  # short, scripted answers; speed matters most
     ),
 
     'sales': AgentConfig(
@@ -58,6 +73,7 @@ Guidelines:
 - Keep responses concise (2-3 sentences)
 - Focus on value, not just features""",
         voice_id='21m00Tcm4TlvDq8ikWAM',
+        greeting="Hi there, thanks for reaching out! What are you looking for today?",
     ),
 
     'callcenter': AgentConfig(
@@ -80,6 +96,9 @@ Guidelines:
 - Keep responses brief and actionable
 - Stay calm under pressure""",
         voice_id='pNInz6obpgDQGcFmaJgB',
+        greeting="Hi, you've reached support. What seems to be the problem?",
+        temperature=0.3,  # step-by-step troubleshooting should be consistent
+        max_tokens=200,
     ),
 }
 
@@ -17,6 +17,113 @@ class Settings(BaseSettings):
 
     # OpenAI Settings
     OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_FAST_MODEL: str = "gpt-4.1-nano"  # agents with latency_tier="fast"
+
+    # Service providers: "api" (OpenAI and ElevenLabs) or "local" (deterministic
+    # stand-ins for offline load tests; no API keys needed)
+    PROVIDERS: str = "api"
+    LOCAL_LATENCY_DISTRIBUTION: str = "lognormal"  # "fixed", "uniform", "normal" or "lognormal"
+    LOCAL_LATENCY_JITTER: float = 0.25  # standard deviation as a fraction of the mean
+    LOCAL_STT_LATENCY_MS: float = 300.0
+    LOCAL_LLM_TTFT_MS: float = 250.0
+    LOCAL_LLM_TOKENS_PER_SECOND: float = 60.0  # 0 streams the whole response at once
+    LOCAL_TTS_TTFB_MS: float = 150.0
+    LOCAL_TTS_REALTIME_FACTOR: float = 4.0  # audio seconds delivered per second; 0 for unpaced
+    LOCAL_MAX_CONCURRENT: int = 0  # concurrent requests per provider; 0 for unlimited
+    LOCAL_SEED: int = 0
+    LOCAL_TRANSCRIPTS: str = "What are your hours?"  # "|"-separated, used in turn
+    LOCAL_RESPONSE: str = "We are open from nine to five, Monday through Friday."
+
+    # Shared HTTP client pools
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0  # seconds
+    HTTP_CONNECT_TIMEOUT: float = 5.0  # seconds
+    HTTP_READ_TIMEOUT: float = 30.0  # seconds
+    HTTP2_ENABLED: bool = True  # used when the h2 package is installed
+
+    # Streaming audio decode (one ffmpeg process per recording stream)
+    STREAMING_DECODER_ENABLED: bool = True
+    FFMPEG_PATH: str = "ffmpeg"
+    DECODER_SAMPLE_RATE: int = 16000
+
+    # Audio preparation before Whisper upload
+    STT_TRIM_SILENCE: bool = True
+    STT_SILENCE_THRESHOLD_DB: float = -40.0
+    STT_SILENCE_PADDING_MS: int = 150
+    STT_SAMPLE_RATE: int = 16000
+    STT_UPLOAD_FORMAT: str = "wav"  # "wav" or "opus" (requires ffmpeg with libopus)
+    STT_OPUS_BITRATE: str = "24k"
+
+    # Voice activity detection
+    VAD_FRAME_MS: int = 20
+    VAD_THRESHOLD_DB: float = -40.0
+    VAD_MIN_SPEECH_MS: int = 100
+    VAD_HANGOVER_MS: int = 500
+    VAD_PREROLL_MS: int = 300  # audio kept from before speech starts
+
+    # Speculative LLM generation during the VAD hangover
+    SPECULATIVE_LLM: bool = False  # costs an extra STT call, and an LLM call when speech resumes
+    SPECULATIVE_PAUSE_MS: int = 200  # silence before speculating (below VAD_HANGOVER_MS)
+    SPECULATIVE_MATCH_THRESHOLD: float = 0.9  # transcript similarity needed to commit
+
+    # Partial transcripts while the caller is speaking
+    STREAMING_STT: bool = False  # each pass is an extra STT request
+    STREAMING_STT_BACKEND: str = "whisper"
+    STREAMING_STT_INTERVAL_MS: int = 600  # new audio between passes
+    STREAMING_STT_WINDOW_MS: int = 10000  # longest window transcribed in one pass
+
+    # Audio worker pools (keeps DSP and ffmpeg calls off the event loop)
+    AUDIO_CPU_WORKERS: int = 2  # processes for NumPy work
+    AUDIO_IO_WORKERS: int = 4  # threads for blocking ffmpeg/pydub calls
+    AUDIO_MAX_PENDING: int = 32  # jobs queued or running before callers wait
+    AUDIO_QUEUE_TIMEOUT: float = 2.0  # seconds to wait for a slot before rejecting
+
+    # Per-session WebSocket queues
+    WS_INBOUND_QUEUE_SIZE: int = 64  # client messages buffered before reads pause
+    WS_OUTBOUND_QUEUE_SIZE: int = 256  # messages buffered before senders wait
+    WS_DRAIN_TIMEOUT: float = 1.0  # seconds to flush replies when a session ends
+    WS_AUDIO_FRAME_BYTES: int = 16384  # adjacent audio chunks are merged up to this size
+    WS_COALESCE_MS: int = 20  # longest wait for more audio before sending a short frame
+    JSON_SERIALIZER: str = "auto"  # "auto" (orjson when installed), "orjson" or "stdlib"
+
+    # Conversation history
+    HISTORY_TOKEN_BUDGET: int = 1500  # history tokens sent with each prompt
+    HISTORY_WINDOW_MESSAGES: int = 10  # history messages sent with each prompt
+    HISTORY_WINDOW_BLOCK: int = 6  # messages dropped at once, keeping prompt prefixes cacheable
+    HISTORY_MAX_TOKENS: int = 4000  # history tokens kept per session; older turns are evicted
+    HISTORY_SUMMARIZE: bool = False  # fold evicted turns into a summary (one extra LLM call)
+    HISTORY_SUMMARY_MAX_TOKENS: int = 150
+
+    # Session store (conversation history and metadata shared across workers)
+    SESSION_STORE: str = "memory"  # "memory" or "redis" (needs the redis extra)
+    REDIS_URL: str = "redis://localhost:6379/0"
+    SESSION_KEY_PREFIX: str = "voice-agent:session:"
+    SESSION_TTL: int = 3600  # seconds a session can be resumed after its last turn
+
+    # TTS phrase cache
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # in-memory tier
+    TTS_CACHE_DIR: str = ".cache/tts"  # on-disk tier; empty disables it
+    TTS_CACHE_DISK_MAX_BYTES: int = 64 * 1024 * 1024  # on-disk tier, LRU-evicted
+    TTS_CACHE_MAX_TEXT_CHARS: int = 0  # also cache any text this short; 0: pinned phrases only
+    TTS_CACHE_WARM: bool = True  # pre-synthesize PREFETCH_PHRASES at startup
+
+    # Per-turn tracing (receive, decode, VAD, STT, LLM, TTS and send spans)
+    TRACING_ENABLED: bool = False  # export a trace per turn
+    TRACING_EXPORTER: str = "log"  # "log" or "otlp"
+    OTLP_TRACES_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_STATUS_UPDATES: bool = False  # add per-stage timings to the idle status_update
+
+    # Prometheus metrics on /metrics
+    METRICS_ENABLED: bool = True
+    METRICS_LOOP_LAG_INTERVAL: float = 0.5  # seconds between event loop lag samples; 0 disables
+
+    # Event loop watchdog (logs a stack sample when a callback blocks the loop)
+    LOOP_WATCHDOG_ENABLED: bool = False
+    LOOP_WATCHDOG_THRESHOLD_MS: int = 100  # blocking longer than this is reported
+    LOOP_WATCHDOG_INTERVAL_MS: int = 100  # between checks from the watchdog thread
+    LOOP_WATCHDOG_STACK_LIMIT: int = 20  # innermost frames kept in the stack sample
 
     # CORS
     FRONTEND_URL: str = "http://localhost:3000"
@@ -1,6 +1,23 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.websocket.handlers import router as websocket_router
+from app.websocket.manager import manager
+from app.websocket.session_store import create_session_store
+from app.services.clients import ClientRegistry
+from app.services.audio_workers import AudioWorkerPool
+from app.services.history import HistoryManager
+from app.services.llm_service import LLMService
+from app.services.local_providers import LocalProviders
+from app.services.latency_stats import latency_summary
+from app.services.loop_watchdog import LoopWatchdog
+from app.services.metrics import REGISTRY, LoopLagMonitor, register_queue, register_session_metrics
+from app.services.tts_cache import PhraseCache, warm_cache
+from app.services.tts_service import TTSService
+from app.services.tracing import create_span_exporter, tracer
+from app.agents.config import AGENTS, PREFETCH_PHRASES
 from app.config import settings
 import logging
 
@@ -10,11 +27,79 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+register_session_metrics(manager)
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create process-wide resources on startup and release them on shutdown"""
+    # Pooled upstream HTTP clients, or local stand-ins for load tests
+    app.state.clients = ClientRegistry.create()
+    app.state.providers = LocalProviders.from_settings() if settings.PROVIDERS == "local" else None
+
+    # Session store and history (optionally summarizing evicted turns)
+    manager.store = create_session_store()
+    summarizer = None
+    if settings.HISTORY_SUMMARIZE and app.state.providers is not None:
+        summarizer = app.state.providers.create_services()[1].summarize
+    elif settings.HISTORY_SUMMARIZE and app.state.clients.openai is not None:
+        summarizer = LLMService(client=app.state.clients.openai).summarize
+    manager.history = HistoryManager.from_settings(summarizer=summarizer)
+
+    # Bounded process/thread pools keep audio work off the event loop
+    app.state.audio_pool = AudioWorkerPool.from_settings()
+    register_queue("audio_pool", lambda: [app.state.audio_pool.queue_depth])
+
+    # Loop lag for /metrics, and the opt-in stall watchdog
+    loop_lag = LoopLagMonitor(settings.METRICS_LOOP_LAG_INTERVAL)
+    if settings.METRICS_ENABLED:
+        loop_lag.start()
+    watchdog = LoopWatchdog.from_settings() if settings.LOOP_WATCHDOG_ENABLED else None
+    if watchdog is not None:
+        watchdog.start()
+
+    # Per-turn trace export
+    if settings.TRACING_ENABLED:
+        tracer.exporter = create_span_exporter()
+        tracer.start()
+
+    # Greetings and PREFETCH_PHRASES are pinned up front, with or without warming
+    app.state.tts_cache = None
+    if settings.TTS_CACHE_ENABLED:
+        greetings = [agent.greeting for agent in AGENTS.values() if agent.greeting]
+        app.state.tts_cache = PhraseCache.from_settings(pinned=[*greetings, *PREFETCH_PHRASES])
+
+    # Warm in the background so a slow TTS API never delays startup
+    warmer = None
+    if app.state.tts_cache is not None and settings.TTS_CACHE_WARM and settings.ELEVENLABS_API_KEY:
+        tts = TTSService(session=app.state.clients.elevenlabs, cache=app.state.tts_cache)
+        warmer = asyncio.create_task(warm_cache(tts, AGENTS.values(), PREFETCH_PHRASES))
+
+    try:
+        yield
+    finally:
+        if warmer is not None:
+            warmer.cancel()
+            await asyncio.gather(warmer, return_exceptions=True)
+
+        await loop_lag.stop()
+        if watchdog is not None:
+            watchdog.stop()
+        await app.state.clients.close()
+        await manager.store.close()
+        await tracer.close()
+        tracer.exporter = None
+        app.state.audio_pool.shutdown(wait=False)
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="Real-time voice agent with WebSocket"
+    description="Real-time voice agent with WebSocket",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -47,4 +132,18 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/stats/agents")
+async def agent_stats():
+    """Per-agent LLM latency (time to first token and total, p50/p95) in this worker"""
+    return latency_summary()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics for this worker"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,308 @@
+from dataclasses import dataclass
+import numpy as np
+
+# Floor used when converting silence to dBFS
+MIN_DBFS = -100.0
+
+# int16 full scale
+FULL_SCALE = 32768.0
+
+
+@dataclass
+class FrameStats:
+    """Per-frame statistics for a PCM buffer"""
+
+    dbfs: np.ndarray  # RMS level per frame
+    peak_dbfs: np.ndarray  # Peak level per frame
+    zero_crossing_rate: np.ndarray  # Fraction of sample pairs that change sign
+    frame_samples: int
+
+
+def to_float(samples: np.ndarray) -> np.ndarray:
+    """
+    Convert int16 samples to float32 in [-1.0, 1.0).
+
+    Args:
+        samples: int16 (or already float) samples
+
+    Returns:
+        float32 array
+    """
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / FULL_SCALE
+    return samples.astype(np.float32, copy=False)
+
+
+def from_float(samples: np.ndarray) -> np.ndarray:
+    """
+    Convert float samples back to int16 with clipping.
+
+    Args:
+        samples: float samples in [-1.0, 1.0]
+
+    Returns:
+        int16 array
+    """
+    return np.clip(np.round(samples * FULL_SCALE), -32768, 32767).astype(np.int16)
+
+
+def frame_signal(samples: np.ndarray, frame_samples: int) -> np.ndarray:
+    """
+    Split samples into non-overlapping frames, dropping the partial tail.
+
+    Args:
+        samples: 1-D sample array
+        frame_samples: Samples per frame
+
+    Returns:
+        Array shaped (n_frames, frame_samples) sharing memory with samples
+    """
+    n_frames = len(samples) // frame_samples
+    return samples[:n_frames * frame_samples].reshape(n_frames, frame_samples)
+
+
+def to_dbfs(amplitude: np.ndarray) -> np.ndarray:
+    """
+    Convert linear amplitude (0..1) to dBFS, floored at MIN_DBFS.
+
+    Args:
+        amplitude: Linear amplitude values
+
+    Returns:
+        dBFS values
+    """
+    amplitude = np.asarray(amplitude, dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        levels = 20.0 * np.log10(amplitude)
+    return np.maximum(levels, MIN_DBFS)
+
+
+def frame_rms(frames: np.ndarray) -> np.ndarray:
+    """
+    Compute the RMS amplitude of each frame.
+
+    Args:
+        frames: int16 or float array shaped (n_frames, frame_samples)
+
+    Returns:
+        Linear RMS amplitude per frame
+    """
+    normalized = to_float(frames)
+    return np.sqrt(np.mean(normalized * normalized, axis=-1))
+
+
+def frame_dbfs(frames: np.ndarray) -> np.ndarray:
+    """
+    Compute the RMS level of each frame in dBFS.
+
+    Args:
+        frames: int16 or float array shaped (n_frames, frame_samples)
+
+    Returns:
+        dBFS per frame, floored at MIN_DBFS
+
+    Test Cases:
+    - Should return MIN_DBFS for digital silence
+    - Should return ~0 dBFS for a full-scale square wave
+    """
+    return to_dbfs(frame_rms(frames))
+
+
+def peak_dbfs(samples: np.ndarray) -> float:
+    """
+    Compute the peak level of a buffer in dBFS.
+
+    Args:
+        samples: int16 or float samples
+
+    Returns:
+        Peak level, MIN_DBFS for empty or silent input
+    """
+    if samples.size == 0:
+        return MIN_DBFS
+    return float(to_dbfs(np.max(np.abs(to_float(samples)))))
+
+
+def zero_crossing_rate(frames: np.ndarray) -> np.ndarray:
+    """
+    Compute the zero-crossing rate of each frame.
+
+    Args:
+        frames: Array shaped (n_frames, frame_samples)
+
+    Returns:
+        Fraction of adjacent sample pairs that change sign, per frame
+
+    Test Cases:
+    - Should return 1.0 for an alternating signal
+    - Should return 0.0 for a constant signal
+    """
+    signs = np.signbit(frames)
+    return np.mean(signs[..., 1:] != signs[..., :-1], axis=-1)
+
+
+def clipped_fraction(samples: np.ndarray, threshold: float = 0.999) -> float:
+    """
+    Fraction of samples at or above threshold of full scale.
+
+    Args:
+        samples: int16 or float samples
+        threshold: Linear amplitude treated as clipped
+
+    Returns:
+        Fraction between 0.0 and 1.0
+
+    Test Cases:
+    - Should count full-scale samples as clipped
+    - Should return 0.0 for empty input
+    """
+    if samples.size == 0:
+        return 0.0
+    return float(np.mean(np.abs(to_float(samples)) >= threshold))
+
+
+def detect_clipping(
+    samples: np.ndarray,
+    threshold: float = 0.999,
+    max_fraction: float = 0.001
+) -> bool:
+    """
+    Whether a buffer is noticeably clipped.
+
+    Args:
+        samples: int16 or float samples
+        threshold: Linear amplitude treated as clipped
+        max_fraction: Clipped fraction tolerated before reporting clipping
+
+    Returns:
+        True if more than max_fraction of samples are clipped
+    """
+    return clipped_fraction(samples, threshold) > max_fraction
+
+
+def frame_stats(samples: np.ndarray, sample_rate: int, frame_ms: int = 20) -> FrameStats:
+    """
+    Compute level, peak and zero-crossing statistics for every frame.
+
+    Args:
+        samples: int16 samples
+        sample_rate: Sample rate in Hz
+        frame_ms: Frame length in milliseconds
+
+    Returns:
+        FrameStats
+
+    Test Cases:
+    - Should return one entry per whole frame
+    """
+    frame_samples = max(1, sample_rate * frame_ms // 1000)
+    frames = to_float(frame_signal(samples, frame_samples))
+
+    return FrameStats(
+        dbfs=frame_dbfs(frames),
+        peak_dbfs=to_dbfs(np.max(np.abs(frames), axis=-1, initial=0.0)),
+        zero_crossing_rate=zero_crossing_rate(frames),
+        frame_samples=frame_samples,
+    )
+
+
+def trim_silence(
+    samples: np.ndarray,
+    sample_rate: int,
+    threshold_db: float = -40.0,
+    frame_ms: int = 20,
+    padding_ms: int = 100
+) -> np.ndarray:
+    """
+    Remove leading and trailing silence.
+
+    Args:
+        samples: int16 samples
+        sample_rate: Sample rate in Hz
+        threshold_db: Frames at or below this level count as silence
+        frame_ms: Analysis frame length in milliseconds
+        padding_ms: Audio kept on each side of the detected speech
+
+    Returns:
+        Trimmed samples (a view), empty if everything is silent
+
+    Test Cases:
+    - Should trim leading and trailing silence
+    - Should keep padding around speech
+    - Should return empty for all-silent input
+    - Should keep audio shorter than one frame as-is
+    """
+    frame_samples = max(1, sample_rate * frame_ms // 1000)
+    if len(samples) < frame_samples:
+        return samples
+
+    loud = np.flatnonzero(frame_dbfs(frame_signal(samples, frame_samples)) > threshold_db)
+    if loud.size == 0:
+        return samples[:0]
+
+    padding = sample_rate * padding_ms // 1000
+    start = max(0, loud[0] * frame_samples - padding)
+    end = min(len(samples), (loud[-1] + 1) * frame_samples + padding)
+    return samples[start:end]
+
+
+def downmix(samples: np.ndarray, channels: int) -> np.ndarray:
+    """
+    Average interleaved channels to mono.
+
+    Args:
+        samples: Interleaved int16 samples
+        channels: Number of channels
+
+    Returns:
+        Mono int16 samples
+    """
+    if channels == 1:
+        return samples
+
+    frames = frame_signal(samples, channels).astype(np.int32)
+    return (frames.sum(axis=1) // channels).astype(np.int16)
+
+
+def _lowpass_kernel(cutoff: float, taps: int = 63) -> np.ndarray:
+    """Hann-windowed sinc low-pass filter; cutoff is a fraction of the sample rate."""
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hanning(taps)
+    return kernel / kernel.sum()
+
+
+def resample(samples: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
+    """
+    Resample int16 audio.
+
+    Downsampling applies a windowed-sinc anti-aliasing filter before
+    linear interpolation.
+
+    Args:
+        samples: int16 samples
+        orig_rate: Source sample rate in Hz
+        target_rate: Target sample rate in Hz
+
+    Returns:
+        int16 samples at target_rate
+
+    Test Cases:
+    - Should return input unchanged for equal rates
+    - Should scale the number of samples by the rate ratio
+    - Should preserve a tone below the new Nyquist frequency
+    - Should attenuate content above the new Nyquist frequency
+    """
+    if orig_rate == target_rate or samples.size == 0:
+        return samples
+
+    signal = to_float(samples)
+
+    if target_rate < orig_rate:
+        kernel = _lowpass_kernel(0.5 * target_rate / orig_rate * 0.9)
+        signal = np.convolve(signal, kernel, mode="same")
+
+    n_out = int(round(len(signal) * target_rate / orig_rate))
+    positions = np.arange(n_out) * (orig_rate / target_rate)
+    resampled = np.interp(positions, np.arange(len(signal)), signal)
+
+    return from_float(resampled)
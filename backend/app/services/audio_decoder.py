@@ -0,0 +1,232 @@
+import asyncio
+import contextlib
+from typing import List, Optional
+import numpy as np
+import logging
+
+from app.services.audio_analysis import MIN_DBFS, frame_dbfs, peak_dbfs
+
+logger = logging.getLogger(__name__)
+
+
+class PCMDecoder:
+    """
+    Per-session decoder for audio that is already 16-bit mono PCM.
+
+    Responsibilities:
+    - Turn incoming chunks into int16 sample arrays
+    - Keep running duration, level and peak statistics
+    - Define the interface shared with StreamingDecoder
+    """
+
+    def __init__(self, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.samples_decoded = 0
+        self.level_dbfs = MIN_DBFS  # RMS level of the most recent block
+        self.peak_dbfs = MIN_DBFS  # Highest sample level seen so far
+        self._remainder = b""
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio decoded so far."""
+        return self.samples_decoded / self.sample_rate
+
+    def is_silent(self, threshold: float = -40.0) -> bool:
+        """Whether the most recent block was below threshold dBFS."""
+        return self.level_dbfs < threshold
+
+    async def start(self) -> None:
+        """Prepare the decoder (no-op for PCM)."""
+
+    async def feed(self, chunk: bytes) -> np.ndarray:
+        """
+        Decode a chunk.
+
+        Args:
+            chunk: Encoded audio bytes
+
+        Returns:
+            int16 samples decoded so far that have not been returned yet
+
+        Test Cases:
+        - Should return samples for whole 16-bit words
+        - Should carry an odd trailing byte to the next chunk
+        - Should update duration and level
+        """
+        return self._take(chunk)
+
+    async def close(self) -> np.ndarray:
+        """
+        Finish decoding.
+
+        Returns:
+            Any remaining int16 samples
+        """
+        self._remainder = b""
+        return np.empty(0, dtype=np.int16)
+
+    def _take(self, data: bytes) -> np.ndarray:
+        """Convert raw s16le bytes to samples and update statistics."""
+        data = self._remainder + data
+        usable = len(data) - len(data) % 2
+        self._remainder = data[usable:]
+
+        samples = np.frombuffer(data, dtype="<i2", count=usable // 2).astype(np.int16)
+        self._account(samples)
+        return samples
+
+    def _account(self, samples: np.ndarray) -> None:
+        """Update running statistics from a block of samples."""
+        if samples.size == 0:
+            return
+
+        self.samples_decoded += samples.size
+        self.level_dbfs = float(frame_dbfs(samples[np.newaxis, :])[0])
+        self.peak_dbfs = max(self.peak_dbfs, peak_dbfs(samples))
+
+    def __repr__(self):
+        return f"{type(self).__name__}(sample_rate={self.sample_rate})"
+
+
+class StreamingDecoder(PCMDecoder):
+    """
+    Long-lived ffmpeg process that decodes a WebM/Opus stream incrementally.
+
+    One process is started per recording stream instead of spawning ffmpeg
+    for every chunk. Encoded chunks are written to its stdin as they arrive
+    and a reader task collects PCM from stdout.
+
+    Responsibilities:
+    - Decode WebM/Opus chunks to 16-bit mono PCM at sample_rate
+    - Return newly available samples on every feed
+    - Drain remaining output on close, killing a process that hangs
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        input_format: str = "webm",
+        ffmpeg_path: str = "ffmpeg",
+        close_timeout: float = 5.0
+    ):
+        super().__init__(sample_rate)
+        self.input_format = input_format
+        self.ffmpeg_path = ffmpeg_path
+        self.close_timeout = close_timeout  # seconds to wait for ffmpeg to flush and exit
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._output = bytearray()
+
+    def _command(self) -> List[str]:
+        """ffmpeg arguments for low-latency stdin → s16le stdout decoding."""
+        return [
+            self.ffmpeg_path,
+            "-hide_banner", "-loglevel", "error",
+            "-fflags", "nobuffer",
+            "-probesize", "32", "-analyzeduration", "0",
+            "-f", self.input_format, "-i", "pipe:0",
+            "-f", "s16le", "-acodec", "pcm_s16le",
+            "-ac", "1", "-ar", str(self.sample_rate),
+            "pipe:1",
+        ]
+
+    async def start(self) -> None:
+        """
+        Spawn the decoder process.
+
+        Test Cases:
+        - Should start the process once
+        """
+        if self._process is not None:
+            return
+
+        self._process = await asyncio.create_subprocess_exec(
+            *self._command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reader = asyncio.create_task(self._read_output(self._process.stdout))
+        logger.debug(f"Decoder started: pid {self._process.pid}")
+
+    async def feed(self, chunk: bytes) -> np.ndarray:
+        """
+        Write an encoded chunk and return PCM decoded so far.
+
+        Decoding is asynchronous, so samples for this chunk may arrive
+        with a later call.
+
+        Args:
+            chunk: WebM/Opus bytes
+
+        Returns:
+            Newly available int16 samples
+
+        Raises:
+            RuntimeError: If the decoder process has exited
+
+        Test Cases:
+        - Should return decoded samples across calls
+        - Should raise RuntimeError when the process died
+        """
+        await self.start()
+
+        if self._process.returncode is not None:
+            raise RuntimeError(f"Decoder exited with code {self._process.returncode}")
+
+        self._process.stdin.write(chunk)
+        await self._process.stdin.drain()
+
+        # Let the reader pick up anything ffmpeg has already produced
+        await asyncio.sleep(0)
+        return self._drain_output()
+
+    async def close(self) -> np.ndarray:
+        """
+        Close stdin, wait for ffmpeg to finish and return remaining samples.
+
+        A process that has not flushed and exited within close_timeout is
+        killed; whatever it produced until then is still returned.
+
+        Test Cases:
+        - Should return all remaining samples
+        - Should be safe to call when never started
+        - Should kill a process that does not exit within close_timeout
+        """
+        if self._process is None:
+            return np.empty(0, dtype=np.int16)
+
+        process, self._process = self._process, None
+        if process.stdin and not process.stdin.is_closing():
+            process.stdin.close()
+
+        try:
+            await asyncio.wait_for(self._reader, self.close_timeout)
+            returncode = await asyncio.wait_for(process.wait(), self.close_timeout)
+        except TimeoutError:
+            logger.warning(f"Decoder did not exit within {self.close_timeout}s, killing it")
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+            self._reader.cancel()
+            returncode = await process.wait()
+
+        if returncode != 0:
+            logger.warning(f"Decoder exited with code {returncode}")
+
+        samples = self._drain_output()
+        self._remainder = b""
+        return samples
+
+    async def _read_output(self, stdout: asyncio.StreamReader) -> None:
+        """Collect stdout until EOF."""
+        while True:
+            data = await stdout.read(65536)
+            if not data:
+                break
+            self._output.extend(data)
+
+    def _drain_output(self) -> np.ndarray:
+        """Take everything collected by the reader task."""
+        data = bytes(self._output)
+        self._output.clear()
+        return self._take(data)
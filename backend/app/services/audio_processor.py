@@ -1,7 +1,11 @@
 import io
+import wave
 from pydub import AudioSegment
+import numpy as np
 import logging
 
+from app.services.audio_analysis import FrameStats, frame_stats
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,6 +17,9 @@ class AudioProcessor:
     - Convert between audio formats
     - Validate audio data
     - Calculate audio properties
+
+    PCM buffers can be analyzed without decoding through pydub; see
+    app.services.audio_analysis for the vectorized helpers.
     """
 
     @staticmethod
@@ -95,4 +102,50 @@ class AudioProcessor:
 
         except Exception as e:
             logger.error(f"Duration calculation failed: {e}")
-            return 0.0
\ No newline at end of file
+            return 0.0
+
+    @staticmethod
+    def pcm_to_wav(pcm_bytes: bytes, sample_rate: int, channels: int = 1) -> bytes:
+        """
+        Wrap 16-bit PCM in a WAV container.
+
+        Args:
+            pcm_bytes: 16-bit little-endian PCM
+            sample_rate: Sample rate in Hz
+            channels: Number of interleaved channels
+
+        Returns:
+            WAV file bytes
+
+        Test Cases:
+        - Should produce a readable WAV with the same frames
+        - Should record sample rate and channel count
+        """
+        output = io.BytesIO()
+        with wave.open(output, "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm_bytes)
+
+        return output.getvalue()
+
+    @staticmethod
+    def analyze_pcm(pcm_bytes: bytes, sample_rate: int, frame_ms: int = 20) -> FrameStats:
+        """
+        Compute per-frame level, peak and zero-crossing statistics.
+
+        Args:
+            pcm_bytes: 16-bit little-endian mono PCM
+            sample_rate: Sample rate in Hz
+            frame_ms: Frame length in milliseconds
+
+        Returns:
+            FrameStats with one entry per whole frame
+
+        Test Cases:
+        - Should return one entry per frame
+        - Should ignore a trailing partial sample
+        """
+        samples = np.frombuffer(pcm_bytes, dtype="<i2", count=len(pcm_bytes) // 2)
+        return frame_stats(samples, sample_rate, frame_ms)
@@ -0,0 +1,173 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+import functools
+import multiprocessing
+import logging
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AudioPoolSaturated(RuntimeError):
+    """Raised when no worker slot frees up within the queue timeout"""
+
+
+class AudioWorkerPool:
+    """
+    Async facade that keeps audio work off the event loop.
+
+    Responsibilities:
+    - Run CPU-bound NumPy work in a bounded process pool
+    - Run subprocess-bound work (pydub/ffmpeg) in a thread pool
+    - Apply backpressure with a bounded number of pending jobs
+    - Expose queue depth and throughput counters
+    """
+
+    def __init__(
+        self,
+        cpu_workers: int = 2,
+        io_workers: int = 4,
+        max_pending: int = 32,
+        queue_timeout: float = 2.0
+    ):
+        # forkserver avoids forking a process that is running an event loop
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+
+        self._cpu: Executor = ProcessPoolExecutor(max_workers=cpu_workers, mp_context=context)
+        self._io: Executor = ThreadPoolExecutor(
+            max_workers=io_workers,
+            thread_name_prefix="audio-io"
+        )
+        self._slots = asyncio.Semaphore(max_pending)
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+
+        # Counters
+        self.waiting = 0  # jobs blocked on backpressure
+        self.in_flight = 0  # jobs handed to an executor (queued or running)
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls) -> "AudioWorkerPool":
+        return cls(
+            cpu_workers=settings.AUDIO_CPU_WORKERS,
+            io_workers=settings.AUDIO_IO_WORKERS,
+            max_pending=settings.AUDIO_MAX_PENDING,
+            queue_timeout=settings.AUDIO_QUEUE_TIMEOUT,
+        )
+
+    async def run_cpu(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run a picklable, CPU-bound function in the process pool.
+
+        Args:
+            fn: Module-level function
+            *args: Picklable arguments
+
+        Returns:
+            Function result
+
+        Raises:
+            AudioPoolSaturated: If the pool stays full for queue_timeout seconds
+        """
+        return await self._submit(self._cpu, fn, args)
+
+    async def run_io(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking, subprocess- or IO-bound function in the thread pool.
+
+        Args:
+            fn: Callable
+            *args: Arguments
+
+        Returns:
+            Function result
+
+        Raises:
+            AudioPoolSaturated: If the pool stays full for queue_timeout seconds
+        """
+        return await self._submit(self._io, fn, args)
+
+    async def _submit(self, executor: Executor, fn: Callable[..., T], args: tuple) -> T:
+        """
+        Wait for a slot, then run fn in executor.
+
+        The slot is held until the job finishes, even when the caller is
+        cancelled (e.g. on barge-in): executor jobs cannot be interrupted,
+        so releasing early would let abandoned work pile up past max_pending.
+
+        Test Cases:
+        - Should keep the slot of a cancelled caller until its job completes
+        """
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except TimeoutError:
+            self.rejected += 1
+            logger.warning(f"Audio pool saturated: {self.in_flight} jobs in flight")
+            raise AudioPoolSaturated("Audio processing is overloaded")
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            job = loop.run_in_executor(executor, functools.partial(fn, *args))
+        except BaseException:
+            self.in_flight -= 1
+            self._slots.release()
+            raise
+
+        job.add_done_callback(self._job_done)
+        # Shielded so cancelling the caller leaves the job (and its slot) running
+        return await asyncio.shield(job)
+
+    def _job_done(self, job: asyncio.Future) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+        if job.cancelled() or job.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a slot plus jobs handed to an executor."""
+        return self.waiting + self.in_flight
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Snapshot of pool counters.
+
+        Test Cases:
+        - Should report completed, failed and rejected jobs
+        """
+        return {
+            'waiting': self.waiting,
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth,
+            'max_pending': self.max_pending,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop both executors.
+
+        Args:
+            wait: Wait for running jobs to finish
+        """
+        self._cpu.shutdown(wait=wait, cancel_futures=True)
+        self._io.shutdown(wait=wait, cancel_futures=True)
+
+    def __repr__(self):
+        return f"AudioWorkerPool(queue_depth={self.queue_depth})"
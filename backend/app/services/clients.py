@@ -0,0 +1,102 @@
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from app.config import settings
+from typing import Optional
+import aiohttp
+import httpx
+import importlib.util
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """Whether httpx can negotiate HTTP/2 (requires the optional h2 package)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ClientRegistry:
+    """
+    Application-lifetime HTTP clients shared by every session.
+
+    Responsibilities:
+    - Own one pooled OpenAI client (STT + LLM) and one ElevenLabs session (TTS)
+    - Keep connections alive between turns to skip TCP/TLS setup
+    - Close all pools on shutdown
+    """
+
+    def __init__(
+        self,
+        openai: Optional[AsyncOpenAI],
+        elevenlabs: aiohttp.ClientSession
+    ):
+        self.openai = openai
+        self.elevenlabs = elevenlabs
+
+    @classmethod
+    def create(cls) -> "ClientRegistry":
+        """
+        Build pooled clients from settings.
+
+        Must be called from a running event loop (aiohttp binds to it).
+
+        Returns:
+            ClientRegistry
+
+        Test Cases:
+        - Should create an ElevenLabs session with a pooled connector
+        - Should create an OpenAI client when an API key is configured
+        - Should skip the OpenAI client when no API key is configured
+        """
+        openai_client = None
+        if settings.OPENAI_API_KEY:
+            http_client = DefaultAsyncHttpxClient(
+                http2=settings.HTTP2_ENABLED and http2_available(),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(
+                    settings.HTTP_READ_TIMEOUT,
+                    connect=settings.HTTP_CONNECT_TIMEOUT,
+                ),
+            )
+            openai_client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                http_client=http_client,
+            )
+        else:
+            logger.warning("OPENAI_API_KEY not set; services will build clients on demand")
+
+        # aiohttp has no HTTP/2 support, so rely on keep-alive pooling instead
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_MAX_CONNECTIONS,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_EXPIRY,
+            ttl_dns_cache=300,
+        )
+        elevenlabs_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=None,
+                sock_connect=settings.HTTP_CONNECT_TIMEOUT,
+                sock_read=settings.HTTP_READ_TIMEOUT,
+            ),
+        )
+
+        return cls(openai=openai_client, elevenlabs=elevenlabs_session)
+
+    async def close(self) -> None:
+        """
+        Close all pooled connections.
+
+        Test Cases:
+        - Should close the OpenAI client and ElevenLabs session
+        - Should handle a missing OpenAI client
+        """
+        if self.openai is not None:
+            await self.openai.close()
+
+        await self.elevenlabs.close()
+
+    def __repr__(self):
+        return "ClientRegistry()"
@@ -0,0 +1,203 @@
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional
+import logging
+
+from app.config import settings
+
+try:
+    import tiktoken
+except ImportError:  # optional: pip install ".[tokenizer]"
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, str]
+
+# Per-message formatting overhead of the chat completions API
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Rough tokens per character for English when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        return tiktoken.encoding_for_model(settings.OPENAI_MODEL)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in text.
+
+    Uses tiktoken when installed, otherwise a character-based estimate.
+    Results are cached, so each history message is tokenized once however
+    many prompts it appears in.
+
+    Test Cases:
+    - Should return 0 for empty text
+    - Should grow with the text length
+    """
+    if not text:
+        return 0
+
+    if tiktoken is not None:
+        return len(_encoding().encode(text))
+
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def message_tokens(message: Message) -> int:
+    """Tokens a message takes up in a prompt."""
+    return count_tokens(message.get('content') or "") + MESSAGE_OVERHEAD_TOKENS
+
+
+def select_window(
+    history: List[Message],
+    max_tokens: int,
+    max_messages: Optional[int] = None,
+    block: int = 1
+) -> List[Message]:
+    """
+    Pick the most recent messages that fit a prompt budget.
+
+    A leading system message (the summary of evicted turns) is always kept
+    and counts against the budget.
+
+    The window start only moves in steps of block messages. Between steps
+    each prompt extends the previous one, so the provider can reuse its
+    cached prefix instead of re-reading a window that shifts every turn.
+
+    Args:
+        history: Conversation history, oldest first
+        max_tokens: Token budget for the selected messages
+        max_messages: Optional cap on the number of messages
+        block: Messages dropped at once when the window has to move
+
+    Returns:
+        Selected messages, oldest first
+
+    Test Cases:
+    - Should keep the newest messages within max_tokens
+    - Should cap the number of messages
+    - Should keep a leading summary message
+    - Should keep the same start for appended history until a block is dropped
+    """
+    pinned: List[Message] = []
+    if history and history[0].get('role') == "system":
+        pinned, history = history[:1], history[1:]
+
+    budget = max_tokens - sum(message_tokens(m) for m in pinned)
+    limit = len(history) if max_messages is None else max(max_messages - len(pinned), 0)
+
+    start = len(history)
+    while start > 0 and len(history) - start < limit:
+        cost = message_tokens(history[start - 1])
+        if cost > budget:
+            break
+        budget -= cost
+        start -= 1
+
+    # Round up to a block boundary so the start stays put for several turns,
+    # unless that would leave no history at all
+    aligned = -(-start // block) * block
+    if aligned < len(history):
+        start = aligned
+
+    return pinned + history[start:]
+
+
+class HistoryManager:
+    """
+    Keeps per-session conversation history bounded.
+
+    Responsibilities:
+    - Evict the oldest messages once a session holds more than max_tokens,
+      in whole blocks so prompt window boundaries stay aligned
+    - Fold evicted turns into a running summary when a summarizer is set
+    - Build the history sent with each prompt (summary first)
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 4000,
+        summarizer: Optional[Callable[[str, List[Message]], Awaitable[str]]] = None,
+        block: int = 1
+    ):
+        self.max_tokens = max_tokens
+        self.summarizer = summarizer
+        self.block = block
+
+    @classmethod
+    def from_settings(
+        cls,
+        summarizer: Optional[Callable[[str, List[Message]], Awaitable[str]]] = None
+    ) -> "HistoryManager":
+        return cls(
+            max_tokens=settings.HISTORY_MAX_TOKENS,
+            summarizer=summarizer if settings.HISTORY_SUMMARIZE else None,
+            block=settings.HISTORY_WINDOW_BLOCK,
+        )
+
+    def trim(self, history: List[Message]) -> List[Message]:
+        """
+        Evict the oldest messages, in place, down to max_tokens.
+
+        Messages are evicted in multiples of block (so select_window's block
+        boundaries do not shift); the newest message is always kept.
+
+        Args:
+            history: Session history, oldest first
+
+        Returns:
+            Evicted messages, oldest first
+
+        Test Cases:
+        - Should leave history within max_tokens untouched
+        - Should evict the oldest messages first
+        - Should keep the newest message even when it alone is over budget
+        - Should evict whole blocks
+        """
+        total = sum(message_tokens(m) for m in history)
+
+        evict = 0
+        while total > self.max_tokens and evict < len(history) - 1:
+            total -= message_tokens(history[evict])
+            evict += 1
+
+        if evict:
+            evict = min(-(-evict // self.block) * self.block, len(history) - 1)
+
+        evicted = history[:evict]
+        del history[:evict]
+        return evicted
+
+    async def summarize(self, summary: str, evicted: List[Message]) -> str:
+        """
+        Fold evicted messages into the running summary.
+
+        Returns the summary unchanged when no summarizer is configured.
+        """
+        if self.summarizer is None or not evicted:
+            return summary
+
+        return await self.summarizer(summary, evicted)
+
+    @staticmethod
+    def prompt_history(history: List[Message], summary: str = "") -> List[Message]:
+        """History to send with a prompt: the summary, then the kept messages."""
+        if not summary:
+            return history
+
+        return [{'role': 'system', 'content': SUMMARY_PREFIX + summary}, *history]
+
+    def __repr__(self):
+        return (
+            f"HistoryManager(max_tokens={self.max_tokens}, block={self.block}, "
+            f"summarize={self.summarizer is not None})"
+        )
@@ -0,0 +1,79 @@
+from collections import deque
+from typing import Deque, Dict, Optional
+import math
+
+
+def percentile(samples: Deque[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100) of samples, or None when empty."""
+    if not samples:
+        return None
+
+    ordered = sorted(samples)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class LatencyStats:
+    """
+    Rolling LLM latency for one agent.
+
+    Keeps the last window samples of time to first token and total
+    completion time, plus lifetime request and error counts.
+    """
+
+    def __init__(self, window: int = 512):
+        self.ttft: Deque[float] = deque(maxlen=window)
+        self.total: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, total: float, ttft: Optional[float] = None) -> None:
+        """Record a completed request (seconds)."""
+        self.requests += 1
+        self.total.append(total)
+        if ttft is not None:
+            self.ttft.append(ttft)
+
+    def record_error(self) -> None:
+        self.requests += 1
+        self.errors += 1
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """
+        Counts and p50/p95 latencies in milliseconds.
+
+        Test Cases:
+        - Should report None percentiles without samples
+        - Should report percentiles in milliseconds
+        """
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'ttft_p50_ms': ms(percentile(self.ttft, 50)),
+            'ttft_p95_ms': ms(percentile(self.ttft, 95)),
+            'total_p50_ms': ms(percentile(self.total, 50)),
+            'total_p95_ms': ms(percentile(self.total, 95)),
+        }
+
+    def __repr__(self):
+        return f"LatencyStats(requests={self.requests}, errors={self.errors})"
+
+
+# Process-wide stats: agent_id -> LatencyStats
+_AGENT_LATENCY: Dict[str, LatencyStats] = {}
+
+
+def agent_latency(agent_id: str) -> LatencyStats:
+    """Stats for an agent, created on first use."""
+    stats = _AGENT_LATENCY.get(agent_id)
+    if stats is None:
+        stats = _AGENT_LATENCY[agent_id] = LatencyStats()
+    return stats
+
+
+def latency_summary() -> Dict[str, Dict[str, Optional[float]]]:
+    """Summaries for every agent that has made a request."""
+    return {agent_id: stats.summary() for agent_id, stats in sorted(_AGENT_LATENCY.items())}
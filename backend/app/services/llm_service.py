@@ -1,30 +1,131 @@
 from openai import AsyncOpenAI
 from app.config import settings
-from typing import List, Dict
+from app.services.providers import LanguageModel
+from app.services.history import select_window
+from app.services.latency_stats import agent_latency
+from app.services.metrics import UpstreamTimer, observe_upstream
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Dict, Optional
 import logging
+import time
+
+if TYPE_CHECKING:
+    from app.agents.config import AgentConfig
 
 logger = logging.getLogger(__name__)
 
 
-class LLMService:
+@dataclass(frozen=True)
+class ModelParams:
+    """Generation parameters for one agent"""
+
+    model: Optional[str] = None  # None: settings.OPENAI_MODEL
+    temperature: float = 0.7
+    max_tokens: int = 150  # Keep responses concise for voice
+    stop: Optional[List[str]] = None
+    agent_id: str = "default"  # latency stats are kept per agent
+
+    @classmethod
+    def for_agent(cls, agent: "AgentConfig") -> "ModelParams":
+        """
+        Parameters from an agent config; fast-tier agents get the smaller model.
+
+        Test Cases:
+        - Should use the agent's model when set
+        - Should route fast-tier agents to OPENAI_FAST_MODEL
+        - Should carry temperature, max_tokens and stop sequences
+        """
+        model = agent.model
+        if model is None and agent.latency_tier == "fast":
+            model = settings.OPENAI_FAST_MODEL
+
+        return cls(
+            model=model,
+            temperature=agent.temperature,
+            max_tokens=agent.max_tokens,
+            stop=agent.stop,
+            agent_id=agent.id,
+        )
+
+    def request_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for chat.completions.create()."""
+        kwargs: Dict[str, Any] = {
+            'model': self.model or settings.OPENAI_MODEL,
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+        }
+        if self.stop:
+            kwargs['stop'] = self.stop
+        return kwargs
+
+
+@dataclass(frozen=True)
+class PromptUsage:
+    """Token usage of one completion, including the prompt tokens served from cache"""
+
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    @classmethod
+    def from_openai(cls, usage: Any) -> Optional["PromptUsage"]:
+        """Read an OpenAI CompletionUsage; None when the response carried none."""
+        if usage is None:
+            return None
+
+        def count(value: Any) -> int:
+            return value if isinstance(value, int) else 0
+
+        details = getattr(usage, 'prompt_tokens_details', None)
+        return cls(
+            prompt_tokens=count(getattr(usage, 'prompt_tokens', 0)),
+            cached_tokens=count(getattr(details, 'cached_tokens', 0)),
+            completion_tokens=count(getattr(usage, 'completion_tokens', 0)),
+        )
+
+
+class ChatResult(str):
+    """Response text that also carries the completion's token usage"""
+
+    usage: Optional[PromptUsage]
+
+    def __new__(cls, text: str, usage: Optional[PromptUsage] = None):
+        result = super().__new__(cls, text)
+        result.usage = usage
+        return result
+
+
+class LLMService(LanguageModel):
     """
     LLM service using OpenAI GPT.
 
     Responsibilities:
     - Generate conversational responses
     - Maintain conversation context
+    - Keep prompt prefixes stable so the provider's prompt cache is reused
     - Handle errors and retries
     """
 
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        # Prefer the shared pooled client; fall back to a private one
+        if client is None:
+            client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = client
+
+        # Usage of the last completed stream_chat() (chat() returns it with the text)
+        self.last_usage: Optional[PromptUsage] = None
 
     async def chat(
         self,
         message: str,
         agent_prompt: str,
-        conversation_history: List[Dict[str, str]] = None
-    ) -> str:
+        conversation_history: List[Dict[str, str]] = None,
+        params: Optional[ModelParams] = None
+    ) -> ChatResult:
         """
         Get LLM response.
 
@@ -32,9 +133,11 @@ class LLMService:
             message: User's message
             agent_prompt: System prompt for agent role
             conversation_history: Previous messages (list of dicts)
+            params: Agent generation parameters (defaults to ModelParams())
 
         Returns:
-            LLM response text
+            LLM response text; its usage attribute holds prompt, cached and
+            completion token counts
 
         Raises:
             ValueError: If message or agent_prompt is empty
@@ -47,45 +150,192 @@ class LLMService:
         - Should handle conversation history correctly
         - Should limit response length
         - Should handle API errors gracefully
+        - Should report cached prompt tokens
+        - Should use the agent's model parameters
         """
 
-        if not message or message.strip() == "":
-            raise ValueError("Message cannot be empty")
-
-        if not agent_prompt or agent_prompt.strip() == "":
-            raise ValueError("Agent prompt cannot be empty")
+        messages = self._build_messages(message, agent_prompt, conversation_history)
+        params = params or ModelParams()
+        stats = agent_latency(params.agent_id)
+        started = time.perf_counter()
 
         try:
-            # Build messages
-            messages = [
-                {"role": "system", "content": agent_prompt}
-            ]
+            # Call GPT API
+            with observe_upstream("openai", "llm"):
+                response = await self.client.chat.completions.create(
+                    messages=messages,
+                    **params.request_kwargs(),
+                )
 
-            # Add conversation history (limit to last 10 turns)
-            if conversation_history:
-                # Keep only last 10 messages to avoid token limits
-                recent_history = conversation_history[-10:]
-                messages.extend(recent_history)
+            response_text = response.choices[0].message.content
+            usage = PromptUsage.from_openai(getattr(response, 'usage', None))
+            self.last_usage = usage
+            stats.record(time.perf_counter() - started)
+            logger.info(
+                f"LLM response generated: {len(response_text)} chars{self._describe(usage)}"
+            )
 
-            # Add current message
-            messages.append({"role": "user", "content": message})
+            return ChatResult(response_text, usage)
 
-            # Call GPT API
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
+        except Exception as e:
+            stats.record_error()
+            logger.error(f"LLM generation failed: {e}", exc_info=True)
+            raise
+
+    async def stream_chat(
+        self,
+        message: str,
+        agent_prompt: str,
+        conversation_history: List[Dict[str, str]] = None,
+        params: Optional[ModelParams] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream LLM response tokens as they are generated.
+
+        Args:
+            message: User's message
+            agent_prompt: System prompt for agent role
+            conversation_history: Previous messages (list of dicts)
+            params: Agent generation parameters (defaults to ModelParams())
+
+        Yields:
+            Text deltas in generation order (token usage is left in last_usage)
+
+        Raises:
+            ValueError: If message or agent_prompt is empty
+            Exception: If API call fails
+
+        Test Cases:
+        - Should yield text deltas in order
+        - Should skip chunks without content
+        - Should raise ValueError for empty message
+        - Should close the upstream stream when the consumer stops early
+        - Should record cached prompt tokens from the final usage chunk
+        - Should record time to first token per agent
+        """
+
+        messages = self._build_messages(message, agent_prompt, conversation_history)
+        params = params or ModelParams()
+        stats = agent_latency(params.agent_id)
+        self.last_usage = None
+        started = time.perf_counter()
+        upstream = UpstreamTimer("openai", "llm")
+        ttft = None
+
+        try:
+            stream = await self.client.chat.completions.create(
                 messages=messages,
-                temperature=0.7,
-                max_tokens=150,  # Keep responses concise for voice
+                stream=True,
+                stream_options={"include_usage": True},
+                **params.request_kwargs(),
             )
 
-            response_text = response.choices[0].message.content
-            logger.info(f"LLM response generated: {len(response_text)} chars")
+            char_count = 0
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        # The last chunk carries usage only
+                        usage = PromptUsage.from_openai(getattr(chunk, 'usage', None))
+                        if usage is not None:
+                            self.last_usage = usage
+                        continue
 
-            return response_text
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        if ttft is None:
+                            ttft = time.perf_counter() - started
+                            upstream.first_byte()
+                        char_count += len(delta)
+                        yield delta
+            finally:
+                # Release the HTTP response if the consumer stopped early
+                await stream.close()
+
+            stats.record(time.perf_counter() - started, ttft)
+            upstream.done()
+            logger.info(f"LLM stream complete: {char_count} chars{self._describe(self.last_usage)}")
 
         except Exception as e:
-            logger.error(f"LLM generation failed: {e}", exc_info=True)
+            stats.record_error()
+            upstream.failed()
+            logger.error(f"LLM streaming failed: {e}", exc_info=True)
             raise
 
+    async def summarize(self, summary: str, evicted: List[Dict[str, str]]) -> str:
+        """
+        Fold messages evicted from the history into a running summary.
+
+        Args:
+            summary: Summary so far (may be empty)
+            evicted: Messages dropped from the history, oldest first
+
+        Returns:
+            Updated summary
+
+        Test Cases:
+        - Should include the previous summary and evicted messages in the prompt
+        - Should return the model's summary text
+        """
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in evicted)
+        if summary:
+            transcript = f"Summary so far: {summary}\n\n{transcript}"
+
+        with observe_upstream("openai", "summary"):
+            response = await self.client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": (
+                        "Summarize this phone conversation in a few sentences. "
+                        "Keep names, numbers, requests and anything the caller was promised."
+                    )},
+                    {"role": "user", "content": transcript},
+                ],
+                temperature=0,
+                max_tokens=settings.HISTORY_SUMMARY_MAX_TOKENS,
+            )
+
+        return response.choices[0].message.content.strip()
+
+    @staticmethod
+    def _build_messages(
+        message: str,
+        agent_prompt: str,
+        conversation_history: List[Dict[str, str]] = None
+    ) -> List[Dict[str, str]]:
+        """Validate input and build the chat message list."""
+
+        if not message or message.strip() == "":
+            raise ValueError("Message cannot be empty")
+
+        if not agent_prompt or agent_prompt.strip() == "":
+            raise ValueError("Agent prompt cannot be empty")
+
+        # Build messages: the system prompt and older history form a prefix
+        # that stays byte-identical across turns, so the provider can cache it
+        messages = [
+            {"role": "system", "content": agent_prompt}
+        ]
+
+        # Add the most recent history that fits the prompt budget; the window
+        # start moves in blocks rather than sliding every turn
+        if conversation_history:
+            messages.extend(select_window(
+                conversation_history,
+                max_tokens=settings.HISTORY_TOKEN_BUDGET,
+                max_messages=settings.HISTORY_WINDOW_MESSAGES,
+                block=settings.HISTORY_WINDOW_BLOCK,
+            ))
+
+        # Add current message
+        messages.append({"role": "user", "content": message})
+
+        return messages
+
+    @staticmethod
+    def _describe(usage: Optional[PromptUsage]) -> str:
+        if usage is None:
+            return ""
+        return f", {usage.prompt_tokens} prompt tokens ({usage.cached_tokens} cached)"
+
     def __repr__(self):
         return "LLMService()"
\ No newline at end of file
@@ -0,0 +1,392 @@
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import contextlib
+import logging
+import math
+import random
+import re
+import time
+import numpy as np
+
+from app.config import settings
+from app.services.history import message_tokens
+from app.services.latency_stats import agent_latency
+from app.services.llm_service import ChatResult, LLMService, ModelParams, PromptUsage
+from app.services.metrics import UpstreamTimer, observe_upstream
+from app.services.providers import LanguageModel, SpeechToText, TextToSpeech
+from app.services.stt_preprocessor import STTPreprocessor
+
+logger = logging.getLogger(__name__)
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+@dataclass
+class LatencyDistribution:
+    """
+    Seeded latency samples for a stand-in provider.
+
+    mean_ms and jitter_ms (standard deviation; half-width for uniform)
+    describe the distribution; the same seed gives the same sequence.
+    """
+
+    mean_ms: float = 0.0
+    jitter_ms: float = 0.0
+    kind: str = "lognormal"  # "fixed", "uniform", "normal" or "lognormal"
+    seed: int = 0
+    _random: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.kind}")
+        self._random = random.Random(self.seed)
+
+    def sample(self) -> float:
+        """
+        Next latency in seconds (never negative).
+
+        Test Cases:
+        - Should return mean_ms for a fixed distribution
+        - Should repeat the same sequence for the same seed
+        """
+        if self.mean_ms <= 0:
+            return 0.0
+
+        if self.kind == "fixed" or self.jitter_ms <= 0:
+            value = self.mean_ms
+        elif self.kind == "uniform":
+            low, high = self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms
+            value = self._random.uniform(low, high)
+        elif self.kind == "normal":
+            value = self._random.gauss(self.mean_ms, self.jitter_ms)
+        else:
+            # Parameterized so the samples keep mean_ms and jitter_ms
+            sigma2 = math.log(1 + (self.jitter_ms / self.mean_ms) ** 2)
+            mu = math.log(self.mean_ms) - sigma2 / 2
+            value = self._random.lognormvariate(mu, math.sqrt(sigma2))
+
+        return max(value, 0.0) / 1000
+
+    async def wait(self) -> None:
+        await asyncio.sleep(self.sample())
+
+
+class ThroughputLimit:
+    """
+    Concurrent request cap shared by every session, like a provider quota.
+
+    Requests over the cap wait for a slot, so queueing delay shows up in
+    the measured latency the way it would against a throttled API.
+    """
+
+    def __init__(self, max_concurrent: int = 0):
+        self.max_concurrent = max_concurrent  # 0 for unlimited
+        self._semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent > 0 else None
+        self.in_flight = 0
+        self.peak = 0
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def __repr__(self):
+        return f"ThroughputLimit(max_concurrent={self.max_concurrent}, in_flight={self.in_flight})"
+
+
+class LocalSTTService(SpeechToText):
+    """
+    Fake transcriber: returns canned transcripts after a sampled delay.
+
+    PCM goes through the same STTPreprocessor as STTService (downmix, trim,
+    resample and encode, in the worker pool when it has one), so that work
+    is part of what gets measured; only the upload is replaced. Silent PCM
+    transcribes to "" without a request. Transcripts are used in turn,
+    cycling.
+    """
+
+    def __init__(
+        self,
+        transcripts: List[str],
+        latency: LatencyDistribution,
+        limit: Optional[ThroughputLimit] = None,
+        preprocessor: Optional[STTPreprocessor] = None
+    ):
+        self.transcripts = transcripts
+        self.latency = latency
+        self.limit = limit or ThroughputLimit()
+        self.preprocessor = preprocessor or STTPreprocessor()
+        self.requests = 0
+        self.bytes_uploaded = 0
+
+    async def transcribe_pcm(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        channels: int = 1
+    ) -> str:
+        prepared = await self.preprocessor.prepare(samples, sample_rate, channels)
+        if prepared is None:
+            return ""
+
+        return await self.transcribe(prepared.data, filename=prepared.filename)
+
+    async def transcribe(self, audio_bytes: bytes, filename: str = "audio.webm") -> str:
+        if not audio_bytes:
+            raise ValueError("Audio bytes cannot be empty")
+
+        with observe_upstream("local", "stt"):
+            async with self.limit.slot():
+                await self.latency.wait()
+
+        transcript = self.transcripts[self.requests % len(self.transcripts)]
+        self.requests += 1
+        self.bytes_uploaded += len(audio_bytes)
+        return transcript
+
+    def __repr__(self):
+        return f"LocalSTTService(requests={self.requests})"
+
+
+def split_tokens(text: str) -> List[str]:
+    """Split text into word-sized deltas that join back to text."""
+    return re.findall(r"\s*\S+", text)
+
+
+class LocalLLMService(LanguageModel):
+    """
+    Canned-token streamer.
+
+    Prompts are built and windowed exactly like LLMService, so history
+    handling is part of what gets measured; only the model is replaced.
+    The response streams after a sampled time to first token, then at
+    tokens_per_second. Latency is recorded in the per-agent stats.
+    """
+
+    def __init__(
+        self,
+        response: str,
+        ttft: LatencyDistribution,
+        tokens_per_second: float = 0.0,
+        limit: Optional[ThroughputLimit] = None
+    ):
+        self.response = response
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second  # 0 for no pacing
+        self.limit = limit or ThroughputLimit()
+        self.last_usage: Optional[PromptUsage] = None
+
+    async def chat(
+        self,
+        message: str,
+        agent_prompt: str,
+        conversation_history: List[Dict[str, str]] = None,
+        params: Optional[ModelParams] = None
+    ) -> ChatResult:
+        text = "".join([token async for token in self.stream_chat(
+            message, agent_prompt, conversation_history, params
+        )])
+        return ChatResult(text, self.last_usage)
+
+    async def stream_chat(
+        self,
+        message: str,
+        agent_prompt: str,
+        conversation_history: List[Dict[str, str]] = None,
+        params: Optional[ModelParams] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the canned response.
+
+        Test Cases:
+        - Should yield the canned response in order
+        - Should raise ValueError for empty message
+        """
+        messages = LLMService._build_messages(message, agent_prompt, conversation_history)
+        params = params or ModelParams()
+        stats = agent_latency(params.agent_id)
+        self.last_usage = None
+        started = time.perf_counter()
+        upstream = UpstreamTimer("local", "llm")
+
+        tokens = split_tokens(self.response)[:params.max_tokens]
+        interval = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+        async with self.limit.slot():
+            await self.ttft.wait()
+            ttft = time.perf_counter() - started
+            upstream.first_byte()
+
+            for i, token in enumerate(tokens):
+                if i and interval:
+                    await asyncio.sleep(interval)
+                yield token
+
+        self.last_usage = PromptUsage(
+            prompt_tokens=sum(message_tokens(m) for m in messages),
+            completion_tokens=len(tokens),
+        )
+        stats.record(time.perf_counter() - started, ttft)
+        upstream.done()
+
+    async def summarize(self, summary: str, evicted: List[Dict[str, str]]) -> str:
+        with observe_upstream("local", "summary"):
+            async with self.limit.slot():
+                await self.ttft.wait()
+
+        turns = " ".join(m['content'] for m in evicted if m['role'] == "user")
+        return f"{summary} {turns}".strip()
+
+    def __repr__(self):
+        return "LocalLLMService()"
+
+
+def synthetic_speech(text: str, sample_rate: int = 16000, words_per_minute: float = 150.0) -> bytes:
+    """
+    Deterministic stand-in audio for text: a 16-bit mono tone lasting
+    about as long as speaking it would.
+
+    Test Cases:
+    - Should grow with the number of words
+    - Should return the same audio for the same text
+    """
+    seconds = max(len(text.split()), 1) * 60 / words_per_minute
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    frequency = 200 + len(text) % 200
+    return (np.sin(2 * np.pi * frequency * t) * 8000).astype("<i2").tobytes()
+
+
+class LocalTTSService(TextToSpeech):
+    """
+    Synthetic-audio generator.
+
+    Audio starts after a sampled time to first byte and is then delivered
+    realtime_factor times faster than it plays (0 for no pacing).
+    """
+
+    CHUNK_BYTES = 4096
+    SAMPLE_RATE = 16000
+
+    def __init__(
+        self,
+        ttfb: LatencyDistribution,
+        realtime_factor: float = 0.0,
+        limit: Optional[ThroughputLimit] = None
+    ):
+        self.ttfb = ttfb
+        self.realtime_factor = realtime_factor
+        self.limit = limit or ThroughputLimit()
+
+    async def synthesize_stream(self, text: str, voice_id: str) -> AsyncIterator[bytes]:
+        """
+        Stream synthetic audio for text.
+
+        Test Cases:
+        - Should yield the synthetic audio in chunks
+        - Should raise ValueError for empty text
+        """
+        if not text or text.strip() == "":
+            raise ValueError("Text cannot be empty")
+
+        if not voice_id or voice_id.strip() == "":
+            raise ValueError("Voice ID cannot be empty")
+
+        audio = synthetic_speech(text, self.SAMPLE_RATE)
+        chunk_seconds = self.CHUNK_BYTES / 2 / self.SAMPLE_RATE
+        interval = chunk_seconds / self.realtime_factor if self.realtime_factor > 0 else 0.0
+
+        upstream = UpstreamTimer("local", "tts")
+        async with self.limit.slot():
+            await self.ttfb.wait()
+            upstream.first_byte()
+
+            for offset in range(0, len(audio), self.CHUNK_BYTES):
+                if offset and interval:
+                    await asyncio.sleep(interval)
+                yield audio[offset:offset + self.CHUNK_BYTES]
+
+        upstream.done()
+
+    def __repr__(self):
+        return "LocalTTSService()"
+
+
+class LocalProviders:
+    """
+    Process-wide stand-ins for PROVIDERS=local.
+
+    Throughput limits are shared by every session of the worker; each
+    session gets its own services (the STT transcript rotation and LLM
+    usage are per session, like the real services).
+    """
+
+    def __init__(
+        self,
+        stt_latency: LatencyDistribution,
+        llm_ttft: LatencyDistribution,
+        tts_ttfb: LatencyDistribution,
+        tokens_per_second: float = 0.0,
+        realtime_factor: float = 0.0,
+        max_concurrent: int = 0,
+        transcripts: Optional[List[str]] = None,
+        response: str = "We are open from nine to five."
+    ):
+        self.stt_latency = stt_latency
+        self.llm_ttft = llm_ttft
+        self.tts_ttfb = tts_ttfb
+        self.tokens_per_second = tokens_per_second
+        self.realtime_factor = realtime_factor
+        self.transcripts = transcripts or ["What are your hours?"]
+        self.response = response
+        self.limits = {
+            'stt': ThroughputLimit(max_concurrent),
+            'llm': ThroughputLimit(max_concurrent),
+            'tts': ThroughputLimit(max_concurrent),
+        }
+
+    @classmethod
+    def from_settings(cls) -> "LocalProviders":
+        def distribution(mean_ms: float, seed: int) -> LatencyDistribution:
+            return LatencyDistribution(
+                mean_ms=mean_ms,
+                jitter_ms=mean_ms * settings.LOCAL_LATENCY_JITTER,
+                kind=settings.LOCAL_LATENCY_DISTRIBUTION,
+                seed=settings.LOCAL_SEED + seed,
+            )
+
+        return cls(
+            stt_latency=distribution(settings.LOCAL_STT_LATENCY_MS, 0),
+            llm_ttft=distribution(settings.LOCAL_LLM_TTFT_MS, 1),
+            tts_ttfb=distribution(settings.LOCAL_TTS_TTFB_MS, 2),
+            tokens_per_second=settings.LOCAL_LLM_TOKENS_PER_SECOND,
+            realtime_factor=settings.LOCAL_TTS_REALTIME_FACTOR,
+            max_concurrent=settings.LOCAL_MAX_CONCURRENT,
+            transcripts=[t.strip() for t in settings.LOCAL_TRANSCRIPTS.split("|") if t.strip()],
+            response=settings.LOCAL_RESPONSE,
+        )
+
+    def create_services(
+        self,
+        preprocessor: Optional[STTPreprocessor] = None
+    ) -> Tuple[LocalSTTService, LocalLLMService, LocalTTSService]:
+        """Stand-in (STT, LLM, TTS) services for one session."""
+        return (
+            LocalSTTService(self.transcripts, self.stt_latency, self.limits['stt'], preprocessor),
+            LocalLLMService(
+                self.response, self.llm_ttft, self.tokens_per_second, self.limits['llm']
+            ),
+            LocalTTSService(self.tts_ttfb, self.realtime_factor, self.limits['tts']),
+        )
+
+    def __repr__(self):
+        return f"LocalProviders(max_concurrent={self.limits['stt'].max_concurrent})"
@@ -0,0 +1,168 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Tuple
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from app.config import settings
+from app.services.metrics import LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+# Task name prefixes used across the app ("turn:{sid}:{turn_id}", "writer:{sid}", ...)
+TASK_KINDS = (
+    "turn", "reader", "worker", "writer", "summary", "speculation", "partial", "tracer", "loop-lag"
+)
+
+
+def parse_task_name(name: Optional[str]) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    (kind, session_id, turn_id) for a task name.
+
+    Kinds outside TASK_KINDS become "other"; no task at all (a plain
+    callback, e.g. a future's done callback) is "callback".
+
+    Test Cases:
+    - Should split turn tasks into session and turn id
+    - Should read the session id from per-session tasks
+    - Should report unnamed tasks as other
+    """
+    if name is None:
+        return "callback", None, None
+
+    kind, _, rest = name.partition(":")
+    if kind not in TASK_KINDS:
+        return "other", None, None
+
+    if kind == "turn":
+        session_id, _, turn_id = rest.rpartition(":")
+        return kind, session_id or None, turn_id or None
+
+    return kind, rest or None, None
+
+
+@dataclass
+class StallReport:
+    """One stall: how long the loop was blocked and what it was running"""
+
+    blocked_ms: float
+    task_name: Optional[str]
+    kind: str
+    session_id: Optional[str]
+    turn_id: Optional[str]
+    stack: str
+
+
+class LoopWatchdog:
+    """
+    Detects event loop stalls from outside the loop.
+
+    A monitor thread posts a no-op into the loop every interval and waits
+    for it to run. If it has not run within threshold, a callback is
+    blocking the loop: the thread samples the loop thread's stack and the
+    task being stepped, then waits for the loop to come back to time the
+    whole stall. Reports are logged and recorded on /metrics from the loop
+    thread, once it is free again.
+
+    Costs one thread and one call_soon_threadsafe per interval; off unless
+    LOOP_WATCHDOG_ENABLED is set.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        interval: float = 0.1,
+        stack_limit: int = 20,
+        history: int = 20
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self.stack_limit = stack_limit
+        self.reports: Deque[StallReport] = deque(maxlen=history)
+        self.last_lag = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_settings(cls) -> "LoopWatchdog":
+        return cls(
+            threshold=settings.LOOP_WATCHDOG_THRESHOLD_MS / 1000,
+            interval=settings.LOOP_WATCHDOG_INTERVAL_MS / 1000,
+            stack_limit=settings.LOOP_WATCHDOG_STACK_LIMIT,
+        )
+
+    def start(self) -> None:
+        """Watch the running loop (call from inside it)."""
+        if self._thread is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            answered = threading.Event()
+            sent = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                return  # loop closed
+
+            if not answered.wait(self.threshold):
+                task_name, stack = self._sample()
+                while not answered.wait(self.interval):
+                    if self._stop.is_set():
+                        return
+                blocked = time.perf_counter() - sent
+                try:
+                    self._loop.call_soon_threadsafe(self._report, blocked, task_name, stack)
+                except RuntimeError:
+                    return
+
+            self.last_lag = time.perf_counter() - sent
+            self._stop.wait(self.interval)
+
+    def _sample(self) -> Tuple[Optional[str], str]:
+        """Name of the task being stepped and the loop thread's stack, taken mid-stall."""
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = ""
+        if frame is not None:
+            stack = "".join(traceback.format_stack(frame, self.stack_limit))
+        return (task.get_name() if task is not None else None), stack
+
+    def _report(self, blocked: float, task_name: Optional[str], stack: str) -> None:
+        kind, session_id, turn_id = parse_task_name(task_name)
+        report = StallReport(blocked * 1000, task_name, kind, session_id, turn_id, stack)
+        self.reports.append(report)
+        LOOP_STALLS.labels(kind).observe(blocked)
+
+        where = task_name or "a callback outside any task"
+        if session_id is not None:
+            where += f" (session {session_id}" + (f", turn {turn_id})" if turn_id else ")")
+        logger.warning(
+            f"Event loop blocked for {report.blocked_ms:.0f} ms in {where}; "
+            f"stack when caught:\n{stack}"
+        )
+
+    def __repr__(self):
+        return f"LoopWatchdog(threshold={self.threshold}, stalls={len(self.reports)})"
@@ -0,0 +1,383 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; covers sub-millisecond socket writes up to slow upstream completions
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Event loop lag is normally well under a millisecond
+LAG_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """
+    Base for in-process metrics.
+
+    Children per label combination are created on first use and kept in a
+    dict, so recording a sample is a dict lookup and an addition; nothing
+    is computed until /metrics is scraped.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, Any] = {}
+
+    def labels(self, *values: str, **kwargs: str):
+        """Child for one label combination."""
+        if kwargs:
+            values = tuple(kwargs[n] for n in self.labelnames)
+        key = tuple(str(v) for v in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """(suffix, labels, value) triples for the exposition format."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(Metric):
+    """Monotonic count (requests, errors, bytes)"""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [
+            ("_total", _format_labels(self.labelnames, key), child.value)
+            for key, child in sorted(self._children.items())
+        ]
+
+
+class Gauge(Metric):
+    """
+    Value that goes up and down.
+
+    A gauge given a function is read at scrape time instead; the function
+    returns a number, or a dict of label-value tuples to numbers.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], Any]] = None
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], Any]) -> None:
+        self._function = function
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        if self._function is None:
+            values = {key: child.value for key, child in self._children.items()}
+        else:
+            result = self._function()
+            values = result if isinstance(result, dict) else {(): result}
+
+        return [
+            ("", _format_labels(self.labelnames, key), value)
+            for key, value in sorted(values.items())
+        ]
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot: above every bound
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(Metric):
+    """Distribution in fixed buckets (latencies)"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        result = []
+        for key, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), child.counts):
+                cumulative += count
+                le = 'le="' + ("+Inf" if math.isinf(bound) else _format_value(bound)) + '"'
+                result.append(("_bucket", _format_labels(self.labelnames, key, le), cumulative))
+            labels = _format_labels(self.labelnames, key)
+            result.append(("_sum", labels, child.sum))
+            result.append(("_count", labels, cumulative))
+        return result
+
+
+class MetricsRegistry:
+    """Metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+
+        Test Cases:
+        - Should render counters with _total samples
+        - Should render cumulative histogram buckets
+        - Should read function gauges at scrape time
+        """
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def __repr__(self):
+        return f"MetricsRegistry(metrics={len(self._metrics)})"
+
+
+REGISTRY = MetricsRegistry()
+
+ACTIVE_SESSIONS = REGISTRY.register(Gauge(
+    "voice_agent_active_sessions", "WebSocket sessions connected to this worker"
+))
+WS_MESSAGES = REGISTRY.register(Counter(
+    "voice_agent_ws_messages", "WebSocket messages by direction", ["direction"]
+))
+WS_BYTES = REGISTRY.register(Counter(
+    "voice_agent_ws_bytes", "WebSocket payload bytes by direction", ["direction"]
+))
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "voice_agent_queue_depth", "Items waiting per queue, summed over sessions", ["queue"]
+))
+QUEUE_DEPTH_MAX = REGISTRY.register(Gauge(
+    "voice_agent_queue_depth_max", "Deepest single instance of each queue", ["queue"]
+))
+UPSTREAM_LATENCY = REGISTRY.register(Histogram(
+    "voice_agent_upstream_request_seconds",
+    "Completed upstream requests, start to last byte", ["provider", "operation"]
+))
+UPSTREAM_TTFB = REGISTRY.register(Histogram(
+    "voice_agent_upstream_first_byte_seconds",
+    "Upstream time to first token/audio byte of streamed responses", ["provider", "operation"]
+))
+UPSTREAM_ERRORS = REGISTRY.register(Counter(
+    "voice_agent_upstream_errors", "Failed upstream requests", ["provider", "operation"]
+))
+TURN_STAGE = REGISTRY.register(Histogram(
+    "voice_agent_turn_stage_seconds", "Duration of traced turn stages", ["stage"]
+))
+LOOP_LAG = REGISTRY.register(Histogram(
+    "voice_agent_event_loop_lag_seconds",
+    "How late the event loop ran a timer callback", buckets=LAG_BUCKETS
+))
+LOOP_STALLS = REGISTRY.register(Histogram(
+    "voice_agent_event_loop_stall_seconds",
+    "Event loop stalls caught by the watchdog, by the kind of task that blocked", ["task"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+))
+
+
+class UpstreamTimer:
+    """Times one upstream request; see observe_upstream()"""
+
+    def __init__(self, provider: str, operation: str):
+        self.provider = provider
+        self.operation = operation
+        self.started = time.perf_counter()
+        self._first = False
+
+    def first_byte(self) -> None:
+        """Mark the first token/byte of a streamed response (only the first call counts)."""
+        if not self._first:
+            self._first = True
+            elapsed = time.perf_counter() - self.started
+            UPSTREAM_TTFB.labels(self.provider, self.operation).observe(elapsed)
+
+    def done(self) -> None:
+        elapsed = time.perf_counter() - self.started
+        UPSTREAM_LATENCY.labels(self.provider, self.operation).observe(elapsed)
+
+    def failed(self) -> None:
+        UPSTREAM_ERRORS.labels(self.provider, self.operation).inc()
+
+
+@contextmanager
+def observe_upstream(provider: str, operation: str) -> Iterator[UpstreamTimer]:
+    """
+    Record the latency or failure of the enclosed upstream request.
+
+    Requests abandoned by cancellation or an early close are neither.
+
+    Test Cases:
+    - Should observe the latency of a completed request
+    - Should count a failed request as an error
+    """
+    timer = UpstreamTimer(provider, operation)
+    try:
+        yield timer
+    except Exception:
+        timer.failed()
+        raise
+    timer.done()
+
+
+_QUEUES: Dict[str, Callable[[], List[int]]] = {}
+
+
+def _queue_depths(combine: Callable[[List[int]], float]) -> Dict[LabelValues, float]:
+    return {(name,): combine(depths()) for name, depths in _QUEUES.items()}
+
+
+QUEUE_DEPTH.set_function(lambda: _queue_depths(sum))
+QUEUE_DEPTH_MAX.set_function(lambda: _queue_depths(lambda depths: max(depths, default=0)))
+
+
+def register_queue(name: str, depths: Callable[[], List[int]]) -> None:
+    """Report a queue on /metrics; depths() returns one size per instance (e.g. per session)."""
+    _QUEUES[name] = depths
+
+
+def register_session_metrics(manager: Any) -> None:
+    """
+    Read session counts and queue depths from a ConnectionManager at scrape time.
+
+    Test Cases:
+    - Should report active sessions and summed queue depths
+    """
+    ACTIVE_SESSIONS.set_function(lambda: len(manager.active_connections))
+
+    def depths(index: int) -> Callable[[], List[int]]:
+        def read() -> List[int]:
+            sizes = (manager.queue_depths(sid) for sid in list(manager.channels))
+            return [size[index] for size in sizes if size is not None]
+        return read
+
+    register_queue("inbound", depths(0))
+    register_queue("outbound", depths(1))
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop lag: how much later than scheduled a timer fires.
+
+    One wakeup per interval; anything that blocks the loop (synchronous
+    DSP, large JSON, slow logging handlers) shows up as lag for every
+    session of the worker.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.last_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run(), name="loop-lag")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(loop.time() - scheduled, 0.0)
+            LOOP_LAG.observe(self.last_lag)
+
+    def __repr__(self):
+        return f"LoopLagMonitor(interval={self.interval}, last_lag={self.last_lag:.4f})"
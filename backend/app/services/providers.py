@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.services.llm_service import ChatResult, ModelParams, PromptUsage
+
+
+class SpeechToText(ABC):
+    """What the voice pipeline needs from a speech-to-text provider"""
+
+    @abstractmethod
+    async def transcribe_pcm(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        channels: int = 1
+    ) -> str:
+        """Transcribe interleaved int16 PCM; "" for silence."""
+
+    @abstractmethod
+    async def transcribe(self, audio_bytes: bytes, filename: str = "audio.webm") -> str:
+        """Transcribe encoded audio (WebM, WAV, ...)."""
+
+
+class LanguageModel(ABC):
+    """What the voice pipeline needs from an LLM provider"""
+
+    # Usage of the last completed stream_chat()
+    last_usage: Optional["PromptUsage"] = None
+
+    @abstractmethod
+    async def chat(
+        self,
+        message: str,
+        agent_prompt: str,
+        conversation_history: List[Dict[str, str]] = None,
+        params: Optional["ModelParams"] = None
+    ) -> "ChatResult":
+        """Complete response to message."""
+
+    @abstractmethod
+    def stream_chat(
+        self,
+        message: str,
+        agent_prompt: str,
+        conversation_history: List[Dict[str, str]] = None,
+        params: Optional["ModelParams"] = None
+    ) -> AsyncIterator[str]:
+        """Response to message as text deltas."""
+
+    @abstractmethod
+    async def summarize(self, summary: str, evicted: List[Dict[str, str]]) -> str:
+        """Fold messages evicted from the history into a running summary."""
+
+
+class TextToSpeech(ABC):
+    """What the voice pipeline needs from a text-to-speech provider"""
+
+    @abstractmethod
+    def synthesize_stream(self, text: str, voice_id: str) -> AsyncIterator[bytes]:
+        """Speech for text as audio chunks."""
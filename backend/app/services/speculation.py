@@ -0,0 +1,143 @@
+import asyncio
+import contextlib
+from difflib import SequenceMatcher
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_transcript(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace for comparison."""
+    return " ".join(re.sub(r"[^\w\s']", " ", text.lower()).split())
+
+
+def transcripts_match(speculative: str, final: str, threshold: float = 0.9) -> bool:
+    """
+    Whether a response to speculative also answers final.
+
+    Args:
+        speculative: Transcript the speculative response was generated for
+        final: Transcript of the complete utterance
+        threshold: Minimum similarity ratio (1.0 requires an exact match)
+
+    Returns:
+        True if the normalized transcripts are at least threshold similar
+
+    Test Cases:
+    - Should match transcripts differing only in case and punctuation
+    - Should not match different transcripts
+    - Should not match empty transcripts
+    """
+    a, b = normalize_transcript(speculative), normalize_transcript(final)
+    if not a or not b:
+        return False
+
+    return a == b or SequenceMatcher(None, a, b).ratio() >= threshold
+
+
+class Speculation:
+    """
+    LLM response generated ahead of the final transcript.
+
+    Started when the caller pauses: the audio so far is transcribed and the
+    LLM request sent while the VAD hangover is still running. Tokens are
+    buffered, not spoken, until the turn either commits the speculation (the
+    final transcript matches) or cancels it.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[], Awaitable[str]],
+        generate: Callable[[str], AsyncIterator[str]],
+        name: str = "speculation"
+    ):
+        self.transcript: Optional[str] = None
+        self._tokens: List[str] = []
+        self._changed = asyncio.Event()
+        self._transcribed = asyncio.Event()
+        self._done = False
+        self._error: Optional[Exception] = None
+        self._task = asyncio.create_task(self._run(transcribe, generate), name=name)
+
+    async def _run(
+        self,
+        transcribe: Callable[[], Awaitable[str]],
+        generate: Callable[[str], AsyncIterator[str]]
+    ) -> None:
+        try:
+            self.transcript = await transcribe()
+            self._transcribed.set()
+            if not self.transcript.strip():
+                return
+
+            async with contextlib.aclosing(generate(self.transcript)) as tokens:
+                async for token in tokens:
+                    self._tokens.append(token)
+                    self._changed.set()
+        except Exception as e:
+            # Surfaced to the turn if it commits; otherwise nobody needs it
+            self._error = e
+            logger.info(f"Speculative response failed: {e}")
+        finally:
+            self._done = True
+            self._transcribed.set()
+            self._changed.set()
+
+    async def matches(self, final: str, threshold: float = 0.9) -> bool:
+        """
+        Wait for the speculative transcript and compare it with final.
+
+        Returns False if the speculation failed or was cancelled.
+
+        Test Cases:
+        - Should match a close final transcript
+        - Should not match when transcription failed
+        """
+        await self._transcribed.wait()
+        if self.transcript is None:
+            return False
+
+        return transcripts_match(self.transcript, final, threshold)
+
+    async def tokens(self) -> AsyncIterator[str]:
+        """
+        Commit: replay buffered tokens, then follow the live stream.
+
+        Raises:
+            Exception: Whatever the LLM stream raised
+
+        Test Cases:
+        - Should yield buffered and later tokens in order
+        - Should re-raise LLM errors
+        """
+        sent = 0
+        while True:
+            self._changed.clear()
+            while sent < len(self._tokens):
+                yield self._tokens[sent]
+                sent += 1
+
+            if self._done:
+                break
+            await self._changed.wait()
+
+        if self._error is not None:
+            raise self._error
+
+    async def cancel(self) -> None:
+        """Abort the speculative STT/LLM requests."""
+        if not self._task.done():
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def __repr__(self):
+        return (
+            f"Speculation(transcript={self.transcript!r}, tokens={len(self._tokens)}, "
+            f"done={self._done})"
+        )
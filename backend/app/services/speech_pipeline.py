@@ -0,0 +1,191 @@
+import asyncio
+import contextlib
+import re
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+import logging
+
+from app.services.tts_service import TTSService
+
+logger = logging.getLogger(__name__)
+
+# Sentence end: terminal punctuation, optional closing quotes/brackets, then whitespace
+SENTENCE_BOUNDARY = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+# Clause end: only used once the pending text is long enough to be worth a TTS call
+CLAUSE_BOUNDARY = re.compile(r"[,;:—]\s+")
+
+# Sentinel marking the end of the segment queue
+_END = object()
+
+
+class SentenceSegmenter:
+    """
+    Incrementally cut a token stream into speakable segments.
+
+    Responsibilities:
+    - Emit complete sentences as soon as their boundary is seen
+    - Emit clauses when a sentence runs long
+    - Force a cut at a word boundary when no punctuation arrives
+    """
+
+    def __init__(self, min_clause_chars: int = 40, max_chars: int = 200):
+        self.min_clause_chars = min_clause_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add text and return any segments that are now complete.
+
+        Args:
+            text: Next token or text delta
+
+        Returns:
+            List of completed segments (possibly empty)
+
+        Test Cases:
+        - Should emit a sentence once trailing whitespace arrives
+        - Should not split decimals like 3.5
+        - Should split long sentences at clause boundaries
+        - Should force a split at max_chars
+        """
+        self._buffer += text
+        segments = []
+
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+
+            segment = self._buffer[:cut].strip()
+            self._buffer = self._buffer[cut:]
+            if segment:
+                segments.append(segment)
+
+        return segments
+
+    def flush(self) -> Optional[str]:
+        """
+        Return any remaining text as a final segment.
+
+        Returns:
+            Remaining segment or None if nothing is pending
+        """
+        segment = self._buffer.strip()
+        self._buffer = ""
+        return segment or None
+
+    def _find_cut(self) -> Optional[int]:
+        """Find the end index of the next complete segment."""
+        match = SENTENCE_BOUNDARY.search(self._buffer)
+        if match:
+            return match.end()
+
+        if len(self._buffer) >= self.min_clause_chars:
+            match = CLAUSE_BOUNDARY.search(self._buffer, self.min_clause_chars - 1)
+            if match:
+                return match.end()
+
+        if len(self._buffer) >= self.max_chars:
+            space = self._buffer.rfind(" ", 0, self.max_chars)
+            return space + 1 if space > 0 else self.max_chars
+
+        return None
+
+
+async def segment_stream(
+    tokens: AsyncIterator[str],
+    segmenter: Optional[SentenceSegmenter] = None
+) -> AsyncIterator[str]:
+    """
+    Turn a token stream into a stream of speakable segments.
+
+    Args:
+        tokens: Async iterator of text deltas (e.g. LLMService.stream_chat)
+        segmenter: Optional segmenter with custom thresholds
+
+    Yields:
+        Sentence or clause segments in order
+    """
+    segmenter = segmenter or SentenceSegmenter()
+
+    async for token in tokens:
+        for segment in segmenter.feed(token):
+            yield segment
+
+    tail = segmenter.flush()
+    if tail:
+        yield tail
+
+
+async def stream_tts_immediately(
+    tokens: AsyncIterator[str],
+    tts_service: TTSService,
+    voice_id: str,
+    on_segment: Optional[Callable[[str], Awaitable[None]]] = None,
+    segmenter: Optional[SentenceSegmenter] = None
+) -> AsyncIterator[bytes]:
+    """
+    Synthesize speech segment-by-segment while the LLM is still generating.
+
+    The token stream is consumed by a background task so generation keeps
+    running while earlier segments are being synthesized and sent.
+
+    Args:
+        tokens: Async iterator of text deltas
+        tts_service: TTS service used for each segment
+        voice_id: ElevenLabs voice ID
+        on_segment: Optional coroutine called with each segment before synthesis
+        segmenter: Optional segmenter with custom thresholds
+
+    Yields:
+        Audio chunks (MP3 format) in segment order
+
+    Test Cases:
+    - Should synthesize each segment in order
+    - Should start synthesis before the token stream finishes
+    - Should propagate LLM errors to the consumer
+    - Should cancel generation when the consumer stops early
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for segment in segment_stream(tokens, segmenter):
+                await queue.put(segment)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(_END)
+
+    producer = asyncio.create_task(produce())
+
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+
+            logger.debug(f"Synthesizing segment: {len(item)} chars")
+            if on_segment:
+                await on_segment(item)
+
+            # aclosing() aborts the TTS request as soon as we are cancelled
+            async with contextlib.aclosing(tts_service.synthesize_stream(
+                text=item,
+                voice_id=voice_id
+            )) as audio:
+                async for audio_chunk in audio:
+                    yield audio_chunk
+
+    finally:
+        if not producer.done():
+            producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+        # Make sure the upstream LLM stream is released
+        aclose = getattr(tokens, "aclose", None)
+        if aclose:
+            await aclose()
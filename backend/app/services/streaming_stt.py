@@ -0,0 +1,187 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional
+import logging
+import numpy as np
+
+from app.config import settings
+from app.services.audio_analysis import frame_dbfs, frame_signal
+
+if TYPE_CHECKING:
+    from app.services.providers import SpeechToText
+
+logger = logging.getLogger(__name__)
+
+# Frame used to pick a quiet cut point when a window is full
+CUT_FRAME_MS = 20
+
+
+class TranscriptionBackend(ABC):
+    """Transcribes one window of PCM; implementations are swapped in for tests"""
+
+    @abstractmethod
+    async def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        """
+        Transcribe int16 mono PCM.
+
+        Returns:
+            Transcribed text, or "" for silence
+        """
+
+
+class WhisperBackend(TranscriptionBackend):
+    """The session STT service (Whisper, or its local stand-in)"""
+
+    def __init__(self, stt_service: "SpeechToText"):
+        self.stt_service = stt_service
+
+    async def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        return await self.stt_service.transcribe_pcm(samples, sample_rate)
+
+    def __repr__(self):
+        return "WhisperBackend()"
+
+
+def create_stt_backend(
+    stt_service: "SpeechToText",
+    name: Optional[str] = None
+) -> TranscriptionBackend:
+    """
+    Build the streaming transcription backend selected by settings.
+
+    Args:
+        stt_service: Session STT service (used by the whisper backend)
+        name: Backend name; defaults to settings.STREAMING_STT_BACKEND
+
+    Raises:
+        ValueError: For an unknown backend
+    """
+    name = name or settings.STREAMING_STT_BACKEND
+
+    if name == "whisper":
+        return WhisperBackend(stt_service)
+
+    raise ValueError(f"Unknown streaming STT backend: {name}")
+
+
+@dataclass
+class PartialTranscript:
+    """Transcript of an utterance in progress"""
+
+    text: str  # everything heard so far
+    stable: str  # prefix of text that will not change any more
+
+
+def _common_prefix(a: List[str], b: List[str]) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcripts of the utterance being spoken.
+
+    Responsibilities:
+    - Re-transcribe the current window every interval_ms of new audio
+    - Commit the words two consecutive passes agree on, so the stable
+      prefix only ever grows
+    - Roll the window once it reaches window_ms: the audio up to the
+      quietest point is transcribed one last time and committed, so each
+      pass stays short however long the caller talks
+    """
+
+    def __init__(
+        self,
+        backend: TranscriptionBackend,
+        sample_rate: int,
+        window_ms: int = 10000,
+        interval_ms: int = 600
+    ):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.window_bytes = sample_rate * window_ms // 1000 * 2
+        self.interval_bytes = sample_rate * interval_ms // 1000 * 2
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new utterance."""
+        self._window = bytearray()  # uncommitted audio
+        self._committed: List[str] = []  # words from closed windows
+        self._stable: List[str] = []  # agreed words of the current window
+        self._previous: List[str] = []  # last hypothesis for the current window
+        self._since_pass = 0
+        self.passes = 0
+
+    def feed(self, pcm: bytes) -> None:
+        """Add int16 PCM of the utterance."""
+        self._window.extend(pcm)
+        self._since_pass += len(pcm)
+
+    @property
+    def due(self) -> bool:
+        """Whether enough new audio arrived for another pass."""
+        return self._since_pass >= self.interval_bytes and len(self._window) > 0
+
+    async def update(self) -> PartialTranscript:
+        """
+        Transcribe the current window and stabilize the result.
+
+        Returns:
+            Latest partial transcript
+
+        Test Cases:
+        - Should commit words two consecutive passes agree on
+        - Should never shrink the stable prefix
+        - Should commit and roll the window once it is full
+        """
+        self._since_pass = 0
+
+        if len(self._window) >= self.window_bytes:
+            await self._roll()
+
+        hypothesis = (await self._transcribe(bytes(self._window))).split()
+        self.passes += 1
+
+        agreed = _common_prefix(self._previous, hypothesis)
+        if agreed > len(self._stable) and hypothesis[:len(self._stable)] == self._stable:
+            self._stable = hypothesis[:agreed]
+        self._previous = hypothesis
+
+        agrees = hypothesis[:len(self._stable)] == self._stable
+        tentative = hypothesis[len(self._stable):] if agrees else []
+        stable = self._committed + self._stable
+        return PartialTranscript(text=" ".join(stable + tentative), stable=" ".join(stable))
+
+    async def _roll(self) -> None:
+        """Commit the window up to its quietest point and keep the rest."""
+        cut = self._quietest_cut()
+        head, self._window = bytes(self._window[:cut]), self._window[cut:]
+
+        self._committed.extend((await self._transcribe(head)).split())
+        self._stable = []
+        self._previous = []
+        self.passes += 1
+
+    def _quietest_cut(self) -> int:
+        """Byte offset of the quietest frame in the second half of the window."""
+        frame_samples = self.sample_rate * CUT_FRAME_MS // 1000
+        samples = np.frombuffer(bytes(self._window), dtype="<i2")
+        half = len(samples) // 2 // frame_samples * frame_samples
+        frames = frame_signal(samples[half:], frame_samples)
+        if len(frames) == 0:
+            return len(self._window)
+
+        quietest = int(np.argmin(frame_dbfs(frames)))
+        return (half + quietest * frame_samples) * 2
+
+    async def _transcribe(self, pcm: bytes) -> str:
+        if not pcm:
+            return ""
+        return await self.backend.transcribe(np.frombuffer(pcm, dtype=np.int16), self.sample_rate)
+
+    def __repr__(self):
+        return f"StreamingTranscriber(passes={self.passes}, buffered={len(self._window)})"
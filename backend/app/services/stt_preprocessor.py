@@ -0,0 +1,172 @@
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+import numpy as np
+import logging
+
+from app.config import settings
+from app.services.audio_analysis import downmix, resample, trim_silence
+from app.services.audio_processor import AudioProcessor
+
+if TYPE_CHECKING:
+    from app.services.audio_workers import AudioWorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UploadPolicy:
+    """How PCM is prepared before it is sent to Whisper"""
+
+    trim_silence: bool = True
+    silence_threshold_db: float = -40.0
+    padding_ms: int = 150
+    sample_rate: int = 16000  # Whisper works at 16 kHz internally
+    format: str = "wav"  # "wav" (16-bit PCM) or "opus" (Ogg/Opus via ffmpeg)
+    opus_bitrate: str = "24k"
+
+    @classmethod
+    def from_settings(cls) -> "UploadPolicy":
+        return cls(
+            trim_silence=settings.STT_TRIM_SILENCE,
+            silence_threshold_db=settings.STT_SILENCE_THRESHOLD_DB,
+            padding_ms=settings.STT_SILENCE_PADDING_MS,
+            sample_rate=settings.STT_SAMPLE_RATE,
+            format=settings.STT_UPLOAD_FORMAT,
+            opus_bitrate=settings.STT_OPUS_BITRATE,
+        )
+
+
+@dataclass
+class PreparedAudio:
+    """Encoded audio ready for upload"""
+
+    data: bytes
+    filename: str
+    duration: float  # seconds after trimming
+
+
+class STTPreprocessor:
+    """
+    Shrink audio before transcription.
+
+    Responsibilities:
+    - Downmix to mono
+    - Trim leading/trailing silence
+    - Resample to the upload sample rate
+    - Encode compactly (16-bit WAV or Ogg/Opus)
+    """
+
+    def __init__(
+        self,
+        policy: UploadPolicy = None,
+        ffmpeg_path: str = None,
+        pool: Optional["AudioWorkerPool"] = None
+    ):
+        self.policy = policy or UploadPolicy.from_settings()
+        self.ffmpeg_path = ffmpeg_path or settings.FFMPEG_PATH
+
+        # Runs the NumPy work off the event loop when provided
+        self.pool = pool
+
+    async def prepare(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        channels: int = 1
+    ) -> Optional[PreparedAudio]:
+        """
+        Prepare PCM samples for upload.
+
+        Args:
+            samples: Interleaved int16 samples
+            sample_rate: Sample rate of samples
+            channels: Number of interleaved channels
+
+        Returns:
+            PreparedAudio, or None if nothing but silence remains
+
+        Test Cases:
+        - Should downmix, trim and resample to the policy sample rate
+        - Should return None for all-silent audio
+        - Should keep silence when trimming is disabled
+        - Should encode WAV by default
+        - Should encode Opus through ffmpeg when configured
+        - Should run the NumPy stage in the worker pool when provided
+        """
+        policy = self.policy
+
+        if self.pool is not None:
+            pcm = await self.pool.run_cpu(condition_pcm, samples, sample_rate, channels, policy)
+        else:
+            pcm = condition_pcm(samples, sample_rate, channels, policy)
+
+        if pcm is None:
+            return None
+
+        duration = len(pcm) / policy.sample_rate
+
+        if policy.format == "opus":
+            data = await self._encode_opus(pcm.tobytes())
+            return PreparedAudio(data=data, filename="audio.ogg", duration=duration)
+
+        data = AudioProcessor.pcm_to_wav(pcm.tobytes(), policy.sample_rate)
+        return PreparedAudio(data=data, filename="audio.wav", duration=duration)
+
+    async def _encode_opus(self, pcm: bytes) -> bytes:
+        """Encode mono s16le PCM as Ogg/Opus with a one-shot ffmpeg process."""
+        process = await asyncio.create_subprocess_exec(
+            self.ffmpeg_path,
+            "-hide_banner", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(self.policy.sample_rate), "-ac", "1", "-i", "pipe:0",
+            "-c:a", "libopus", "-b:a", self.policy.opus_bitrate, "-application", "voip",
+            "-f", "ogg", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate(pcm)
+
+        if process.returncode != 0:
+            raise RuntimeError(f"Opus encoding failed: {stderr.decode(errors='replace')}")
+
+        return stdout
+
+    def __repr__(self):
+        return f"STTPreprocessor(format={self.policy.format!r})"
+
+
+def condition_pcm(
+    samples: np.ndarray,
+    sample_rate: int,
+    channels: int,
+    policy: UploadPolicy
+) -> Optional[np.ndarray]:
+    """
+    Downmix, trim and resample PCM according to policy.
+
+    Module-level so it can run in a process pool.
+
+    Args:
+        samples: Interleaved int16 samples
+        sample_rate: Sample rate of samples
+        channels: Number of interleaved channels
+        policy: Upload policy
+
+    Returns:
+        Mono int16 samples at policy.sample_rate, or None if only silence remains
+    """
+    mono = downmix(samples, channels)
+
+    if policy.trim_silence:
+        mono = trim_silence(
+            mono,
+            sample_rate,
+            threshold_db=policy.silence_threshold_db,
+            padding_ms=policy.padding_ms,
+        )
+
+    if mono.size == 0:
+        return None
+
+    return resample(mono, sample_rate, policy.sample_rate)
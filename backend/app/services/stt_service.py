@@ -1,12 +1,17 @@
 from openai import AsyncOpenAI
 from app.config import settings
+from app.services.metrics import observe_upstream
+from app.services.providers import SpeechToText
+from app.services.stt_preprocessor import STTPreprocessor
+from typing import Optional
 import io
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
-class STTService:
+class STTService(SpeechToText):
     """
     Speech-to-Text service using OpenAI Whisper.
 
@@ -16,15 +21,52 @@ class STTService:
     - Error handling and retries
     """
 
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        preprocessor: Optional[STTPreprocessor] = None
+    ):
+        # Prefer the shared pooled client; fall back to a private one
+        if client is None:
+            client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = client
+        self.preprocessor = preprocessor or STTPreprocessor()
+
+    async def transcribe_pcm(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        channels: int = 1
+    ) -> str:
+        """
+        Trim, downsample and encode PCM, then transcribe it.
+
+        Args:
+            samples: Interleaved int16 samples
+            sample_rate: Sample rate of samples
+            channels: Number of interleaved channels
+
+        Returns:
+            Transcribed text, or "" if the audio was only silence
+
+        Test Cases:
+        - Should upload the prepared audio with its filename
+        - Should skip the API call for silent audio
+        """
+        prepared = await self.preprocessor.prepare(samples, sample_rate, channels)
+        if prepared is None:
+            logger.info("Skipping transcription: audio is silent")
+            return ""
+
+        return await self.transcribe(prepared.data, filename=prepared.filename)
 
-    async def transcribe(self, audio_bytes: bytes) -> str:
+    async def transcribe(self, audio_bytes: bytes, filename: str = "audio.webm") -> str:
         """
         Transcribe audio to text.
 
         Args:
             audio_bytes: Raw audio data (WebM, MP3, WAV, etc.)
+            filename: Upload name; its extension tells Whisper the format
 
         Returns:
             Transcribed text
@@ -47,15 +89,16 @@ class STTService:
         try:
             # Create file-like object
             audio_file = io.BytesIO(audio_bytes)
-            audio_file.name = "audio.webm"  # Whisper needs a filename
+            audio_file.name = filename  # Whisper needs a filename
 
             # Call Whisper API
-            response = await self.client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="en",  # Optional: auto-detect if omitted
-                response_format="text"
-            )
+            with observe_upstream("openai", "stt"):
+                response = await self.client.audio.transcriptions.create(
+                    model="whisper-1",
+                    file=audio_file,
+                    language="en",  # Optional: auto-detect if omitted
+                    response_format="text"
+                )
 
             logger.info(f"Transcription successful: {len(response)} chars")
             return response
@@ -0,0 +1,431 @@
+from abc import ABC, abstractmethod
+from contextlib import aclosing, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+import asyncio
+import logging
+import secrets
+import time
+
+from app.config import settings
+from app.services.providers import TextToSpeech
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "voice-agent"
+
+# OTLP span kind INTERNAL
+SPAN_KIND_INTERNAL = 1
+
+
+@dataclass
+class Span:
+    """One timed stage; times are Unix epoch nanoseconds"""
+
+    name: str
+    span_id: str
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class TurnTrace:
+    """
+    Spans of one agent turn, tied to its session and turn id.
+
+    All stage spans are children of a root "turn" span. The trace can be
+    exported as OTLP/JSON (what an OpenTelemetry collector accepts on
+    /v1/traces) or reduced to per-stage milliseconds for the client.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        turn_id: Optional[int] = None,
+        agent_id: Optional[str] = None,
+        start_ns: Optional[int] = None
+    ):
+        self.session_id = session_id
+        self.turn_id = turn_id  # set once the turn task is running
+        self.agent_id = agent_id
+        self.trace_id = secrets.token_hex(16)
+        self.root = Span(
+            "turn", secrets.token_hex(8), start_ns if start_ns is not None else time.time_ns()
+        )
+        self.spans: List[Span] = []
+
+    def add(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: Optional[int] = None,
+        **attributes: Any
+    ) -> Span:
+        """Record a stage measured elsewhere; end_ns defaults to now."""
+        span = Span(
+            name, secrets.token_hex(8), start_ns,
+            end_ns if end_ns is not None else time.time_ns(), attributes
+        )
+        self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Time the enclosed block (also when it raises or is cancelled).
+
+        Test Cases:
+        - Should end the span when the block raises
+        """
+        span = Span(name, secrets.token_hex(8), time.time_ns(), attributes=attributes)
+        self.spans.append(span)
+        try:
+            yield span
+        finally:
+            span.end_ns = time.time_ns()
+
+    @property
+    def ended(self) -> bool:
+        return self.root.end_ns is not None
+
+    def end(self, **attributes: Any) -> None:
+        """End the root span."""
+        self.root.attributes.update(attributes)
+        self.root.end_ns = time.time_ns()
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Milliseconds per stage (repeated stages are summed), plus the turn total.
+
+        Test Cases:
+        - Should sum repeated stages
+        """
+        result: Dict[str, float] = {}
+        for span in [self.root, *self.spans]:
+            if span.duration_ms is not None:
+                result[span.name] = round(result.get(span.name, 0.0) + span.duration_ms, 1)
+        return result
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """
+        The trace as an OTLP/JSON ExportTraceServiceRequest.
+
+        Test Cases:
+        - Should parent every stage span to the turn span
+        - Should carry the session and turn ids
+        """
+        identity = {
+            'session.id': self.session_id,
+            'turn.id': self.turn_id,
+            'agent.id': self.agent_id,
+        }
+
+        def encode(span: Span, parent: Optional[Span]) -> Dict[str, Any]:
+            attributes = {**identity, **span.attributes} if parent is None else span.attributes
+            encoded = {
+                'traceId': self.trace_id,
+                'spanId': span.span_id,
+                'name': span.name,
+                'kind': SPAN_KIND_INTERNAL,
+                'startTimeUnixNano': str(span.start_ns),
+                'endTimeUnixNano': str(span.end_ns or span.start_ns),
+                'attributes': otlp_attributes(attributes),
+            }
+            if parent is not None:
+                encoded['parentSpanId'] = parent.span_id
+            return encoded
+
+        return {'resourceSpans': [{
+            'resource': {'attributes': otlp_attributes({'service.name': SERVICE_NAME})},
+            'scopeSpans': [{
+                'scope': {'name': __name__},
+                'spans': [encode(self.root, None), *(encode(s, self.root) for s in self.spans)],
+            }],
+        }]}
+
+    def __repr__(self):
+        return (
+            f"TurnTrace(session_id={self.session_id!r}, turn_id={self.turn_id}, "
+            f"spans={len(self.spans)})"
+        )
+
+
+class UtteranceTiming:
+    """
+    Receive, decode and VAD time of the chunks of the utterance in progress.
+
+    The chunk that ends the utterance is on the critical path, so it gets
+    real spans when the turn starts; the utterance totals go in attributes.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.chunks = 0
+        self.decode_ns = 0
+        self.vad_ns = 0
+        # Latest chunk: read from the socket, handled, decoded, VAD done
+        self.last: tuple[int, int, Optional[int], Optional[int]] = (0, 0, None, None)
+
+    def record(
+        self,
+        received_ns: int,
+        handled_ns: int,
+        decoded_ns: Optional[int] = None,
+        done_ns: Optional[int] = None
+    ) -> None:
+        self.chunks += 1
+        if decoded_ns is not None:
+            self.decode_ns += decoded_ns - handled_ns
+        if done_ns is not None and decoded_ns is not None:
+            self.vad_ns += done_ns - decoded_ns
+        self.last = (received_ns, handled_ns, decoded_ns, done_ns)
+
+    def start_trace(self, session_id: str, agent_id: Optional[str] = None) -> TurnTrace:
+        """
+        Begin the trace of the turn this utterance triggers, then reset.
+
+        Test Cases:
+        - Should start the turn when its last chunk was read
+        - Should record decode and VAD totals of the utterance
+        """
+        received, handled, decoded, done = self.last
+        trace = TurnTrace(session_id, agent_id=agent_id, start_ns=received or None)
+
+        if received:
+            trace.add("receive", received, handled, chunks=self.chunks)
+        if decoded is not None:
+            trace.add("decode", handled, decoded, utterance_ms=round(self.decode_ns / 1e6, 1))
+        if done is not None:
+            trace.add("vad", decoded, done, utterance_ms=round(self.vad_ns / 1e6, 1))
+
+        self.reset()
+        return trace
+
+    def __repr__(self):
+        return f"UtteranceTiming(chunks={self.chunks})"
+
+
+def otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Encode attributes as OTLP KeyValues, skipping None values."""
+    encoded = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {'boolValue': value}
+        elif isinstance(value, int):
+            typed = {'intValue': str(value)}
+        elif isinstance(value, float):
+            typed = {'doubleValue': value}
+        else:
+            typed = {'stringValue': str(value)}
+        encoded.append({'key': key, 'value': typed})
+    return encoded
+
+
+async def traced_tokens(
+    trace: TurnTrace,
+    tokens: AsyncIterator[str],
+    **attributes: Any
+) -> AsyncIterator[str]:
+    """
+    Pass LLM tokens through, recording "llm" (total) and "llm.ttft" spans.
+
+    Closing the wrapper closes tokens, so barge-in still aborts the request.
+
+    Test Cases:
+    - Should record time to first token and total time
+    - Should close the wrapped stream when closed early
+    """
+    with trace.span("llm", **attributes) as span:
+        count = 0
+        async with aclosing(tokens):
+            async for token in tokens:
+                if count == 0:
+                    trace.add("llm.ttft", span.start_ns)
+                count += 1
+                yield token
+        span.attributes['tokens'] = count
+
+
+class TracedTTS(TextToSpeech):
+    """
+    Wraps a TTS service, recording a "tts.segment" span per synthesized
+    segment and "tts.ttfb" up to the first audio byte of the turn.
+    """
+
+    def __init__(self, tts: TextToSpeech, trace: TurnTrace):
+        self.tts = tts
+        self.trace = trace
+        self.first_byte = False
+
+    async def synthesize_stream(self, text: str, voice_id: str) -> AsyncIterator[bytes]:
+        with self.trace.span("tts.segment", chars=len(text)) as span:
+            first = True
+            async with aclosing(self.tts.synthesize_stream(text, voice_id)) as audio:
+                async for chunk in audio:
+                    if first:
+                        first = False
+                        ttfb_ns = time.time_ns() - span.start_ns
+                        span.attributes['ttfb_ms'] = round(ttfb_ns / 1e6, 1)
+                        if not self.first_byte:
+                            self.first_byte = True
+                            self.trace.add("tts.ttfb", span.start_ns)
+                    yield chunk
+
+    def __repr__(self):
+        return f"TracedTTS({self.tts!r})"
+
+
+class SpanExporter(ABC):
+    """Destination for finished turn traces"""
+
+    @abstractmethod
+    async def export(self, traces: List[TurnTrace]) -> None:
+        """Send a batch of traces."""
+
+    async def close(self) -> None:
+        """Release resources held by the exporter."""
+
+
+class LogSpanExporter(SpanExporter):
+    """Logs one line of per-stage timings per turn"""
+
+    async def export(self, traces: List[TurnTrace]) -> None:
+        for trace in traces:
+            stages = " ".join(f"{name}={ms}ms" for name, ms in trace.summary().items())
+            logger.info(f"Turn {trace.session_id}:{trace.turn_id} {stages}")
+
+
+class OTLPSpanExporter(SpanExporter):
+    """Posts OTLP/JSON to an OpenTelemetry collector (http://collector:4318/v1/traces)"""
+
+    def __init__(self, endpoint: str, session: Optional[Any] = None):
+        self.endpoint = endpoint
+        self.session = session  # aiohttp.ClientSession; created on first export
+        self._owns_session = session is None
+
+    async def export(self, traces: List[TurnTrace]) -> None:
+        if self.session is None:
+            import aiohttp
+            self.session = aiohttp.ClientSession()
+
+        # Every trace is one resourceSpans entry of the same service
+        body = {'resourceSpans': [rs for t in traces for rs in t.to_otlp()['resourceSpans']]}
+        async with self.session.post(self.endpoint, json=body) as response:
+            if response.status >= 300:
+                raise Exception(f"OTLP export failed: {response.status} {await response.text()}")
+
+    async def close(self) -> None:
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+
+
+def create_span_exporter(name: Optional[str] = None) -> SpanExporter:
+    """
+    Build the exporter selected by settings.
+
+    Args:
+        name: "log" or "otlp"; defaults to settings.TRACING_EXPORTER
+
+    Raises:
+        ValueError: For an unknown exporter
+    """
+    name = name or settings.TRACING_EXPORTER
+
+    if name == "log":
+        return LogSpanExporter()
+
+    if name == "otlp":
+        return OTLPSpanExporter(settings.OTLP_TRACES_ENDPOINT)
+
+    raise ValueError(f"Unknown span exporter: {name}")
+
+
+class Tracer:
+    """
+    Collects finished turn traces and exports them in batches.
+
+    Exporting runs in a background task started with the app, so a slow
+    collector never delays a turn; when the buffer is full the oldest
+    traces are dropped.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[SpanExporter] = None,
+        interval: float = 2.0,
+        max_buffer: int = 2048
+    ):
+        self.exporter = exporter  # None: traces are discarded
+        self.interval = interval
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._buffer: List[TurnTrace] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, trace: TurnTrace) -> None:
+        """Queue a finished trace for export."""
+        if self.exporter is None:
+            return
+
+        if len(self._buffer) >= self.max_buffer:
+            del self._buffer[0]
+            self.dropped += 1
+        self._buffer.append(trace)
+
+    def start(self) -> None:
+        if self.exporter is not None and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="tracer")
+
+    async def flush(self) -> None:
+        """
+        Export everything buffered; failures are logged and the batch dropped.
+
+        Test Cases:
+        - Should export buffered traces once
+        - Should drop a batch the exporter rejects
+        """
+        if not self._buffer or self.exporter is None:
+            return
+
+        batch, self._buffer = self._buffer, []
+        try:
+            await self.exporter.export(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.warning(f"Trace export failed, dropped {len(batch)} traces: {e}")
+
+    async def close(self) -> None:
+        """Stop the export task, flush, and close the exporter."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await self.flush()
+        if self.exporter is not None:
+            await self.exporter.close()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def __repr__(self):
+        return (
+            f"Tracer(exporter={self.exporter!r}, buffered={len(self._buffer)}, "
+            f"dropped={self.dropped})"
+        )
+
+
+# Process-wide tracer; given an exporter at startup when TRACING_ENABLED
+tracer = Tracer()
@@ -0,0 +1,351 @@
+import asyncio
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+import hashlib
+import json
+import logging
+import os
+import threading
+import unicodedata
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.agents.config import AgentConfig
+    from app.services.tts_service import TTSService
+
+logger = logging.getLogger(__name__)
+
+# Chunk size used when replaying cached audio (matches the live stream)
+CHUNK_SIZE = 4096
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache lookups.
+
+    Only differences that cannot change the spoken audio are removed:
+    Unicode composition and runs of whitespace.
+
+    Args:
+        text: Text to synthesize
+
+    Returns:
+        Normalized text
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(voice_id: str, text: str, model_id: str, voice_settings: Dict) -> str:
+    """
+    Content address for a synthesized phrase.
+
+    Args:
+        voice_id: ElevenLabs voice ID
+        text: Text to synthesize
+        model_id: ElevenLabs model ID
+        voice_settings: Voice settings sent with the request
+
+    Returns:
+        Hex SHA-256 digest
+
+    Test Cases:
+    - Should ignore whitespace differences
+    - Should differ by voice, model and voice settings
+    """
+    payload = json.dumps(
+        [voice_id, normalize_text(text), model_id, voice_settings],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PhraseCache:
+    """
+    Two-tier cache of synthesized speech.
+
+    Only pinned phrases (greetings and PREFETCH_PHRASES) are cached, so
+    one-off LLM sentences never fill memory or disk; max_text_chars > 0
+    opts in to caching any text up to that length as well.
+
+    Responsibilities:
+    - Keep recently used phrases in memory, evicting least recently used
+      entries past max_bytes
+    - Persist phrases on disk so restarts do not re-synthesize them,
+      evicting least recently used files past disk_max_bytes
+    - Replay cached audio as an async iterator of chunks
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        cache_dir: Optional[str] = None,
+        max_text_chars: int = 0,
+        disk_max_bytes: int = 64 * 1024 * 1024,
+        pinned: Iterable[str] = ()
+    ):
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_text_chars = max_text_chars  # 0: pinned phrases only
+        self.disk_max_bytes = disk_max_bytes
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._pinned: Set[str] = set()  # texts always cached
+        for text in pinned:
+            self.pin(text)
+
+        # Files on disk, least recently used first; scanned on first disk access
+        self._disk: "Optional[OrderedDict[str, int]]" = None
+        self._disk_size = 0
+        self._disk_lock = threading.Lock()  # disk I/O runs in worker threads
+
+        # Counters
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, pinned: Iterable[str] = ()) -> "PhraseCache":
+        return cls(
+            max_bytes=settings.TTS_CACHE_MAX_BYTES,
+            cache_dir=settings.TTS_CACHE_DIR or None,
+            max_text_chars=settings.TTS_CACHE_MAX_TEXT_CHARS,
+            disk_max_bytes=settings.TTS_CACHE_DISK_MAX_BYTES,
+            pinned=pinned,
+        )
+
+    def pin(self, text: str) -> None:
+        """Always cache text, however long (greetings and prefetched phrases)."""
+        self._pinned.add(normalize_text(text))
+
+    def accepts(self, text: str) -> bool:
+        """
+        Whether text is pinned, or short enough when short-text caching is on.
+
+        Test Cases:
+        - Should accept only pinned text by default
+        - Should accept short text when max_text_chars is set
+        """
+        normalized = normalize_text(text)
+        if normalized in self._pinned:
+            return True
+        return 0 < len(normalized) <= self.max_text_chars
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a phrase in memory, then on disk.
+
+        Args:
+            key: Cache key from cache_key()
+
+        Returns:
+            Audio bytes, or None on a miss
+
+        Test Cases:
+        - Should return audio stored in memory
+        - Should load audio from disk into memory
+        - Should return None on a miss
+        """
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+        if self.cache_dir is not None:
+            audio = await asyncio.to_thread(self._read, key)
+            if audio is not None:
+                self._remember(key, audio)
+                self.disk_hits += 1
+                return audio
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, audio: bytes) -> None:
+        """
+        Store a phrase in memory and on disk.
+
+        Args:
+            key: Cache key from cache_key()
+            audio: Complete audio for the phrase
+
+        Test Cases:
+        - Should evict least recently used entries past max_bytes
+        - Should write the phrase to disk
+        - Should evict least recently used files past disk_max_bytes
+        """
+        if not audio:
+            return
+
+        self._remember(key, audio)
+
+        if self.cache_dir is not None:
+            try:
+                await asyncio.to_thread(self._write, key, audio)
+            except OSError as e:
+                logger.warning(f"Could not write TTS cache entry: {e}")
+
+    async def stream(self, audio: bytes) -> AsyncIterator[bytes]:
+        """Replay cached audio in CHUNK_SIZE pieces."""
+        for start in range(0, len(audio), CHUNK_SIZE):
+            yield audio[start:start + CHUNK_SIZE]
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        """Insert into the memory tier and evict down to max_bytes."""
+        if len(audio) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+
+        self._entries[key] = audio
+        self._size += len(audio)
+
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.mp3"
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        with self._disk_lock:
+            self._load_disk_index()
+            if key in self._disk:
+                self._disk.move_to_end(key)
+        try:
+            os.utime(path)  # recency survives restarts
+        except OSError:
+            pass
+        return audio
+
+    def _write(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.disk_max_bytes:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write then rename so readers never see a partial file
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(audio)
+        os.replace(tmp, path)
+
+        with self._disk_lock:
+            self._load_disk_index()
+            previous = self._disk.pop(key, None)
+            if previous is not None:
+                self._disk_size -= previous
+            self._disk[key] = len(audio)
+            self._disk_size += len(audio)
+
+            while self._disk_size > self.disk_max_bytes:
+                evicted, size = self._disk.popitem(last=False)
+                self._disk_size -= size
+                try:
+                    self._path(evicted).unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _load_disk_index(self) -> None:
+        """Index files already on disk, oldest first (call with _disk_lock held)."""
+        if self._disk is not None:
+            return
+
+        files = []
+        for path in self.cache_dir.glob("*/*.mp3"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+
+        self._disk = OrderedDict((key, size) for _, key, size in sorted(files))
+        self._disk_size = sum(self._disk.values())
+
+    @property
+    def size(self) -> int:
+        """Bytes held in memory."""
+        return self._size
+
+    @property
+    def disk_size(self) -> int:
+        """Bytes held on disk (0 until the disk tier is first used)."""
+        return self._disk_size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"PhraseCache(entries={len(self._entries)}, bytes={self._size})"
+
+
+async def warm_cache(
+    tts_service: "TTSService",
+    agents: Iterable["AgentConfig"],
+    phrases: Iterable[str],
+    concurrency: int = 4
+) -> Tuple[int, int]:
+    """
+    Pre-synthesize phrases and greetings for every agent voice.
+
+    Every phrase and greeting is pinned first, so it is cached even if the
+    cache was built without it. Phrases already on disk are loaded instead
+    of synthesized. Failures are logged and skipped so a slow or failing TTS
+    API never blocks startup.
+
+    Args:
+        tts_service: TTSService with a cache attached
+        agents: Agents whose voices and greetings to warm
+        phrases: Phrases every agent may say
+        concurrency: Maximum concurrent synthesis requests
+
+    Returns:
+        (phrases warmed, phrases failed)
+
+    Test Cases:
+    - Should synthesize each phrase once per agent voice
+    - Should warm and pin each phrase and agent greeting
+    - Should skip phrases already cached
+    - Should count failures without raising
+    """
+    phrases = list(phrases)
+    for text in phrases:
+        tts_service.cache.pin(text)
+
+    jobs = set()
+    for agent in agents:
+        jobs.update((agent.voice_id, text) for text in phrases)
+
+        if agent.greeting:
+            tts_service.cache.pin(agent.greeting)
+            jobs.add((agent.voice_id, agent.greeting))
+
+    slots = asyncio.Semaphore(concurrency)
+
+    async def warm(voice_id: str, text: str) -> bool:
+        async with slots:
+            try:
+                async for _ in tts_service.synthesize_stream(text=text, voice_id=voice_id):
+                    pass
+                return True
+            except Exception as e:
+                logger.warning(f"Could not warm TTS cache for {text!r}: {e}")
+                return False
+
+    results = await asyncio.gather(*(warm(voice_id, text) for voice_id, text in sorted(jobs)))
+    warmed = sum(results)
+
+    logger.info(f"TTS cache warmed: {warmed}/{len(results)} phrases")
+    return warmed, len(results) - warmed
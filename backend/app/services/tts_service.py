@@ -1,12 +1,16 @@
 import aiohttp
 from app.config import settings
-from typing import AsyncIterator
+from app.services.metrics import UpstreamTimer
+from app.services.providers import TextToSpeech
+from app.services.tts_cache import PhraseCache, cache_key
+from typing import AsyncIterator, Optional
+import contextlib
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class TTSService:
+class TTSService(TextToSpeech):
     """
     Text-to-Speech service using ElevenLabs.
 
@@ -14,12 +18,27 @@ class TTSService:
     - Convert text to speech
     - Stream audio chunks
     - Handle errors and retries
+    - Serve pinned phrases (greetings, prefetched phrases) from the phrase cache
     """
 
-    def __init__(self):
+    MODEL_ID = "eleven_monolingual_v1"
+    VOICE_SETTINGS = {
+        "stability": 0.5,
+        "similarity_boost": 0.75
+    }
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        cache: Optional[PhraseCache] = None
+    ):
         self.api_key = settings.ELEVENLABS_API_KEY
         self.api_url = "https://api.elevenlabs.io/v1"
 
+        # Shared pooled session; None opens a short-lived session per call
+        self.session = session
+        self.cache = cache
+
     async def synthesize_stream(
         self,
         text: str,
@@ -45,6 +64,8 @@ class TTSService:
         - Should raise ValueError for empty voice_id
         - Should yield multiple chunks
         - Should handle API errors gracefully
+        - Should replay cached phrases without calling the API
+        - Should cache pinned phrases after a complete stream
         """
 
         if not text or text.strip() == "":
@@ -53,6 +74,28 @@ class TTSService:
         if not voice_id or voice_id.strip() == "":
             raise ValueError("Voice ID cannot be empty")
 
+        if self.cache is None or not self.cache.accepts(text):
+            async for chunk in self._stream_api(text, voice_id):
+                yield chunk
+            return
+
+        key = cache_key(voice_id, text, self.MODEL_ID, self.VOICE_SETTINGS)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            async for chunk in self.cache.stream(cached):
+                yield chunk
+            return
+
+        # Only complete streams are stored, so an aborted one is never replayed
+        chunks = []
+        async for chunk in self._stream_api(text, voice_id):
+            chunks.append(chunk)
+            yield chunk
+
+        await self.cache.put(key, b"".join(chunks))
+
+    async def _stream_api(self, text: str, voice_id: str) -> AsyncIterator[bytes]:
+        """Stream speech for text from the ElevenLabs API."""
         url = f"{self.api_url}/text-to-speech/{voice_id}/stream"
 
         headers = {
@@ -62,15 +105,18 @@ class TTSService:
 
         data = {
             "text": text,
-            "model_id": "eleven_monolingual_v1",
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.75
-            }
+            "model_id": self.MODEL_ID,
+            "voice_settings": self.VOICE_SETTINGS
         }
 
+        upstream = UpstreamTimer("elevenlabs", "tts")
         try:
-            async with aiohttp.ClientSession() as session:
+            if self.session is not None:
+                session_context = contextlib.nullcontext(self.session)
+            else:
+                session_context = aiohttp.ClientSession()
+
+            async with session_context as session:
                 async with session.post(url, json=data, headers=headers) as response:
                     if response.status != 200:
                         error_text = await response.text()
@@ -80,11 +126,14 @@ class TTSService:
                     chunk_count = 0
                     async for chunk in response.content.iter_chunked(4096):
                         chunk_count += 1
+                        upstream.first_byte()
                         yield chunk
 
+                    upstream.done()
                     logger.info(f"TTS streaming complete: {chunk_count} chunks")
 
         except Exception as e:
+            upstream.failed()
             logger.error(f"TTS synthesis failed: {e}", exc_info=True)
             raise
 
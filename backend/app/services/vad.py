@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import List, Optional
+import numpy as np
+import logging
+
+from app.services.audio_analysis import frame_dbfs, frame_signal
+
+logger = logging.getLogger(__name__)
+
+
+class VADEvent(StrEnum):
+    """Voice activity events"""
+
+    SPEECH_START = "speech_start"
+    SPEECH_END = "speech_end"  # End of utterance (after hangover)
+    PAUSE = "pause"  # Silence began; the utterance may be ending (hangover running)
+    RESUME = "resume"  # Speech came back before the hangover ran out
+
+
+@dataclass
+class VADConfig:
+    """Voice activity detector configuration"""
+
+    sample_rate: int = 16000
+    frame_ms: int = 20
+    threshold_db: float = -40.0  # Frames louder than this count as speech
+    min_speech_ms: int = 100  # Speech needed before SPEECH_START
+    hangover_ms: int = 500  # Silence needed after speech before SPEECH_END
+    pause_ms: Optional[int] = None  # Silence before PAUSE; None disables PAUSE/RESUME
+
+    @property
+    def frame_samples(self) -> int:
+        return self.sample_rate * self.frame_ms // 1000
+
+
+class VoiceActivityDetector:
+    """
+    Incremental energy-based voice activity detector.
+
+    Responsibilities:
+    - Consume 16-bit mono PCM in arbitrary chunk sizes
+    - Classify fixed-size frames as speech or silence
+    - Track speech/silence state with hangover
+    - Emit SPEECH_START and SPEECH_END (end-of-utterance) events
+    - Optionally emit PAUSE/RESUME within the hangover window
+    """
+
+    def __init__(self, config: VADConfig = None):
+        self.config = config or VADConfig()
+        self.in_speech = False
+        self._pending = b""
+        self._speech_run = 0  # consecutive speech frames
+        self._silence_run = 0  # consecutive silence frames
+        self._min_speech_frames = max(1, self.config.min_speech_ms // self.config.frame_ms)
+        self._hangover_frames = max(1, self.config.hangover_ms // self.config.frame_ms)
+        self._pause_frames = (
+            max(1, self.config.pause_ms // self.config.frame_ms)
+            if self.config.pause_ms is not None else None
+        )
+        self.paused = False
+
+    def process(self, pcm: bytes) -> List[VADEvent]:
+        """
+        Feed PCM audio and return any state changes.
+
+        Args:
+            pcm: 16-bit little-endian mono PCM (any length)
+
+        Returns:
+            Events in the order they occurred
+
+        Test Cases:
+        - Should emit SPEECH_START after min_speech_ms of loud frames
+        - Should emit SPEECH_END after hangover_ms of silence
+        - Should ignore short noise bursts
+        - Should not end the utterance on short pauses
+        - Should handle chunks that split frames
+        - Should emit PAUSE after pause_ms of silence and RESUME on speech
+        """
+        frame_bytes = self.config.frame_samples * 2
+        data = self._pending + pcm
+        n_frames = len(data) // frame_bytes
+        self._pending = data[n_frames * frame_bytes:]
+
+        if n_frames == 0:
+            return []
+
+        samples = np.frombuffer(data, dtype="<i2", count=n_frames * self.config.frame_samples)
+        levels = frame_dbfs(frame_signal(samples, self.config.frame_samples))
+        is_speech = levels > self.config.threshold_db
+
+        events = []
+        for speech in is_speech:
+            if speech:
+                self._speech_run += 1
+                self._silence_run = 0
+            else:
+                self._silence_run += 1
+                self._speech_run = 0
+
+            if not self.in_speech and self._speech_run >= self._min_speech_frames:
+                self.in_speech = True
+                events.append(VADEvent.SPEECH_START)
+
+            elif self.in_speech and self._silence_run >= self._hangover_frames:
+                self.in_speech = False
+                self.paused = False
+                events.append(VADEvent.SPEECH_END)
+
+            elif self.in_speech and self._pause_frames is not None:
+                if not self.paused and self._silence_run >= self._pause_frames:
+                    self.paused = True
+                    events.append(VADEvent.PAUSE)
+                elif self.paused and speech:
+                    self.paused = False
+                    events.append(VADEvent.RESUME)
+
+        return events
+
+    def reset(self) -> None:
+        """Clear all state for the next utterance."""
+        self.in_speech = False
+        self.paused = False
+        self._pending = b""
+        self._speech_run = 0
+        self._silence_run = 0
+
+    def __repr__(self):
+        return f"VoiceActivityDetector(in_speech={self.in_speech})"
+
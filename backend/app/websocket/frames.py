@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from enum import IntEnum
+import struct
+
+# Binary frame layout (network byte order):
+#   version:  uint8
+#   type:     uint8  (FrameType)
+#   flags:    uint8  (FLAG_*)
+#   reserved: uint8
+#   sequence: uint32
+# followed by the raw audio payload.
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("!BBBxI")
+
+# Marks the last frame of an utterance (inbound) or response (outbound)
+FLAG_FINAL = 0x01
+
+
+class FrameType(IntEnum):
+    """Binary frame types"""
+
+    # Client → Server
+    AUDIO_CHUNK = 1
+
+    # Server → Client
+    AUDIO_RESPONSE = 2
+
+
+@dataclass
+class BinaryFrame:
+    """Decoded binary audio frame"""
+
+    type: FrameType
+    sequence: int
+    payload: bytes
+    is_final: bool = False
+
+
+def encode_frame(
+    frame_type: FrameType,
+    payload: bytes,
+    sequence: int = 0,
+    is_final: bool = False
+) -> bytes:
+    """
+    Encode an audio payload as a binary frame.
+
+    Args:
+        frame_type: Frame type
+        payload: Raw audio bytes
+        sequence: Per-session sequence number (wraps at 2**32)
+        is_final: Whether this is the last frame in a sequence
+
+    Returns:
+        Header followed by the payload
+
+    Test Cases:
+    - Should round-trip through decode_frame
+    - Should set the final flag
+    - Should wrap sequence numbers
+    """
+    flags = FLAG_FINAL if is_final else 0
+    header = FRAME_HEADER.pack(FRAME_VERSION, frame_type, flags, sequence & 0xFFFFFFFF)
+    return header + payload
+
+
+def decode_frame(data: bytes) -> BinaryFrame:
+    """
+    Decode a binary frame.
+
+    Args:
+        data: Raw WebSocket binary message
+
+    Returns:
+        BinaryFrame
+
+    Raises:
+        ValueError: If the frame is truncated, has an unknown version or type
+
+    Test Cases:
+    - Should decode header and payload
+    - Should raise ValueError for truncated frames
+    - Should raise ValueError for unknown version
+    - Should raise ValueError for unknown frame type
+    """
+    if len(data) < FRAME_HEADER.size:
+        raise ValueError("Binary frame too short")
+
+    version, frame_type, flags, sequence = FRAME_HEADER.unpack_from(data)
+
+    if version != FRAME_VERSION:
+        raise ValueError(f"Unsupported frame version: {version}")
+
+    try:
+        frame_type = FrameType(frame_type)
+    except ValueError:
+        raise ValueError(f"Unknown frame type: {frame_type}")
+
+    return BinaryFrame(
+        type=frame_type,
+        sequence=sequence,
+        payload=data[FRAME_HEADER.size:],
+        is_final=bool(flags & FLAG_FINAL),
+    )
@@ -1,12 +1,47 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.websocket.manager import manager
 from app.websocket.types import MessageType, WebSocketMessage
-from app.agents.config import get_agent_config
+from app.websocket.frames import BinaryFrame, FrameType, decode_frame
+from app.websocket.turns import TurnController
+from app.websocket.serialization import parse_message
+from app.services.stt_service import STTService
+from app.services.llm_service import LLMService, ModelParams
+from app.services.tts_service import TTSService
+from app.services.speech_pipeline import stream_tts_immediately
+from app.services.speculation import Speculation
+from app.services.tracing import TracedTTS, TurnTrace, UtteranceTiming, traced_tokens, tracer
+from app.services.streaming_stt import StreamingTranscriber, create_stt_backend
+from app.services.clients import ClientRegistry
+from app.services.local_providers import LocalProviders
+from app.services.metrics import TURN_STAGE, WS_BYTES, WS_MESSAGES
+from app.services.providers import LanguageModel, SpeechToText, TextToSpeech
+from app.services.audio_workers import AudioPoolSaturated, AudioWorkerPool
+from app.services.stt_preprocessor import STTPreprocessor
+from app.services.tts_cache import PhraseCache
+from app.services.vad import VADConfig, VADEvent, VoiceActivityDetector
+from app.services.audio_decoder import PCMDecoder, StreamingDecoder
+from app.config import settings
+from app.agents.config import AgentConfig, get_agent_config
+from typing import Optional, Tuple
+import asyncio
+import base64
 import logging
+import shutil
+import time
+import numpy as np
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Process buffered audio once it reaches this size (~1 second at 48kHz)
+AUDIO_BUFFER_THRESHOLD = 48000
+
+# Accepted ?format= values: raw PCM, or containers the ffmpeg decoder reads
+AUDIO_FORMATS = ('pcm16', 'webm', 'ogg', 'wav', 'mp3')
+
+_RECEIVED_MESSAGES = WS_MESSAGES.labels("in")
+_RECEIVED_BYTES = WS_BYTES.labels("in")
+
 
 @router.websocket("/voice-agent/{agent_id}")
 async def voice_agent_endpoint(websocket: WebSocket, agent_id: str):
@@ -17,19 +52,40 @@ async def voice_agent_endpoint(websocket: WebSocket, agent_id: str):
     1. Validate agent_id
     2. Accept connection
     3. Send connection confirmation
-    4. Listen for messages
-    5. Handle messages based on type
-    6. Cleanup on disconnect
+    4. Stream the agent greeting
+    5. Read messages (JSON text or binary audio frames) into the inbound queue
+    6. Handle queued messages based on type in the pipeline worker
+    7. Cleanup on disconnect
+
+    Clients that send binary AUDIO_CHUNK frames, or connect with
+    ?binary=true, receive AUDIO_RESPONSE as binary frames too.
+
+    Reconnecting with ?session_id=<id> from connection_established resumes
+    the conversation history from the session store, on any worker.
+
+    Each agent turn runs as a background task, so the caller can barge in:
+    new speech cancels the in-flight turn and the client is told to flush
+    queued audio.
+
+    WebM/Opus audio is decoded incrementally by a per-session ffmpeg
+    process; clients that connect with ?format=pcm16&sample_rate=16000
+    stream raw 16-bit mono PCM instead. Either way the server endpoints
+    utterances with VAD rather than waiting for is_final or a fixed
+    buffer size.
 
     Test Cases:
     - Should reject invalid agent_id
     - Should accept valid connection
     - Should send connection_established message
+    - Should stream the agent greeting after connecting
     - Should handle audio_chunk messages
+    - Should handle binary audio frames
     - Should handle end_session messages
     - Should cleanup on disconnect
     - Should handle WebSocketDisconnect gracefully
     - Should handle errors and send error messages
+    - Should interrupt the agent when the caller starts speaking
+    - Should resume a session's history without greeting again
     """
 
     # Validate agent
@@ -38,8 +94,28 @@ async def voice_agent_endpoint(websocket: WebSocket, agent_id: str):
         await websocket.close(code=1003, reason="Invalid agent ID")
         return
 
+    # Validate audio parameters before the session exists
+    try:
+        audio_format, sample_rate = parse_audio_params(websocket.query_params)
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+
     # Accept connection
-    session_id = await manager.connect(websocket, agent_id)
+    binary_audio = websocket.query_params.get('binary', '').lower() in ('1', 'true')
+    session_id = await manager.connect(
+        websocket, agent_id,
+        binary_audio=binary_audio,
+        resume_id=websocket.query_params.get('session_id')
+    )
+
+    decoder = create_decoder(audio_format, sample_rate)
+    manager.update_session(session_id, {
+        'audio_format': audio_format,
+        'decoder': decoder,
+        'vad': create_vad(decoder.sample_rate) if decoder else None,
+        'turns': TurnController(session_id),
+    })
 
     # Send connection confirmation
     await manager.send_message(session_id, {
@@ -48,30 +124,78 @@ async def voice_agent_endpoint(websocket: WebSocket, agent_id: str):
         'agent': agent_config.name,
     })
 
-    try:
-        while True:
-            # Receive message from client
-            data = await websocket.receive_json()
-            message = WebSocketMessage(**data)
-
-            # Route message
-            if message.type == MessageType.AUDIO_CHUNK:
-                # TODO: Implement handle_audio_chunk
-                await manager.send_message(session_id, {
-                    'type': MessageType.STATUS_UPDATE,
-                    'status': 'processing'
-                })
+    # Services are created on first use so idle connections stay cheap
+    clients = getattr(websocket.app.state, 'clients', None)
+    audio_pool = getattr(websocket.app.state, 'audio_pool', None)
+    tts_cache = getattr(websocket.app.state, 'tts_cache', None)
+    providers = getattr(websocket.app.state, 'providers', None)
+    services = None
 
-            elif message.type == MessageType.END_SESSION:
-                break
+    async def handle(message: WebSocketMessage | BinaryFrame) -> bool:
+        """Process one client message; returns False to end the session."""
+        nonlocal services
 
-            else:
-                # Unknown message type
-                logger.warning(f"Unknown message type: {message.type}")
+        if isinstance(message, BinaryFrame):
+            if message.type != FrameType.AUDIO_CHUNK:
                 await manager.send_message(session_id, {
                     'type': MessageType.ERROR,
-                    'message': f'Unknown message type: {message.type}'
+                    'message': f'Unexpected binary frame type: {message.type.name}'
                 })
+                return True
+
+            # Reply in kind once the client speaks binary
+            manager.update_session(session_id, {'binary_audio': True})
+
+            if services is None:
+                services = create_services(clients, audio_pool, tts_cache, providers)
+
+            await handle_audio_chunk(
+                session_id, message.payload, message.is_final,
+                *services, agent_config
+            )
+
+        # Route message
+        elif message.type == MessageType.AUDIO_CHUNK:
+            if services is None:
+                services = create_services(clients, audio_pool, tts_cache, providers)
+
+            audio_data = base64.b64decode(message.data) if message.data else b""
+            await handle_audio_chunk(
+                session_id, audio_data, message.is_final,
+                *services, agent_config
+            )
+
+        elif message.type == MessageType.END_SESSION:
+            await manager.end_session(session_id)
+            return False
+
+        else:
+            # Unknown message type
+            logger.warning(f"Unknown message type: {message.type}")
+            await manager.send_message(session_id, {
+                'type': MessageType.ERROR,
+                'message': f'Unknown message type: {message.type}'
+            })
+
+        return True
+
+    try:
+        # Greet right away (not when resuming); the audio was pre-synthesized at startup
+        resumed = bool(manager.get_session(session_id)['conversation_history'])
+        if agent_config.greeting and (settings.ELEVENLABS_API_KEY or providers) and not resumed:
+            if providers is not None:
+                tts_service = providers.create_services()[2]
+            else:
+                tts_service = TTSService(
+                    session=clients.elevenlabs if clients else None,
+                    cache=tts_cache
+                )
+            await manager.get_session(session_id)['turns'].start(
+                send_greeting(session_id, agent_config, tts_service)
+            )
+
+        # Reader, pipeline worker and writer run as separate tasks
+        await manager.run(session_id, lambda: receive_message(websocket), handle)
 
     except WebSocketDisconnect:
         logger.info(f"Client disconnected: {session_id}")
@@ -85,5 +209,716 @@ async def voice_agent_endpoint(websocket: WebSocket, agent_id: str):
 
     finally:
         # Cleanup
+        session = manager.get_session(session_id)
+        if session and session.get('turns'):
+            await session['turns'].cancel()
+
+        if session and session.get('decoder'):
+            await session['decoder'].close()
+
+        await cancel_speculation(session_id)
+        await cancel_partial_transcript(session_id)
+
         manager.disconnect(session_id)
-        logger.info(f"Session ended: {session_id}")
\ No newline at end of file
+        logger.info(f"Session ended: {session_id}")
+
+
+def parse_audio_params(query_params) -> Tuple[str, int]:
+    """
+    Read the audio format and sample rate from the connection query.
+
+    Args:
+        query_params: WebSocket query parameters
+
+    Returns:
+        (audio_format, sample_rate)
+
+    Raises:
+        ValueError: If the format is unsupported or the sample rate is not a positive integer
+
+    Test Cases:
+    - Should default to webm at DECODER_SAMPLE_RATE
+    - Should reject a non-numeric or non-positive sample rate
+    - Should reject an unsupported format
+    """
+    audio_format = query_params.get('format', 'webm')
+    if audio_format not in AUDIO_FORMATS:
+        raise ValueError(f"Unsupported audio format: {audio_format}")
+
+    raw_rate = query_params.get('sample_rate', str(settings.DECODER_SAMPLE_RATE))
+    try:
+        sample_rate = int(raw_rate)
+    except ValueError:
+        raise ValueError(f"Invalid sample_rate: {raw_rate}") from None
+    if sample_rate <= 0:
+        raise ValueError(f"Invalid sample_rate: {raw_rate}")
+
+    return audio_format, sample_rate
+
+
+def create_decoder(audio_format: str, sample_rate: int) -> Optional[PCMDecoder]:
+    """
+    Build the per-session audio decoder.
+
+    Args:
+        audio_format: 'pcm16' for raw PCM, otherwise an ffmpeg input format
+        sample_rate: PCM sample rate to decode to
+
+    Returns:
+        Decoder, or None to buffer encoded audio as-is (ffmpeg unavailable)
+
+    Test Cases:
+    - Should return a PCMDecoder for pcm16
+    - Should return a StreamingDecoder when ffmpeg is available
+    - Should return None when streaming decode is disabled or ffmpeg is missing
+    """
+    if audio_format == 'pcm16':
+        return PCMDecoder(sample_rate)
+
+    if not settings.STREAMING_DECODER_ENABLED or not shutil.which(settings.FFMPEG_PATH):
+        return None
+
+    return StreamingDecoder(
+        sample_rate=sample_rate,
+        input_format=audio_format,
+        ffmpeg_path=settings.FFMPEG_PATH,
+    )
+
+
+def create_vad(sample_rate: int) -> VoiceActivityDetector:
+    """
+    Build a voice activity detector from settings.
+
+    Args:
+        sample_rate: PCM sample rate of the session
+
+    Returns:
+        VoiceActivityDetector
+    """
+    return VoiceActivityDetector(VADConfig(
+        sample_rate=sample_rate,
+        frame_ms=settings.VAD_FRAME_MS,
+        threshold_db=settings.VAD_THRESHOLD_DB,
+        min_speech_ms=settings.VAD_MIN_SPEECH_MS,
+        hangover_ms=settings.VAD_HANGOVER_MS,
+        pause_ms=settings.SPECULATIVE_PAUSE_MS if settings.SPECULATIVE_LLM else None,
+    ))
+
+
+def create_services(
+    clients: Optional[ClientRegistry],
+    audio_pool: Optional[AudioWorkerPool] = None,
+    tts_cache: Optional[PhraseCache] = None,
+    providers: Optional[LocalProviders] = None
+) -> Tuple[SpeechToText, LanguageModel, TextToSpeech]:
+    """
+    Build the pipeline services for a session.
+
+    Args:
+        clients: Shared client registry from the app lifespan, if running
+        audio_pool: Shared audio worker pool from the app lifespan, if running
+        tts_cache: Shared TTS phrase cache from the app lifespan, if enabled
+        providers: Local stand-ins (PROVIDERS=local) replacing the API services
+
+    Returns:
+        (STTService, LLMService, TTSService), or their local stand-ins
+
+    Test Cases:
+    - Should inject shared clients when a registry is available
+    - Should fall back to per-service clients without a registry
+    - Should run STT preprocessing in the audio pool when available
+    - Should attach the phrase cache to the TTS service
+    - Should use local stand-ins when configured
+    """
+    preprocessor = STTPreprocessor(pool=audio_pool)
+
+    if providers is not None:
+        return providers.create_services(preprocessor)
+
+    if clients is None:
+        return STTService(preprocessor=preprocessor), LLMService(), TTSService(cache=tts_cache)
+
+    return (
+        STTService(client=clients.openai, preprocessor=preprocessor),
+        LLMService(client=clients.openai),
+        TTSService(session=clients.elevenlabs, cache=tts_cache),
+    )
+
+
+async def receive_message(websocket: WebSocket) -> WebSocketMessage | BinaryFrame:
+    """
+    Receive the next client message.
+
+    Args:
+        websocket: FastAPI WebSocket object
+
+    Returns:
+        WebSocketMessage for text frames, BinaryFrame for binary frames
+
+    Raises:
+        WebSocketDisconnect: If the client disconnected
+        ValueError: If a frame is malformed (pydantic ValidationError for JSON)
+
+    Test Cases:
+    - Should parse JSON text frames
+    - Should decode binary frames
+    - Should raise WebSocketDisconnect on disconnect
+    """
+    event = await websocket.receive()
+
+    if event['type'] == 'websocket.disconnect':
+        raise WebSocketDisconnect(event.get('code', 1000))
+
+    _RECEIVED_MESSAGES.inc()
+    if event.get('bytes') is not None:
+        _RECEIVED_BYTES.inc(len(event['bytes']))
+        return decode_frame(event['bytes'])
+
+    _RECEIVED_BYTES.inc(len(event['text']))
+    return parse_message(event['text'])
+
+
+async def send_greeting(
+    session_id: str,
+    agent_config: AgentConfig,
+    tts_service: TextToSpeech
+) -> None:
+    """
+    Speak the agent greeting and record it in the conversation history.
+
+    Failures are logged and the session carries on without a greeting.
+
+    Args:
+        session_id: Target session
+        agent_config: Agent whose greeting to send
+        tts_service: TTS service (normally backed by the phrase cache)
+
+    Test Cases:
+    - Should send the greeting text followed by its audio
+    - Should add the greeting to the conversation history
+    - Should not fail the session when synthesis fails
+    """
+    greeting = agent_config.greeting
+
+    await manager.send_message(session_id, {
+        'type': MessageType.LLM_RESPONSE,
+        'text': greeting,
+        'is_final': True
+    })
+
+    try:
+        async for audio_chunk in tts_service.synthesize_stream(
+            text=greeting,
+            voice_id=agent_config.voice_id
+        ):
+            await manager.send_audio(session_id, audio_chunk)
+
+        await manager.send_audio(session_id, b"", is_final=True)
+
+    except Exception as e:
+        logger.warning(f"Could not play greeting for {session_id}: {e}")
+
+    await manager.append_history(session_id, [{'role': 'assistant', 'content': greeting}])
+
+
+async def handle_audio_chunk(
+    session_id: str,
+    audio_data: bytes,
+    is_final: bool,
+    stt_service: SpeechToText,
+    llm_service: LanguageModel,
+    tts_service: TextToSpeech,
+    agent_config: AgentConfig
+) -> None:
+    """
+    Buffer incoming audio and start the voice pipeline when a turn is complete.
+
+    Args:
+        session_id: Session identifier
+        audio_data: Raw audio bytes from the client
+        is_final: Whether the client marked the end of the utterance
+        stt_service: Speech-to-text service
+        llm_service: LLM service
+        tts_service: Text-to-speech service
+        agent_config: Agent configuration for this session
+
+    Test Cases:
+    - Should buffer audio until is_final or threshold
+    - Should decode audio incrementally when a decoder is available
+    - Should endpoint on VAD end-of-utterance
+    - Should interrupt the running turn on VAD speech start
+    - Should speculate on a pause and hand the speculation to the turn
+    - Should cancel the speculation when speech resumes
+    - Should send partial transcripts while the caller speaks
+    - Should run the turn in the background
+    """
+
+    # Get session
+    session = manager.get_session(session_id)
+    if not session:
+        return
+
+    buffer = session['audio_buffer']
+    decoder = session.get('decoder')
+    vad = session.get('vad')
+    timing = session.setdefault('timing', UtteranceTiming())
+    received_ns = manager.received_at(session_id) or time.time_ns()
+    handled_ns = time.time_ns()
+
+    if decoder is not None:
+        # Decode incrementally; the buffer holds PCM for this utterance
+        samples = await decoder.feed(audio_data)
+        if is_final:
+            # Client ended the recording stream: drain the decoder
+            samples = np.concatenate([samples, await decoder.close()])
+
+        pcm = samples.tobytes()
+        buffer.extend(pcm)
+        decoded_ns = time.time_ns()
+
+        # Endpoint on VAD end-of-utterance
+        events = vad.process(pcm)
+        should_process = is_final or VADEvent.SPEECH_END in events
+
+        if VADEvent.SPEECH_START in events:
+            timing.reset()
+        timing.record(received_ns, handled_ns, decoded_ns, time.time_ns())
+
+        # Barge-in: the caller talks over the agent
+        if VADEvent.SPEECH_START in events:
+            await interrupt_turn(session_id)
+
+        # Speculate on what was said so far while the hangover runs
+        if VADEvent.PAUSE in events and vad.paused and not should_process:
+            await start_speculation(
+                session_id, bytes(buffer), decoder.sample_rate,
+                stt_service, llm_service, agent_config
+            )
+        elif VADEvent.RESUME in events:
+            await cancel_speculation(session_id)
+
+        # Partial transcripts while the caller is still speaking
+        if settings.STREAMING_STT and not should_process:
+            feed_partial_transcriber(
+                session_id, buffer if VADEvent.SPEECH_START in events else pcm,
+                VADEvent.SPEECH_START in events, decoder.sample_rate, stt_service
+            )
+
+        if not vad.in_speech and not should_process:
+            # Only keep a short pre-roll of the silence before speech
+            preroll_bytes = decoder.sample_rate * settings.VAD_PREROLL_MS // 1000 * 2
+            if len(buffer) > preroll_bytes:
+                del buffer[:len(buffer) - preroll_bytes]
+
+    else:
+        # Add to buffer
+        buffer.extend(audio_data)
+        timing.record(received_ns, handled_ns)
+
+        # Check if we should process (is_final flag or buffer size)
+        should_process = (
+            is_final or
+            len(buffer) >= AUDIO_BUFFER_THRESHOLD
+        )
+
+    if not should_process or not buffer:
+        return
+
+    if vad is not None:
+        vad.reset()
+
+    await cancel_partial_transcript(session_id)
+
+    # Get buffered audio
+    audio_bytes = bytes(buffer)
+    buffer.clear()
+
+    # A new utterance supersedes whatever the agent is still saying
+    await interrupt_turn(session_id)
+    await session['turns'].start(run_turn(
+        session_id, audio_bytes, decoder.sample_rate if decoder else None,
+        stt_service, llm_service, tts_service, agent_config,
+        speculation=session.pop('speculation', None),
+        trace=timing.start_trace(session_id, agent_config.id)
+    ))
+
+
+async def start_speculation(
+    session_id: str,
+    pcm: bytes,
+    sample_rate: int,
+    stt_service: SpeechToText,
+    llm_service: LanguageModel,
+    agent_config: AgentConfig
+) -> None:
+    """
+    Transcribe the utterance so far and start the LLM on it, ahead of SPEECH_END.
+
+    Args:
+        session_id: Session identifier
+        pcm: int16 PCM of the utterance so far
+        sample_rate: PCM sample rate
+        stt_service: Speech-to-text service
+        llm_service: LLM service
+        agent_config: Agent configuration for this session
+
+    Test Cases:
+    - Should replace an earlier speculation
+    """
+    session = manager.get_session(session_id)
+    if not session:
+        return
+
+    await cancel_speculation(session_id)
+
+    history = manager.prompt_history(session_id)
+    session['speculation'] = Speculation(
+        transcribe=lambda: stt_service.transcribe_pcm(
+            np.frombuffer(pcm, dtype=np.int16), sample_rate
+        ),
+        generate=lambda transcript: llm_service.stream_chat(
+            message=transcript,
+            agent_prompt=agent_config.prompt,
+            conversation_history=history,
+            params=ModelParams.for_agent(agent_config)
+        ),
+        name=f"speculation:{session_id}",
+    )
+
+
+def feed_partial_transcriber(
+    session_id: str,
+    pcm: bytes,
+    speech_start: bool,
+    sample_rate: int,
+    stt_service: SpeechToText
+) -> None:
+    """
+    Feed speech to the session's streaming transcriber and start a pass when due.
+
+    Passes run in the background, one at a time, so a slow STT request never
+    holds up the audio pipeline; audio that arrives meanwhile is picked up by
+    the next pass.
+
+    Args:
+        session_id: Session identifier
+        pcm: int16 PCM to add (the whole buffer, pre-roll included, on speech start)
+        speech_start: Whether a new utterance starts with this audio
+        sample_rate: PCM sample rate
+        stt_service: Speech-to-text service (used by the whisper backend)
+
+    Test Cases:
+    - Should only transcribe audio while the caller is speaking
+    - Should run at most one pass at a time
+    """
+    session = manager.get_session(session_id)
+    vad = session.get('vad') if session else None
+    if vad is None:
+        return
+
+    transcriber = session.get('transcriber')
+    if speech_start:
+        if transcriber is None:
+            transcriber = session['transcriber'] = StreamingTranscriber(
+                create_stt_backend(stt_service),
+                sample_rate,
+                window_ms=settings.STREAMING_STT_WINDOW_MS,
+                interval_ms=settings.STREAMING_STT_INTERVAL_MS,
+            )
+        transcriber.reset()
+    elif transcriber is None or not vad.in_speech:
+        return
+
+    transcriber.feed(bytes(pcm))
+
+    task = session.get('partial_task')
+    if transcriber.due and (task is None or task.done()):
+        session['partial_task'] = asyncio.create_task(
+            send_partial_transcript(session_id, transcriber),
+            name=f"partial:{session_id}"
+        )
+
+
+async def send_partial_transcript(session_id: str, transcriber: StreamingTranscriber) -> None:
+    """Run one streaming transcription pass and send the partial result."""
+    try:
+        partial = await transcriber.update()
+    except Exception as e:
+        # The final transcript is still taken from the whole utterance
+        logger.warning(f"Partial transcription failed for {session_id}: {e}")
+        return
+
+    if partial.text:
+        await manager.send_message(session_id, {
+            'type': MessageType.TRANSCRIPTION,
+            'text': partial.text,
+            'stable_text': partial.stable,
+            'is_final': False
+        })
+
+
+async def cancel_partial_transcript(session_id: str) -> None:
+    """Abort the session's running partial transcription pass, if any."""
+    session = manager.get_session(session_id)
+    task = session.pop('partial_task', None) if session else None
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def cancel_speculation(session_id: str) -> None:
+    """Abort the session's pending speculation, if any."""
+    session = manager.get_session(session_id)
+    speculation = session.pop('speculation', None) if session else None
+    if speculation is not None:
+        await speculation.cancel()
+
+
+async def interrupt_turn(session_id: str) -> bool:
+    """
+    Cancel the session's running turn and tell the client to drop queued audio.
+
+    Audio of the cancelled turn still waiting in the outbound queue is
+    dropped first, so nothing from it is sent after FLUSH_AUDIO.
+
+    Args:
+        session_id: Session identifier
+
+    Returns:
+        True if a turn was interrupted
+
+    Test Cases:
+    - Should send flush_audio when a turn was cancelled
+    - Should not send audio of the cancelled turn after flush_audio
+    - Should do nothing when no turn is running
+    """
+    session = manager.get_session(session_id)
+    if not session or not await session['turns'].interrupt():
+        return False
+
+    manager.flush_audio(session_id)
+    await manager.send_message(session_id, {
+        'type': MessageType.FLUSH_AUDIO,
+    })
+    return True
+
+
+async def run_turn(
+    session_id: str,
+    audio_bytes: bytes,
+    sample_rate: Optional[int],
+    stt_service: SpeechToText,
+    llm_service: LanguageModel,
+    tts_service: TextToSpeech,
+    agent_config: AgentConfig,
+    speculation: Optional[Speculation] = None,
+    trace: Optional[TurnTrace] = None
+) -> None:
+    """
+    Run one STT → LLM → TTS turn.
+
+    Cancelling the task aborts the upstream OpenAI and ElevenLabs streams;
+    whatever the agent already said is kept in the conversation history.
+
+    A speculation started during the hangover is committed when its
+    transcript matches the final one, and cancelled otherwise.
+
+    Each stage is recorded as a span of the turn's trace, which is handed
+    to the tracer when the turn ends (and summarized in the final idle
+    status_update with TRACING_STATUS_UPDATES).
+
+    Args:
+        session_id: Session identifier
+        audio_bytes: Utterance audio (int16 PCM when sample_rate is set)
+        sample_rate: PCM sample rate, or None for encoded audio
+        stt_service: Speech-to-text service
+        llm_service: LLM service
+        tts_service: Text-to-speech service
+        agent_config: Agent configuration for this session
+        speculation: LLM response started on a partial transcript, if any
+        trace: Trace begun with the utterance's receive/decode/VAD spans
+
+    Test Cases:
+    - Should send transcription, LLM segments and audio chunks
+    - Should start TTS before the LLM response is complete
+    - Should append the turn to conversation history
+    - Should keep the partial response when cancelled
+    - Should send an error and go idle when a service fails
+    - Should commit a matching speculation instead of calling the LLM
+    - Should cancel a speculation that does not match
+    - Should record a trace of the turn's stages
+    """
+    session = manager.get_session(session_id)
+    if not session:
+        if speculation is not None:
+            await speculation.cancel()
+        return
+
+    history = manager.prompt_history(session_id)
+    transcription = ""
+    response_segments = []
+    recorded = False
+
+    trace = trace or TurnTrace(session_id, agent_id=agent_config.id)
+    if session.get('turns') is not None:
+        trace.turn_id = session['turns'].turn_id
+    sent_before = manager.send_totals(session_id)
+
+    try:
+        # Update status
+        await manager.send_message(session_id, {
+            'type': MessageType.STATUS_UPDATE,
+            'status': 'processing'
+        })
+
+        # 1. Speech-to-Text
+        with trace.span("stt", audio_bytes=len(audio_bytes)):
+            if sample_rate is not None:
+                # Trimmed, 16 kHz and compactly encoded before upload
+                transcription = await stt_service.transcribe_pcm(
+                    np.frombuffer(audio_bytes, dtype=np.int16),
+                    sample_rate
+                )
+            else:
+                transcription = await stt_service.transcribe(audio_bytes)
+
+        await manager.send_message(session_id, {
+            'type': MessageType.TRANSCRIPTION,
+            'text': transcription,
+            'is_final': True
+        })
+
+        if not transcription.strip():
+            finish_trace(session_id, trace, sent_before, "empty")
+            await manager.send_message(session_id, idle_status(trace))
+            return
+
+        # 2. LLM tokens are cut into segments and synthesized while generation continues
+        if speculation is not None and await speculation.matches(
+            transcription, settings.SPECULATIVE_MATCH_THRESHOLD
+        ):
+            logger.info(f"Committing speculative response: {session_id}")
+            tokens = traced_tokens(trace, speculation.tokens(), speculative=True)
+        else:
+            if speculation is not None:
+                await speculation.cancel()
+            tokens = traced_tokens(trace, llm_service.stream_chat(
+                message=transcription,
+                agent_prompt=agent_config.prompt,
+                conversation_history=history,
+                params=ModelParams.for_agent(agent_config)
+            ))
+
+        async def on_segment(segment: str) -> None:
+            response_segments.append(segment)
+            await manager.send_message(session_id, {
+                'type': MessageType.LLM_RESPONSE,
+                'text': segment,
+                'is_final': False
+            })
+
+        await manager.send_message(session_id, {
+            'type': MessageType.STATUS_UPDATE,
+            'status': 'generating_audio'
+        })
+
+        # 3. Stream TTS audio
+        async for audio_chunk in stream_tts_immediately(
+            tokens,
+            TracedTTS(tts_service, trace),
+            agent_config.voice_id,
+            on_segment=on_segment
+        ):
+            await manager.send_audio(session_id, audio_chunk)
+
+        # Mark the end of the audio stream for binary clients
+        await manager.send_audio(session_id, b"", is_final=True)
+
+        response_text = " ".join(response_segments)
+
+        await manager.send_message(session_id, {
+            'type': MessageType.LLM_RESPONSE,
+            'text': response_text,
+            'is_final': True
+        })
+
+        # Record the turn
+        recorded = True
+        await manager.append_history(session_id, [
+            {"role": "user", "content": transcription},
+            {"role": "assistant", "content": response_text},
+        ], turns=1)
+
+        # Done
+        finish_trace(session_id, trace, sent_before, "completed")
+        await manager.send_message(session_id, idle_status(trace))
+
+    except asyncio.CancelledError:
+        # Barge-in: keep what the caller already heard as context
+        if transcription.strip() and not recorded:
+            messages = [{"role": "user", "content": transcription}]
+            if response_segments:
+                messages.append({"role": "assistant", "content": " ".join(response_segments)})
+            await manager.append_history(session_id, messages)
+        raise
+
+    except Exception as e:
+        # A saturated audio pool sheds the utterance; it is already logged
+        if not isinstance(e, AudioPoolSaturated):
+            logger.error(f"Turn failed for {session_id}: {e}", exc_info=True)
+
+        await manager.send_message(session_id, {
+            'type': MessageType.ERROR,
+            'message': str(e)
+        })
+        finish_trace(session_id, trace, sent_before, "error")
+        await manager.send_message(session_id, idle_status(trace))
+
+    finally:
+        # Committed speculations are finished by now; anything else is aborted
+        if speculation is not None:
+            await speculation.cancel()
+
+        if not trace.ended:
+            finish_trace(session_id, trace, sent_before, "cancelled")
+
+
+def finish_trace(
+    session_id: str,
+    trace: TurnTrace,
+    sent_before: Tuple[int, int, int],
+    outcome: str
+) -> None:
+    """
+    End a turn's trace and hand it to the tracer.
+
+    Socket writes run in the session's writer task, so they are recorded as
+    one "ws.send" span holding the total write time of the turn so far.
+    Stage durations also go to the /metrics stage histogram.
+    """
+    messages, sent_bytes, send_ns = (
+        after - before for after, before in zip(manager.send_totals(session_id), sent_before)
+    )
+    if messages:
+        end = time.time_ns()
+        trace.add(
+            "ws.send", end - send_ns, end,
+            messages=messages, bytes=sent_bytes, aggregate=True
+        )
+
+    trace.end(outcome=outcome)
+    for stage, ms in trace.summary().items():
+        TURN_STAGE.labels(stage).observe(ms / 1000)
+    tracer.record(trace)
+
+
+def idle_status(trace: TurnTrace) -> dict:
+    """The end-of-turn status_update, with stage timings when enabled."""
+    message = {
+        'type': MessageType.STATUS_UPDATE,
+        'status': 'idle'
+    }
+    if settings.TRACING_STATUS_UPDATES:
+        message['turn_id'] = trace.turn_id
+        message['timings'] = trace.summary()
+    return message
@@ -1,8 +1,42 @@
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from fastapi import WebSocket
 from datetime import datetime, timezone
+import asyncio
+import base64
+import logging
+import time
 import uuid
 
+from app.config import settings
+from app.services.history import HistoryManager
+from app.services.metrics import WS_BYTES, WS_MESSAGES
+from app.websocket.frames import FrameType, encode_frame
+from app.websocket.outbound import OutboundItem, coalesce, wants_more
+from app.websocket.serialization import JSONSerializer, create_serializer
+from app.websocket.session_store import InMemorySessionStore, SessionRecord, SessionStore
+from app.websocket.types import MessageType
+
+logger = logging.getLogger(__name__)
+
+_SENT_MESSAGES = WS_MESSAGES.labels("out")
+_SENT_BYTES = WS_BYTES.labels("out")
+
+
+@dataclass
+class SessionChannels:
+    """Per-session queues between the reader, pipeline worker and writer tasks"""
+
+    inbound: asyncio.Queue  # client messages waiting for the worker
+    outbound: asyncio.Queue  # OutboundItems waiting for the writer
+    closed: bool = False  # set once the socket can no longer be written
+    tasks: Dict[str, asyncio.Task] = field(default_factory=dict)
+    received_ns: int = 0  # when the message being handled was read (epoch ns)
+    sent_messages: int = 0
+    sent_bytes: int = 0
+    send_ns: int = 0  # time spent writing to the socket
+    audio_epoch: int = 0  # bumped by flush_audio(); audio taken before it is dropped
+
 
 class ConnectionManager:
     """
@@ -11,30 +45,65 @@ class ConnectionManager:
     Responsibilities:
     - Accept and store WebSocket connections
     - Manage session metadata (agent, history, audio buffer)
+    - Keep each session's history within HISTORY_MAX_TOKENS, summarizing
+      evicted turns when enabled
+    - Persist history and metadata to the SessionStore so a session can be
+      resumed by another worker
     - Send messages to specific sessions
+    - Own each session's reader, worker and writer tasks
     - Cleanup on disconnect
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        serializer: Optional[JSONSerializer] = None,
+        store: Optional[SessionStore] = None,
+        history: Optional[HistoryManager] = None
+    ):
+        # Encodes outbound JSON messages (orjson when installed)
+        self.serializer = serializer or create_serializer()
+
+        # Shared history and metadata; replaced with the configured store at startup
+        self.store = store if store is not None else InMemorySessionStore()
+
+        # Bounds per-session history; given a summarizer at startup when enabled
+        self.history = history or HistoryManager.from_settings()
+
         # Active connections: session_id -> WebSocket
         self.active_connections: Dict[str, WebSocket] = {}
 
-        # Session metadata: session_id -> dict
+        # Session metadata of connections owned by this process: session_id -> dict
+        # (history and counters mirror the store; everything else is local)
         # Each session contains:
         #   - agent_id: str
         #   - created_at: datetime
         #   - message_count: int
         #   - audio_buffer: bytearray
-        #   - conversation_history: list[dict]
+        #   - conversation_history: list[dict] (bounded by self.history)
+        #   - summary: str (summary of evicted turns)
+        #   - binary_audio: bool (send AUDIO_RESPONSE as binary frames)
+        #   - audio_sequence: int (next outbound binary frame sequence)
         self.sessions: Dict[str, dict] = {}
 
-    async def connect(self, websocket: WebSocket, agent_id: str) -> str:
+        # Queues and tasks of sessions started with run(): session_id -> SessionChannels
+        self.channels: Dict[str, SessionChannels] = {}
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        agent_id: str,
+        binary_audio: bool = False,
+        resume_id: Optional[str] = None
+    ) -> str:
         """
         Accept WebSocket connection and create session.
 
         Args:
             websocket: FastAPI WebSocket object
             agent_id: Agent identifier (receptionist, sales, callcenter)
+            binary_audio: Send audio responses as binary frames
+            resume_id: Session to resume from the store, e.g. after a reconnect
+                to another worker
 
         Returns:
             session_id: Unique session identifier
@@ -45,11 +114,24 @@ class ConnectionManager:
         - Should store connection in active_connections
         - Should initialize session metadata
         - Should return session_id
+        - Should resume history from the store
+        - Should start a new session when resume_id is unknown or for another agent
         """
         await websocket.accept()
 
-        # Generate unique session ID
-        session_id = str(uuid.uuid4())
+        record = None
+        if resume_id and resume_id not in self.sessions:
+            record = await self._load(resume_id)
+            if record is not None and record.agent_id != agent_id:
+                record = None
+
+        if record is not None:
+            session_id = resume_id
+        else:
+            # Generate unique session ID
+            session_id = str(uuid.uuid4())
+            record = SessionRecord(agent_id=agent_id, created_at=datetime.now(timezone.utc))
+            await self._persist(self.store.create(session_id, record))
 
         # Store connection
         self.active_connections[session_id] = websocket
@@ -57,10 +139,13 @@ class ConnectionManager:
         # Initialize session
         self.sessions[session_id] = {
             'agent_id': agent_id,
-            'created_at': datetime.now(timezone.utc),
-            'message_count': 0,
+            'created_at': record.created_at,
+            'message_count': record.message_count,
             'audio_buffer': bytearray(),
-            'conversation_history': [],
+            'conversation_history': record.history,
+            'summary': record.summary,
+            'binary_audio': binary_audio,
+            'audio_sequence': 0,
         }
 
         return session_id
@@ -81,24 +166,334 @@ class ConnectionManager:
             del self.active_connections[session_id]
 
         if session_id in self.sessions:
+            summary_task = self.sessions[session_id].get('summary_task')
+            if summary_task is not None:
+                summary_task.cancel()
             del self.sessions[session_id]
 
+    async def run(
+        self,
+        session_id: str,
+        receive: Callable[[], Awaitable[Any]],
+        handle: Callable[[Any], Awaitable[bool]]
+    ) -> None:
+        """
+        Pump a session until it ends.
+
+        A reader task feeds client messages into a bounded inbound queue, a
+        worker task passes them to handle(), and a writer task drains the
+        outbound queue that send_message()/send_bytes() fill. A full inbound
+        queue stops reading from the socket and a full outbound queue makes
+        senders wait, so slow upstreams or slow clients push back instead of
+        growing memory.
+
+        Args:
+            session_id: Session identifier
+            receive: Coroutine function returning the next client message
+            handle: Coroutine processing one message; returns False to end the session
+
+        Raises:
+            WebSocketDisconnect: If the client disconnected
+            Exception: Whatever handle() raised
+
+        Test Cases:
+        - Should pass received messages to handle in order
+        - Should stop when handle returns False
+        - Should send queued messages through the writer
+        - Should propagate reader and worker errors
+        - Should cancel all tasks on exit
+        """
+        websocket = self.active_connections[session_id]
+        channels = SessionChannels(
+            inbound=asyncio.Queue(maxsize=settings.WS_INBOUND_QUEUE_SIZE),
+            outbound=asyncio.Queue(maxsize=settings.WS_OUTBOUND_QUEUE_SIZE),
+        )
+        self.channels[session_id] = channels
+
+        async def read() -> None:
+            while True:
+                message = await receive()
+                await channels.inbound.put((time.time_ns(), message))
+
+        async def work() -> None:
+            while True:
+                channels.received_ns, message = await channels.inbound.get()
+                if not await handle(message):
+                    return
+
+        async def write() -> None:
+            while True:
+                batch = await self._next_batch(channels)
+                epoch = channels.audio_epoch
+                try:
+                    for kind, payload in coalesce(batch, settings.WS_AUDIO_FRAME_BYTES):
+                        if channels.closed:
+                            break
+                        if kind == "audio" and channels.audio_epoch != epoch:
+                            continue  # flushed by a barge-in while this batch was sending
+                        started = time.time_ns()
+                        size = await self._send(session_id, websocket, kind, payload)
+                        channels.send_ns += time.time_ns() - started
+                        channels.sent_bytes += size
+                        channels.sent_messages += 1
+                        _SENT_BYTES.inc(size)
+                        _SENT_MESSAGES.inc()
+                except Exception as e:
+                    # The socket is gone; the reader will see the disconnect
+                    logger.info(f"Send failed, closing outbound queue for {session_id}: {e}")
+                    channels.closed = True
+                finally:
+                    for _ in batch:
+                        channels.outbound.task_done()
+
+        tasks = channels.tasks
+        tasks['reader'] = asyncio.create_task(read(), name=f"reader:{session_id}")
+        tasks['worker'] = asyncio.create_task(work(), name=f"worker:{session_id}")
+        tasks['writer'] = asyncio.create_task(write(), name=f"writer:{session_id}")
+
+        try:
+            done, _ = await asyncio.wait(
+                [tasks['reader'], tasks['worker']],
+                return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if tasks['worker'] in done and tasks['worker'].exception() is None:
+                # Clean end of session: let queued replies go out first
+                tasks['reader'].cancel()
+                try:
+                    await asyncio.wait_for(channels.outbound.join(), settings.WS_DRAIN_TIMEOUT)
+                except TimeoutError:
+                    logger.warning(f"Outbound queue not drained for {session_id}")
+
+            for task in done:
+                task.result()
+
+        finally:
+            channels.closed = True
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            self.channels.pop(session_id, None)
+
+    async def _next_batch(self, channels: SessionChannels) -> List[OutboundItem]:
+        """
+        Take the next batch of outbound items.
+
+        Everything already queued is taken at once. While the batch ends in
+        a short run of audio, wait up to WS_COALESCE_MS for more chunks so
+        they can go out as one larger frame. Audio taken before a
+        flush_audio() during the wait is dropped.
+        """
+        outbound = channels.outbound
+        batch = [await outbound.get()]
+        epoch = channels.audio_epoch
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.WS_COALESCE_MS / 1000
+
+        while True:
+            while not outbound.empty():
+                batch.append(outbound.get_nowait())
+
+            remaining = deadline - loop.time()
+            if remaining <= 0 or not wants_more(batch, settings.WS_AUDIO_FRAME_BYTES):
+                return batch
+
+            try:
+                item = await asyncio.wait_for(outbound.get(), remaining)
+            except TimeoutError:
+                item = None
+
+            if channels.audio_epoch != epoch:
+                epoch = channels.audio_epoch
+                batch = self._drop_audio(outbound, batch)
+
+            if item is None:
+                return batch
+            batch.append(item)
+
+    @staticmethod
+    def _drop_audio(outbound: asyncio.Queue, items: List[OutboundItem]) -> List[OutboundItem]:
+        """Items without the audio, marking the dropped ones done on the queue."""
+        kept = [item for item in items if item[0] != "audio"]
+        for _ in range(len(items) - len(kept)):
+            outbound.task_done()
+        return kept
+
+    def flush_audio(self, session_id: str) -> int:
+        """
+        Drop a running session's audio that has not been sent yet.
+
+        Called on barge-in after the turn is cancelled, before FLUSH_AUDIO
+        is queued, so none of the interrupted response reaches the client
+        after the flush. Clears queued audio chunks and any the writer has
+        taken but not yet sent; other messages keep their order.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Number of queued audio chunks dropped
+
+        Test Cases:
+        - Should drop queued audio and keep other messages in order
+        - Should drop audio the writer is holding for coalescing
+        """
+        channels = self.channels.get(session_id)
+        if channels is None:
+            return 0
+
+        channels.audio_epoch += 1
+
+        queued = []
+        while not channels.outbound.empty():
+            queued.append(channels.outbound.get_nowait())
+        kept = self._drop_audio(channels.outbound, queued)
+        for item in kept:
+            # Requeued in order; task_done() balances the put so join() still counts each once
+            channels.outbound.put_nowait(item)
+            channels.outbound.task_done()
+
+        return len(queued) - len(kept)
+
+    async def _send(self, session_id: str, websocket: WebSocket, kind: str, payload: Any) -> int:
+        """Write one outbound item to the socket; returns the message size."""
+        if kind == "json":
+            text = self.serializer.dumps(payload)
+            await websocket.send_text(text)
+            return len(text)
+
+        elif kind == "bytes":
+            await websocket.send_bytes(payload)
+            return len(payload)
+
+        else:
+            chunk, is_final = payload
+            session = self.sessions.get(session_id)
+            if session is None:
+                return 0
+
+            if session['binary_audio']:
+                sequence = session['audio_sequence']
+                session['audio_sequence'] = sequence + 1
+                frame = encode_frame(FrameType.AUDIO_RESPONSE, chunk, sequence, is_final)
+                await websocket.send_bytes(frame)
+                return len(frame)
+
+            elif chunk:
+                text = self.serializer.dumps({
+                    'type': MessageType.AUDIO_RESPONSE,
+                    'data': base64.b64encode(chunk).decode()
+                })
+                await websocket.send_text(text)
+                return len(text)
+
+            return 0
+
+    def queue_depths(self, session_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Current (inbound, outbound) queue sizes for a running session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Queue sizes, or None if the session is not running
+        """
+        channels = self.channels.get(session_id)
+        if channels is None:
+            return None
+        return channels.inbound.qsize(), channels.outbound.qsize()
+
+    def received_at(self, session_id: str) -> Optional[int]:
+        """When the message being handled was read from the socket (epoch ns)."""
+        channels = self.channels.get(session_id)
+        return channels.received_ns if channels is not None else None
+
+    def send_totals(self, session_id: str) -> Tuple[int, int, int]:
+        """
+        (messages, bytes, nanoseconds) written to a running session's socket so far.
+
+        Returns zeros if the session is not running.
+        """
+        channels = self.channels.get(session_id)
+        if channels is None:
+            return 0, 0, 0
+        return channels.sent_messages, channels.sent_bytes, channels.send_ns
+
     async def send_message(self, session_id: str, message: dict) -> None:
         """
         Send message to specific session.
 
+        Running sessions queue the message for their writer task; waits
+        while the outbound queue is full.
+
         Args:
             session_id: Target session
             message: Message dict to send
 
         Test Cases:
         - Should send JSON message to correct WebSocket
+        - Should queue the message when the session is running
         - Should handle disconnected session gracefully
         - Should not raise exception if session doesn't exist
         """
-        if session_id in self.active_connections:
+        channels = self.channels.get(session_id)
+        if channels is not None:
+            if not channels.closed:
+                await channels.outbound.put(("json", message))
+
+        elif session_id in self.active_connections:
+            websocket = self.active_connections[session_id]
+            await websocket.send_text(self.serializer.dumps(message))
+
+    async def send_bytes(self, session_id: str, data: bytes) -> None:
+        """
+        Send binary frame to specific session.
+
+        Args:
+            session_id: Target session
+            data: Encoded binary frame
+
+        Test Cases:
+        - Should send bytes to correct WebSocket
+        - Should queue the frame when the session is running
+        - Should not raise exception if session doesn't exist
+        """
+        channels = self.channels.get(session_id)
+        if channels is not None:
+            if not channels.closed:
+                await channels.outbound.put(("bytes", data))
+
+        elif session_id in self.active_connections:
+            websocket = self.active_connections[session_id]
+            await websocket.send_bytes(data)
+
+    async def send_audio(self, session_id: str, chunk: bytes, is_final: bool = False) -> None:
+        """
+        Send a TTS audio chunk using the session's audio transport.
+
+        Binary sessions get AUDIO_RESPONSE frames with increasing sequence
+        numbers, others base64 JSON. Running sessions queue the chunk so the
+        writer can merge adjacent chunks into larger frames.
+
+        Args:
+            session_id: Target session
+            chunk: Raw audio bytes (may be empty for an end-of-response marker)
+            is_final: Whether this is the last chunk of the response
+
+        Test Cases:
+        - Should send binary frames with increasing sequence numbers
+        - Should fall back to base64 JSON for text clients
+        - Should merge queued chunks when the session is running
+        """
+        channels = self.channels.get(session_id)
+        if channels is not None:
+            if not channels.closed:
+                await channels.outbound.put(("audio", (chunk, is_final)))
+
+        elif session_id in self.active_connections:
             websocket = self.active_connections[session_id]
-            await websocket.send_json(message)
+            await self._send(session_id, websocket, "audio", (chunk, is_final))
 
     def get_session(self, session_id: str) -> dict | None:
         """
@@ -132,6 +527,96 @@ class ConnectionManager:
         if session_id in self.sessions:
             self.sessions[session_id].update(updates)
 
+    async def append_history(
+        self,
+        session_id: str,
+        messages: List[Dict[str, str]],
+        turns: int = 0
+    ) -> None:
+        """
+        Record conversation messages locally and in the store.
+
+        Once the history grows past HISTORY_MAX_TOKENS the oldest messages
+        are evicted; with a summarizer they are folded into the session
+        summary in the background.
+
+        Args:
+            session_id: Session identifier
+            messages: Messages to append ({'role': ..., 'content': ...})
+            turns: Completed turns to add to message_count
+
+        Test Cases:
+        - Should append to the session history and the store
+        - Should evict old messages past the token budget, locally and in the store
+        - Should summarize evicted messages when a summarizer is set
+        - Should keep the local history when the store fails
+        - Should handle non-existent session_id
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            return
+
+        history = session['conversation_history']
+        history.extend(messages)
+        session['message_count'] += turns
+
+        evicted = self.history.trim(history)
+        keep = len(history) if evicted else None
+        await self._persist(self.store.append_history(session_id, messages, turns, keep=keep))
+
+        if evicted and self.history.summarizer is not None:
+            session.setdefault('evicted', []).extend(evicted)
+            task = session.get('summary_task')
+            if task is None or task.done():
+                session['summary_task'] = asyncio.create_task(
+                    self._summarize(session_id), name=f"summary:{session_id}"
+                )
+
+    def prompt_history(self, session_id: str) -> List[Dict[str, str]]:
+        """
+        History to send with the next prompt: the summary, then kept messages.
+
+        Test Cases:
+        - Should put the summary first as a system message
+        - Should return an empty list for non-existent session_id
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            return []
+
+        return self.history.prompt_history(session['conversation_history'], session['summary'])
+
+    async def end_session(self, session_id: str) -> None:
+        """Forget a session the client ended, so it can no longer be resumed."""
+        await self._persist(self.store.delete(session_id))
+
+    async def _summarize(self, session_id: str) -> None:
+        """Fold evicted messages into the session summary, off the turn's critical path."""
+        session = self.sessions.get(session_id)
+        while session is not None and session.get('evicted'):
+            evicted, session['evicted'] = session['evicted'], []
+            try:
+                session['summary'] = await self.history.summarize(session['summary'], evicted)
+            except Exception as e:
+                logger.warning(f"Could not summarize history for {session_id}: {e}")
+                return
+
+            await self._persist(self.store.set_summary(session_id, session['summary']))
+
+    async def _load(self, session_id: str) -> Optional[SessionRecord]:
+        try:
+            return await self.store.load(session_id)
+        except Exception as e:
+            logger.warning(f"Could not load session {session_id}: {e}")
+            return None
+
+    async def _persist(self, write: Awaitable[None]) -> None:
+        """Run a store write; an unavailable store must not break the live call."""
+        try:
+            await write
+        except Exception as e:
+            logger.warning(f"Session store write failed: {e}")
+
 
 # Singleton instance
 manager = ConnectionManager()
\ No newline at end of file
@@ -0,0 +1,91 @@
+from typing import Any, List, Tuple
+
+from app.websocket.types import MessageType
+
+# Outbound queue items: ("json", dict), ("bytes", bytes) or ("audio", (chunk, is_final))
+OutboundItem = Tuple[str, Any]
+
+
+def coalesce(batch: List[OutboundItem], frame_bytes: int) -> List[OutboundItem]:
+    """
+    Shrink a batch of queued outbound items before sending.
+
+    - Adjacent audio chunks are merged into frames of up to frame_bytes;
+      a final chunk closes its frame
+    - Only the last STATUS_UPDATE in the batch is kept, since each one
+      replaces the previous status
+    - A partial TRANSCRIPTION is dropped when a later transcription in the
+      batch supersedes it
+
+    Relative order of everything else is preserved.
+
+    Args:
+        batch: Items taken from the outbound queue, oldest first
+        frame_bytes: Target audio frame size
+
+    Returns:
+        Items to send
+
+    Test Cases:
+    - Should merge adjacent audio chunks up to frame_bytes
+    - Should not merge across other messages
+    - Should not merge past a final chunk
+    - Should keep only the last status update
+    - Should drop partial transcriptions superseded in the same batch
+    """
+    last_status = max(
+        (i for i, (kind, payload) in enumerate(batch) if _is_status(kind, payload)),
+        default=None
+    )
+    last_transcription = max(
+        (i for i, (kind, payload) in enumerate(batch) if _is_transcription(kind, payload)),
+        default=None
+    )
+
+    result: List[OutboundItem] = []
+    for i, (kind, payload) in enumerate(batch):
+        if _is_status(kind, payload) and i != last_status:
+            continue
+
+        if (
+            _is_transcription(kind, payload) and i != last_transcription
+            and not payload.get('is_final')
+        ):
+            continue
+
+        if kind == "audio" and result and result[-1][0] == "audio":
+            chunk, is_final = payload
+            pending, pending_final = result[-1][1]
+            if not pending_final and len(pending) + len(chunk) <= frame_bytes:
+                result[-1] = ("audio", (pending + chunk, is_final))
+                continue
+
+        result.append((kind, payload))
+
+    return result
+
+
+def wants_more(batch: List[OutboundItem], frame_bytes: int) -> bool:
+    """
+    Whether it is worth waiting for more items before sending the batch.
+
+    True while the batch ends in an open audio run below frame_bytes.
+    """
+    if not batch or batch[-1][0] != "audio" or batch[-1][1][1]:
+        return False
+
+    pending = 0
+    for kind, payload in reversed(batch):
+        if kind != "audio" or payload[1]:
+            break
+        pending += len(payload[0])
+
+    return pending < frame_bytes
+
+
+def _is_status(kind: str, payload: Any) -> bool:
+    return kind == "json" and payload.get('type') == MessageType.STATUS_UPDATE
+
+
+def _is_transcription(kind: str, payload: Any) -> bool:
+    return kind == "json" and payload.get('type') == MessageType.TRANSCRIPTION
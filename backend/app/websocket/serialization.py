@@ -0,0 +1,92 @@
+from typing import Any, Optional
+from pydantic import TypeAdapter
+import json
+import logging
+
+from app.config import settings
+from app.websocket.types import WebSocketMessage
+
+try:
+    import orjson
+except ImportError:  # optional: pip install ".[fast-json]"
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Built once; validates raw JSON text in pydantic-core without an intermediate dict
+MESSAGE_ADAPTER = TypeAdapter(WebSocketMessage)
+
+
+class JSONSerializer:
+    """
+    Standard library JSON encoding.
+
+    Matches what Starlette's send_json produces (compact, non-ASCII kept).
+    """
+
+    name = "stdlib"
+
+    def dumps(self, message: Any) -> str:
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class OrjsonSerializer(JSONSerializer):
+    """orjson encoding; several times faster for the small dicts we send per audio chunk."""
+
+    name = "orjson"
+
+    def dumps(self, message: Any) -> str:
+        return orjson.dumps(message).decode()
+
+
+def create_serializer(name: Optional[str] = None) -> JSONSerializer:
+    """
+    Pick the outbound JSON serializer.
+
+    Args:
+        name: "orjson", "stdlib" or "auto" (orjson when installed);
+            defaults to settings.JSON_SERIALIZER
+
+    Returns:
+        Serializer instance
+
+    Test Cases:
+    - Should use orjson for "auto" when it is installed
+    - Should use the standard library for "stdlib"
+    - Should fall back to the standard library when orjson is missing
+    """
+    name = name or settings.JSON_SERIALIZER
+
+    if name == "stdlib":
+        return JSONSerializer()
+
+    if orjson is None:
+        if name == "orjson":
+            logger.warning("orjson is not installed; using the standard library JSON encoder")
+        return JSONSerializer()
+
+    return OrjsonSerializer()
+
+
+def parse_message(text: str | bytes) -> WebSocketMessage:
+    """
+    Parse and validate a client JSON message in one pass.
+
+    Args:
+        text: Raw JSON text frame
+
+    Returns:
+        WebSocketMessage
+
+    Raises:
+        pydantic.ValidationError: If the text is not valid JSON or not a valid message
+
+    Test Cases:
+    - Should parse a valid message
+    - Should raise ValidationError for malformed JSON
+    - Should raise ValidationError for unknown message types
+    """
+    return MESSAGE_ADAPTER.validate_json(text)
@@ -0,0 +1,284 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionRecord:
+    """The part of a session that outlives its socket"""
+
+    agent_id: str
+    created_at: datetime
+    message_count: int = 0
+    history: List[Dict[str, str]] = field(default_factory=list)
+    summary: str = ""  # summary of turns evicted from history
+
+
+class SessionStore(ABC):
+    """
+    Where conversation history and session metadata live.
+
+    The WebSocket, decoder, VAD and running turn always stay in the process
+    that owns the connection; only what is needed to resume a session on
+    another worker or node is kept here.
+    """
+
+    @abstractmethod
+    async def create(self, session_id: str, record: SessionRecord) -> None:
+        """Store a new session."""
+
+    @abstractmethod
+    async def load(self, session_id: str) -> Optional[SessionRecord]:
+        """Return a stored session, or None if it is unknown or expired."""
+
+    @abstractmethod
+    async def append_history(
+        self,
+        session_id: str,
+        messages: List[Dict[str, str]],
+        turns: int = 0,
+        keep: Optional[int] = None
+    ) -> None:
+        """
+        Append messages to a session's history and add turns to its message_count.
+
+        When keep is set, only the newest keep messages are retained afterwards.
+        """
+
+    @abstractmethod
+    async def set_summary(self, session_id: str, summary: str) -> None:
+        """Store the summary of turns evicted from a session's history."""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Forget a session."""
+
+    async def close(self) -> None:
+        """Release connections held by the store."""
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local store (single worker deployments and tests).
+
+    Sessions expire ttl seconds after their last write, so abandoned calls
+    do not accumulate.
+    """
+
+    def __init__(self, ttl: float = 3600.0):
+        self.ttl = ttl
+        self._records: Dict[str, SessionRecord] = {}
+        self._expires: Dict[str, float] = {}
+
+    async def create(self, session_id: str, record: SessionRecord) -> None:
+        self._purge()
+        self._records[session_id] = SessionRecord(
+            agent_id=record.agent_id,
+            created_at=record.created_at,
+            message_count=record.message_count,
+            history=list(record.history),
+            summary=record.summary,
+        )
+        self._touch(session_id)
+
+    async def load(self, session_id: str) -> Optional[SessionRecord]:
+        self._purge()
+        record = self._records.get(session_id)
+        if record is None:
+            return None
+
+        # Callers get a copy, like they would from Redis
+        return SessionRecord(
+            agent_id=record.agent_id,
+            created_at=record.created_at,
+            message_count=record.message_count,
+            history=list(record.history),
+            summary=record.summary,
+        )
+
+    async def append_history(
+        self,
+        session_id: str,
+        messages: List[Dict[str, str]],
+        turns: int = 0,
+        keep: Optional[int] = None
+    ) -> None:
+        record = self._records.get(session_id)
+        if record is None:
+            return
+
+        record.history.extend(messages)
+        if keep is not None:
+            del record.history[:max(len(record.history) - keep, 0)]
+        record.message_count += turns
+        self._touch(session_id)
+
+    async def set_summary(self, session_id: str, summary: str) -> None:
+        record = self._records.get(session_id)
+        if record is not None:
+            record.summary = summary
+
+    async def delete(self, session_id: str) -> None:
+        self._records.pop(session_id, None)
+        self._expires.pop(session_id, None)
+
+    def _touch(self, session_id: str) -> None:
+        self._expires[session_id] = time.monotonic() + self.ttl
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        for session_id in [s for s, expires in self._expires.items() if expires <= now]:
+            self._records.pop(session_id, None)
+            del self._expires[session_id]
+
+    def __len__(self):
+        return len(self._records)
+
+    def __repr__(self):
+        return f"InMemorySessionStore(sessions={len(self._records)})"
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Store backed by anything speaking the Redis protocol (Redis, Valkey, ...).
+
+    Layout per session:
+    - {prefix}{session_id}:meta     hash of agent_id, created_at, message_count, summary
+    - {prefix}{session_id}:history  list of JSON-encoded messages
+
+    Both keys expire ttl seconds after the last write.
+    """
+
+    def __init__(self, client: Any, prefix: str = "session:", ttl: int = 3600):
+        # redis.asyncio.Redis created with decode_responses=True, or a compatible fake
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "session:", ttl: int = 3600) -> "RedisSessionStore":
+        """
+        Connect to a Redis-protocol server.
+
+        Raises:
+            RuntimeError: If the redis package is not installed
+        """
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError('SESSION_STORE=redis requires `pip install ".[redis]"`') from e
+
+        return cls(redis.from_url(url, decode_responses=True), prefix=prefix, ttl=ttl)
+
+    async def create(self, session_id: str, record: SessionRecord) -> None:
+        meta, history = self._keys(session_id)
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(meta, history)
+            pipe.hset(meta, mapping={
+                'agent_id': record.agent_id,
+                'created_at': record.created_at.isoformat(),
+                'message_count': record.message_count,
+                'summary': record.summary,
+            })
+            if record.history:
+                pipe.rpush(history, *(json.dumps(m) for m in record.history))
+            pipe.expire(meta, self.ttl)
+            pipe.expire(history, self.ttl)
+            await pipe.execute()
+
+    async def load(self, session_id: str) -> Optional[SessionRecord]:
+        meta, history = self._keys(session_id)
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(meta)
+            pipe.lrange(history, 0, -1)
+            fields, messages = await pipe.execute()
+
+        if not fields:
+            return None
+
+        return SessionRecord(
+            agent_id=fields['agent_id'],
+            created_at=datetime.fromisoformat(fields['created_at']),
+            message_count=int(fields.get('message_count', 0)),
+            history=[json.loads(m) for m in messages],
+            summary=fields.get('summary', ""),
+        )
+
+    async def append_history(
+        self,
+        session_id: str,
+        messages: List[Dict[str, str]],
+        turns: int = 0,
+        keep: Optional[int] = None
+    ) -> None:
+        meta, history = self._keys(session_id)
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            if messages:
+                pipe.rpush(history, *(json.dumps(m) for m in messages))
+            if keep is not None:
+                pipe.ltrim(history, -keep, -1)
+            if turns:
+                pipe.hincrby(meta, 'message_count', turns)
+            pipe.expire(meta, self.ttl)
+            pipe.expire(history, self.ttl)
+            await pipe.execute()
+
+    async def set_summary(self, session_id: str, summary: str) -> None:
+        meta, _ = self._keys(session_id)
+        await self.client.hset(meta, mapping={'summary': summary})
+
+    async def delete(self, session_id: str) -> None:
+        await self.client.delete(*self._keys(session_id))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def _keys(self, session_id: str) -> tuple[str, str]:
+        key = f"{self.prefix}{session_id}"
+        return f"{key}:meta", f"{key}:history"
+
+    def __repr__(self):
+        return f"RedisSessionStore(prefix={self.prefix!r}, ttl={self.ttl})"
+
+
+def create_session_store(backend: Optional[str] = None) -> SessionStore:
+    """
+    Build the session store selected by settings.
+
+    Args:
+        backend: "memory" or "redis"; defaults to settings.SESSION_STORE
+
+    Returns:
+        SessionStore
+
+    Raises:
+        ValueError: For an unknown backend
+
+    Test Cases:
+    - Should build an in-memory store by default
+    - Should reject unknown backends
+    """
+    backend = backend or settings.SESSION_STORE
+
+    if backend == "memory":
+        return InMemorySessionStore(ttl=settings.SESSION_TTL)
+
+    if backend == "redis":
+        return RedisSessionStore.from_url(
+            settings.REDIS_URL,
+            prefix=settings.SESSION_KEY_PREFIX,
+            ttl=settings.SESSION_TTL,
+        )
+
+    raise ValueError(f"Unknown session store: {backend}")
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Coroutine, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TurnController:
+    """
+    Runs one agent turn at a time as a cancellable task.
+
+    Responsibilities:
+    - Run the STT/LLM/TTS pipeline in the background so the session keeps
+      receiving audio while the agent is speaking
+    - Cancel the in-flight turn (and with it the upstream OpenAI and
+      ElevenLabs streams) when the caller barges in
+    - Supersede an unfinished turn when a new one starts
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.turn_id = 0
+        self.interruptions = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        """Whether a turn is currently running."""
+        return self._task is not None and not self._task.done()
+
+    async def start(self, turn: Coroutine) -> asyncio.Task:
+        """
+        Run a turn in the background, cancelling any unfinished one first.
+
+        Args:
+            turn: Pipeline coroutine for the turn
+
+        Returns:
+            The task running the turn
+
+        Test Cases:
+        - Should run the turn in the background
+        - Should cancel the previous turn
+        """
+        await self.cancel()
+
+        self.turn_id += 1
+        self._task = asyncio.create_task(turn, name=f"turn:{self.session_id}:{self.turn_id}")
+        self._task.add_done_callback(self._log_failure)
+        return self._task
+
+    async def interrupt(self) -> bool:
+        """
+        Barge-in: stop the agent mid-turn.
+
+        Returns:
+            True if a running turn was cancelled
+
+        Test Cases:
+        - Should cancel a running turn and return True
+        - Should return False when no turn is running
+        """
+        if not await self.cancel():
+            return False
+
+        self.interruptions += 1
+        logger.info(f"Turn {self.turn_id} interrupted: {self.session_id}")
+        return True
+
+    async def cancel(self) -> bool:
+        """
+        Cancel the running turn and wait for its cleanup.
+
+        Returns:
+            True if a running turn was cancelled
+        """
+        task = self._task
+        if task is None or task.done():
+            return False
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return True
+
+    async def wait(self) -> None:
+        """Wait for the running turn, if any, to finish."""
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def _log_failure(self, task: asyncio.Task) -> None:
+        """Log a failed turn instead of losing the exception in the task."""
+        if task.cancelled() or task.exception() is None:
+            return
+
+        logger.error(f"{task.get_name()} failed", exc_info=task.exception())
+
+    def __repr__(self):
+        return f"TurnController(turn_id={self.turn_id}, active={self.active})"
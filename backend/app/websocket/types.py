@@ -16,6 +16,7 @@ class MessageType(StrEnum):
     LLM_RESPONSE = "llm_response"
     AUDIO_RESPONSE = "audio_response"
     STATUS_UPDATE = "status_update"
+    FLUSH_AUDIO = "flush_audio"  # Barge-in: drop queued response audio
     ERROR = "error"
 
 
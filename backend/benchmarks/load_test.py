@@ -0,0 +1,430 @@
+"""
+End-to-end WebSocket load test.
+
+Starts the app with PROVIDERS=local (or targets a running server with
+--url), connects N concurrent callers to /ws/voice-agent/{agent_id} and
+streams audio through the full pipeline in real time. Reports p50/p95/p99
+latencies per stage and the server's CPU and memory per session as JSON,
+so runs can be diffed across releases:
+
+    python -m benchmarks.load_test --sessions 50 --output before.json
+    python -m benchmarks.load_test --sessions 50 --env LOCAL_LLM_TTFT_MS=0
+
+Latencies after speech are measured from the last speech chunk sent:
+- connect: WebSocket handshake until connection_established
+- first_transcript: final transcription received
+- first_audio: first audio_response of the turn
+- turn: status_update idle at the end of the turn
+"""
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+import wave
+import numpy as np
+import websockets
+
+from app.services.audio_analysis import downmix, resample
+from app.services.latency_stats import percentile
+from app.services.local_providers import synthetic_speech
+from app.websocket.frames import FrameType, decode_frame, encode_frame
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SAMPLE_RATE = 16000
+STAGES = ("connect", "first_transcript", "first_audio", "turn")
+
+
+@dataclass
+class TurnTimings:
+    """Seconds from the end of speech; None when the event never arrived"""
+
+    first_transcript: Optional[float] = None
+    first_audio: Optional[float] = None
+    turn: Optional[float] = None
+
+
+@dataclass
+class CallerResult:
+    connect: Optional[float] = None
+    turns: List[TurnTimings] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def load_audio(path: Optional[str]) -> bytes:
+    """
+    Caller speech as 16 kHz int16 mono PCM.
+
+    Args:
+        path: 16-bit WAV recording; None for a synthetic utterance
+
+    Test Cases:
+    - Should downmix and resample a stereo recording
+    """
+    if path is None:
+        return synthetic_speech("What are your hours today?", SAMPLE_RATE)
+
+    with wave.open(path, "rb") as recording:
+        if recording.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM")
+        channels, rate = recording.getnchannels(), recording.getframerate()
+        samples = np.frombuffer(recording.readframes(recording.getnframes()), dtype="<i2")
+
+    samples = downmix(samples, channels)
+    if rate != SAMPLE_RATE:
+        samples = resample(samples, rate, SAMPLE_RATE)
+    return samples.astype("<i2").tobytes()
+
+
+def chunked(pcm: bytes, chunk_ms: int) -> List[bytes]:
+    size = SAMPLE_RATE * chunk_ms // 1000 * 2
+    return [pcm[i:i + size] for i in range(0, len(pcm), size)]
+
+
+async def run_caller(
+    url: str,
+    speech: bytes,
+    turns: int = 1,
+    chunk_ms: int = 20,
+    timeout: float = 30.0
+) -> CallerResult:
+    """
+    One simulated caller: connect, then speak turns utterances in real time.
+
+    Silence keeps streaming after each utterance, like an open microphone,
+    until the agent finishes its turn.
+
+    Test Cases:
+    - Should time every stage of a turn
+    - Should report errors instead of raising
+    """
+    result = CallerResult()
+    speech_chunks = chunked(speech, chunk_ms)
+    silence = bytes(SAMPLE_RATE * chunk_ms // 1000 * 2)
+    sequence = 0
+
+    async def send(pcm: bytes) -> None:
+        nonlocal sequence
+        await ws.send(encode_frame(FrameType.AUDIO_CHUNK, pcm, sequence))
+        sequence += 1
+        await asyncio.sleep(chunk_ms / 1000)
+
+    async def speak(spoken: asyncio.Future) -> None:
+        for _ in range(10):
+            await send(silence)
+        for chunk in speech_chunks:
+            await send(chunk)
+        spoken.set_result(time.perf_counter())
+        while True:
+            await send(silence)
+
+    started = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout * (turns + 1)):
+            async with websockets.connect(url, max_size=None) as ws:
+                established = json.loads(await ws.recv())
+                if established.get('type') != 'connection_established':
+                    raise RuntimeError(f"unexpected first message: {established}")
+                result.connect = time.perf_counter() - started
+
+                for _ in range(turns):
+                    spoken = asyncio.get_running_loop().create_future()
+                    speaker = asyncio.create_task(speak(spoken))
+                    try:
+                        result.turns.append(await receive_turn(ws, spoken))
+                    finally:
+                        speaker.cancel()
+                        await asyncio.gather(speaker, return_exceptions=True)
+
+                await ws.send(json.dumps({'type': 'end_session'}))
+
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+async def receive_turn(ws, spoken: asyncio.Future) -> TurnTimings:
+    """Read messages until the agent's turn ends; times are relative to spoken."""
+    transcript_at = audio_at = None
+
+    async for message in ws:
+        now = time.perf_counter()
+
+        if isinstance(message, bytes):
+            frame = decode_frame(message)
+            if transcript_at is not None and audio_at is None and frame.payload:
+                audio_at = now
+            continue
+
+        data = json.loads(message)
+        if data.get('type') == 'error':
+            raise RuntimeError(data.get('message'))
+
+        if data.get('type') == 'transcription' and data.get('is_final'):
+            transcript_at = now
+        elif (
+            data.get('type') == 'audio_response'
+            and transcript_at is not None
+            and audio_at is None
+        ):
+            audio_at = now
+        elif data.get('status') == 'idle' and transcript_at is not None:
+            end = spoken.result()
+            return TurnTimings(
+                first_transcript=transcript_at - end,
+                first_audio=audio_at - end if audio_at is not None else None,
+                turn=now - end,
+            )
+
+    raise RuntimeError("connection closed during the turn")
+
+
+def summarize(samples: List[float]) -> Dict[str, Optional[float]]:
+    """
+    Count and p50/p95/p99/mean/max in milliseconds.
+
+    Test Cases:
+    - Should report None percentiles without samples
+    """
+    def ms(value: Optional[float]) -> Optional[float]:
+        return None if value is None else round(value * 1000, 1)
+
+    return {
+        'count': len(samples),
+        'p50': ms(percentile(samples, 50)),
+        'p95': ms(percentile(samples, 95)),
+        'p99': ms(percentile(samples, 99)),
+        'mean': ms(sum(samples) / len(samples)) if samples else None,
+        'max': ms(max(samples, default=None)),
+    }
+
+
+def build_report(results: List[CallerResult]) -> Dict:
+    """Latency percentiles per stage across all callers and turns."""
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    for result in results:
+        if result.connect is not None:
+            samples['connect'].append(result.connect)
+        for turn in result.turns:
+            for stage, value in asdict(turn).items():
+                if value is not None:
+                    samples[stage].append(value)
+
+    errors = [r.error for r in results if r.error]
+    return {
+        'sessions': len(results),
+        'completed': len(results) - len(errors),
+        'turns': sum(len(r.turns) for r in results),
+        'errors': errors[:20],
+        'latency_ms': {stage: summarize(values) for stage, values in samples.items()},
+    }
+
+
+class ServerProcess:
+    """The app in a uvicorn subprocess, so its CPU and memory are measured alone"""
+
+    def __init__(self, env: Dict[str, str]):
+        self.env = env
+        self.port = _free_port()
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    async def start(self, startup_timeout: float = 20.0) -> None:
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", "127.0.0.1", "--port", str(self.port), "--log-level", "warning",
+            ],
+            cwd=BACKEND_DIR,
+            env={**os.environ, **self.env},
+        )
+
+        deadline = time.monotonic() + startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"server exited with code {self.process.returncode}")
+            with contextlib.suppress(OSError):
+                await asyncio.to_thread(fetch_json, f"http://{self.base_url}/health")
+                return
+            await asyncio.sleep(0.1)
+
+        raise RuntimeError("server did not start")
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                self.process.wait(timeout=5)
+            if self.process.poll() is None:
+                self.process.kill()
+
+    def cpu_seconds(self) -> Optional[float]:
+        """User + system CPU time of the server (Linux /proc)."""
+        with contextlib.suppress(OSError, ValueError, IndexError):
+            fields = Path(f"/proc/{self.process.pid}/stat").read_text().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        return None
+
+    def rss_bytes(self) -> Optional[int]:
+        """Resident memory of the server (Linux /proc)."""
+        with contextlib.suppress(OSError, ValueError):
+            for line in Path(f"/proc/{self.process.pid}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return None
+
+
+def fetch_json(url: str):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.load(response)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_load(
+    sessions: int,
+    speech: bytes,
+    agent_id: str = "receptionist",
+    turns: int = 1,
+    chunk_ms: int = 20,
+    ramp_ms: int = 0,
+    timeout: float = 30.0,
+    url: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None
+) -> Dict:
+    """
+    Run the load test and build the JSON report.
+
+    Args:
+        sessions: Concurrent callers
+        speech: Utterance each caller speaks (16 kHz int16 mono PCM)
+        agent_id: Agent to call
+        turns: Utterances per caller
+        chunk_ms: Audio per frame (sent in real time)
+        ramp_ms: Delay between caller starts
+        timeout: Seconds allowed per turn
+        url: Base ws:// URL of a running server; None starts one with local providers
+        env: Extra settings for the started server
+
+    Test Cases:
+    - Should report every stage for a completed run
+    """
+    server = None
+    if url is None:
+        server = ServerProcess({'PROVIDERS': 'local', 'LOG_LEVEL': 'WARNING', **(env or {})})
+        await server.start()
+        url = f"ws://{server.base_url}"
+
+    endpoint = f"{url}/ws/voice-agent/{agent_id}?format=pcm16&sample_rate={SAMPLE_RATE}&binary=true"
+
+    try:
+        cpu_before = server.cpu_seconds() if server else None
+        rss_before = server.rss_bytes() if server else None
+        peak_rss = rss_before
+
+        async def caller(i: int) -> CallerResult:
+            await asyncio.sleep(i * ramp_ms / 1000)
+            return await run_caller(endpoint, speech, turns, chunk_ms, timeout)
+
+        started = time.perf_counter()
+        callers = asyncio.gather(*(caller(i) for i in range(sessions)))
+        while not callers.done():
+            await asyncio.wait([callers], timeout=0.1)
+            rss = server.rss_bytes() if server else None
+            if rss is not None:
+                peak_rss = max(peak_rss or 0, rss)
+        results = callers.result()
+        elapsed = time.perf_counter() - started
+
+        report = build_report(results)
+        report['config'] = {
+            'agent_id': agent_id, 'turns': turns, 'chunk_ms': chunk_ms, 'ramp_ms': ramp_ms,
+            'speech_ms': len(speech) // 2 * 1000 // SAMPLE_RATE, 'server_env': env or {},
+        }
+        report['elapsed_s'] = round(elapsed, 2)
+
+        if server is not None:
+            cpu_after = server.cpu_seconds()
+            report['server'] = {
+                'cpu_s': _delta(cpu_after, cpu_before),
+                'cpu_ms_per_session': _per_session(_delta(cpu_after, cpu_before), sessions, 1000),
+                'baseline_rss_mb': _mb(rss_before),
+                'peak_rss_mb': _mb(peak_rss),
+                'rss_kb_per_session': _per_session(
+                    _delta(peak_rss, rss_before), sessions, 1 / 1024
+                ),
+            }
+
+        with contextlib.suppress(OSError, ValueError):
+            http = url.replace("ws://", "http://", 1).replace("wss://", "https://", 1)
+            report['agents'] = await asyncio.to_thread(fetch_json, f"{http}/stats/agents")
+
+        return report
+
+    finally:
+        if server is not None:
+            server.stop()
+
+
+def _delta(after, before):
+    return None if after is None or before is None else after - before
+
+
+def _per_session(value, sessions: int, scale: float) -> Optional[float]:
+    return None if value is None or not sessions else round(value * scale / sessions, 1)
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return None if value is None else round(value / 2 ** 20, 1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="WebSocket voice pipeline load test")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent callers")
+    parser.add_argument("--turns", type=int, default=1, help="utterances per caller")
+    parser.add_argument("--agent", default="receptionist")
+    parser.add_argument("--audio", help="16-bit WAV recording to stream (default: synthetic)")
+    parser.add_argument("--chunk-ms", type=int, default=20)
+    parser.add_argument("--ramp-ms", type=int, default=0, help="delay between caller starts")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds per turn")
+    parser.add_argument("--url", help="ws:// base URL of a running server (no CPU/memory stats)")
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="KEY=VALUE",
+        help="setting for the started server, e.g. LOCAL_MAX_CONCURRENT=20"
+    )
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    env = dict(item.split("=", 1) for item in args.env)
+    report = asyncio.run(run_load(
+        args.sessions, load_audio(args.audio),
+        agent_id=args.agent, turns=args.turns, chunk_ms=args.chunk_ms,
+        ramp_ms=args.ramp_ms, timeout=args.timeout, url=args.url, env=env,
+    ))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
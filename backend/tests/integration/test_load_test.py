@@ -0,0 +1,22 @@
+import pytest
+from benchmarks.load_test import STAGES, load_audio, run_load
+
+
+@pytest.mark.asyncio
+async def test_load_test_against_local_providers():
+    """Test a short run against a server started with local providers"""
+    # Act
+    report = await run_load(
+        sessions=2,
+        speech=load_audio(None),
+        timeout=15.0,
+        env={'LOCAL_STT_LATENCY_MS': '0', 'LOCAL_LLM_TTFT_MS': '0', 'LOCAL_TTS_TTFB_MS': '0'},
+    )
+
+    # Assert
+    assert report['completed'] == 2, report['errors']
+    for stage in STAGES:
+        assert report['latency_ms'][stage]['count'] == 2
+    assert report['latency_ms']['first_transcript']['p50'] <= report['latency_ms']['turn']['p50']
+    assert 'server' in report
+    assert report['agents']['receptionist']['requests'] == 2
@@ -1,6 +1,15 @@
 import pytest
+import asyncio
+import base64
+import json
+import numpy as np
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import WebSocketDisconnect
 from fastapi.testclient import TestClient
+from app.agents.config import AGENTS, PREFETCH_PHRASES
 from app.main import app
+from app.websocket.manager import manager
+from app.websocket.frames import FrameType, decode_frame, encode_frame
 
 
 def test_websocket_connection():
@@ -32,6 +41,28 @@ def test_websocket_invalid_agent():
             pass
 
 
+@pytest.mark.parametrize("query", [
+    "format=pcm16&sample_rate=abc",
+    "format=pcm16&sample_rate=0",
+    "format=pcm16&sample_rate=-16000",
+    "format=flac",
+])
+def test_websocket_rejects_bad_audio_params(query):
+    """Test that invalid audio parameters close with 1008 and leave no session behind"""
+    # Arrange
+    client = TestClient(app)
+    sessions_before = len(manager.sessions)
+
+    # Act
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect(f"/ws/voice-agent/receptionist?{query}"):
+            pass
+
+    # Assert
+    assert exc_info.value.code == 1008
+    assert len(manager.sessions) == sessions_before
+
+
 def test_health_endpoint():
     """Test health check endpoint"""
     client = TestClient(app)
@@ -50,4 +81,509 @@ def test_root_endpoint():
     data = response.json()
     assert data["name"] == "Voice Agent API"
     assert data["version"] == "1.0.0"
-    assert data["status"] == "healthy"
\ No newline at end of file
+    assert data["status"] == "healthy"
+
+
+def test_agent_stats_endpoint():
+    """Test that per-agent LLM latency stats are served as JSON"""
+    client = TestClient(app)
+    response = client.get("/stats/agents")
+    assert response.status_code == 200
+    assert isinstance(response.json(), dict)
+
+
+def test_metrics_endpoint_reports_sessions_and_traffic():
+    """Test that /metrics serves Prometheus text with live session counts"""
+    # Arrange
+    stt, llm, tts = _fake_services()
+    client = TestClient(app)
+    with patch('app.websocket.handlers.STTService', return_value=stt), \
+         patch('app.websocket.handlers.LLMService', return_value=llm), \
+         patch('app.websocket.handlers.TTSService', return_value=tts):
+        with client.websocket_connect(
+            "/ws/voice-agent/receptionist?format=pcm16&sample_rate=16000"
+        ) as websocket:
+            websocket.receive_json()
+            websocket.send_bytes(encode_frame(FrameType.AUDIO_CHUNK, bytes(3200)))
+
+            # Act
+            response = client.get("/metrics")
+
+            websocket.send_json({'type': 'end_session'})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    active = next(line for line in lines if line.startswith("voice_agent_active_sessions "))
+    assert float(active.split()[1]) >= 1
+    assert any(line.startswith('voice_agent_ws_messages_total{direction="in"}') for line in lines)
+    assert any(line.startswith('voice_agent_ws_bytes_total{direction="out"}') for line in lines)
+    assert any(line.startswith('voice_agent_queue_depth{queue="inbound"}') for line in lines)
+
+
+def test_metrics_endpoint_can_be_disabled():
+    """Test that /metrics is not served when METRICS_ENABLED is off"""
+    client = TestClient(app)
+    with patch('app.main.settings.METRICS_ENABLED', False):
+        response = client.get("/metrics")
+    assert response.status_code == 404
+
+
+def _fake_services():
+    """Build STT/LLM/TTS fakes for a single scripted turn"""
+    stt = MagicMock()
+    stt.transcribe = AsyncMock(return_value="What are your hours?")
+    stt.transcribe_pcm = AsyncMock(return_value="What are your hours?")
+
+    async def stream_chat(**kwargs):
+        for token in ["We open at nine.", " We close", " at five."]:
+            yield token
+
+    llm = MagicMock()
+    llm.stream_chat = stream_chat
+
+    async def synthesize_stream(text, voice_id):
+        yield text.encode()
+
+    tts = MagicMock()
+    tts.synthesize_stream = synthesize_stream
+
+    return stt, llm, tts
+
+
+def test_websocket_audio_turn_streams_response():
+    """Test that a final audio chunk runs STT -> streaming LLM -> TTS"""
+    # Arrange
+    stt, llm, tts = _fake_services()
+    client = TestClient(app)
+    with patch('app.websocket.handlers.STTService', return_value=stt), \
+         patch('app.websocket.handlers.LLMService', return_value=llm), \
+         patch('app.websocket.handlers.TTSService', return_value=tts), \
+         patch('app.websocket.handlers.create_decoder', return_value=None):
+        with client.websocket_connect("/ws/voice-agent/receptionist") as websocket:
+            websocket.receive_json()
+
+            # Act
+            websocket.send_json({
+                'type': 'audio_chunk',
+                'data': base64.b64encode(b"audio").decode(),
+                'is_final': True
+            })
+
+            messages = []
+            while True:
+                message = websocket.receive_json()
+                messages.append(message)
+                if message.get('status') == 'idle':
+                    break
+
+            websocket.send_json({'type': 'end_session'})
+
+    # Assert
+    types = [m['type'] for m in messages]
+    transcription = messages[types.index('transcription')]
+    assert transcription == {
+        'type': 'transcription', 'text': 'What are your hours?', 'is_final': True
+    }
+
+    segments = [m['text'] for m in messages if m['type'] == 'llm_response' and not m['is_final']]
+    assert segments == ["We open at nine.", "We close at five."]
+
+    audio = [base64.b64decode(m['data']) for m in messages if m['type'] == 'audio_response']
+    assert audio == [b"We open at nine.", b"We close at five."]
+
+    final = [m for m in messages if m['type'] == 'llm_response' and m['is_final']]
+    assert final[0]['text'] == "We open at nine. We close at five."
+    stt.transcribe.assert_called_once_with(b"audio")
+
+
+def test_websocket_binary_audio_frames():
+    """Test that binary audio frames get binary audio responses"""
+    # Arrange
+    stt, llm, tts = _fake_services()
+    client = TestClient(app)
+
+    with patch('app.websocket.handlers.STTService', return_value=stt), \
+         patch('app.websocket.handlers.LLMService', return_value=llm), \
+         patch('app.websocket.handlers.TTSService', return_value=tts), \
+         patch('app.websocket.handlers.create_decoder', return_value=None):
+        with client.websocket_connect("/ws/voice-agent/receptionist") as websocket:
+            websocket.receive_json()
+
+            # Act
+            websocket.send_bytes(encode_frame(FrameType.AUDIO_CHUNK, b"raw", sequence=0))
+            websocket.send_bytes(
+                encode_frame(FrameType.AUDIO_CHUNK, b"-pcm", sequence=1, is_final=True)
+            )
+
+            frames = []
+            while True:
+                message = websocket.receive()
+                if message.get('bytes') is not None:
+                    frames.append(decode_frame(message['bytes']))
+                elif json.loads(message['text']).get('status') == 'idle':
+                    break
+
+            websocket.send_json({'type': 'end_session'})
+
+    # Assert
+    stt.transcribe.assert_called_once_with(b"raw-pcm")
+    # The end-of-response marker is merged into the last audio frame
+    assert [f.payload for f in frames] == [b"We open at nine.", b"We close at five."]
+    assert [f.sequence for f in frames] == [0, 1]
+    assert all(f.type == FrameType.AUDIO_RESPONSE for f in frames)
+    assert [f.is_final for f in frames] == [False, True]
+
+
+def test_websocket_rejects_outbound_frame_type():
+    """Test that server-only binary frame types get an error message"""
+    # Arrange
+    client = TestClient(app)
+
+    with client.websocket_connect("/ws/voice-agent/receptionist") as websocket:
+        websocket.receive_json()
+
+        # Act
+        websocket.send_bytes(encode_frame(FrameType.AUDIO_RESPONSE, b"audio"))
+        data = websocket.receive_json()
+
+        websocket.send_json({'type': 'end_session'})
+
+    # Assert
+    assert data['type'] == 'error'
+    assert 'AUDIO_RESPONSE' in data['message']
+
+
+def test_lifespan_manages_shared_clients():
+    """Test that the app lifespan creates and closes the client registry"""
+    # Arrange & Act
+    with TestClient(app) as client:
+        registry = client.app.state.clients
+        assert not registry.elevenlabs.closed
+
+    # Assert
+    assert registry.elevenlabs.closed
+
+
+def test_lifespan_pins_greetings_without_warming():
+    """Test that greetings and prefetch phrases are pinned even with no TTS key"""
+    # Act
+    with patch('app.main.settings.ELEVENLABS_API_KEY', ''):
+        with TestClient(app) as client:
+            cache = client.app.state.tts_cache
+
+    # Assert
+    assert cache.accepts(AGENTS['receptionist'].greeting)
+    assert all(cache.accepts(phrase) for phrase in PREFETCH_PHRASES)
+    assert not cache.accepts("Your appointment is at three.")
+
+
+def test_websocket_turn_with_local_providers():
+    """Test a full turn against the local stand-ins, without API keys"""
+    # Arrange
+    t = np.arange(16000 * 300 // 1000) / 16000
+    speech = (np.sin(2 * np.pi * 440 * t) * 16000).astype("<i2").tobytes()
+    silence = bytes(16000 * 100 // 1000 * 2)
+
+    try:
+        with patch('app.main.settings.PROVIDERS', 'local'), \
+             patch('app.main.settings.LOCAL_LLM_TOKENS_PER_SECOND', 0), \
+             patch('app.main.settings.LOCAL_TTS_REALTIME_FACTOR', 0), \
+             TestClient(app) as client:
+            with client.websocket_connect(
+                "/ws/voice-agent/receptionist?format=pcm16&sample_rate=16000"
+            ) as websocket:
+                websocket.receive_json()
+
+                # Act
+                for chunk in [silence] * 2 + [speech] + [silence] * 8:
+                    websocket.send_bytes(encode_frame(FrameType.AUDIO_CHUNK, chunk))
+
+                messages = []
+                audio = 0
+                while True:
+                    message = websocket.receive()
+                    if message.get('bytes'):
+                        audio += 1
+                    elif message.get('text'):
+                        messages.append(json.loads(message['text']))
+                        if messages[-1].get('status') == 'idle':
+                            break
+
+                websocket.send_json({'type': 'end_session'})
+    finally:
+        app.state.providers = None
+
+    # Assert: greeting and turn audio both come from the stand-ins
+    transcription = next(m for m in messages if m['type'] == 'transcription')
+    assert transcription['text'] == "What are your hours?"
+    final = [m for m in messages if m['type'] == 'llm_response' and m['is_final']]
+    assert final[-1]['text'] == "We are open from nine to five, Monday through Friday."
+    assert audio >= 2
+
+
+def test_websocket_pcm_session_endpoints_with_vad():
+    """Test that PCM sessions trigger STT on VAD end-of-utterance"""
+    # Arrange
+    stt, llm, tts = _fake_services()
+    client = TestClient(app)
+
+    t = np.arange(16000 * 300 // 1000) / 16000
+    speech = (np.sin(2 * np.pi * 440 * t) * 16000).astype("<i2").tobytes()
+    silence = bytes(16000 * 100 // 1000 * 2)
+
+    with patch('app.websocket.handlers.STTService', return_value=stt), \
+         patch('app.websocket.handlers.LLMService', return_value=llm), \
+         patch('app.websocket.handlers.TTSService', return_value=tts):
+        with client.websocket_connect(
+            "/ws/voice-agent/receptionist?format=pcm16&sample_rate=16000"
+        ) as websocket:
+            websocket.receive_json()
+
+            # Act: leading silence, speech, then enough silence to endpoint
+            for chunk in [silence] * 10 + [speech] + [silence] * 8:
+                websocket.send_bytes(encode_frame(FrameType.AUDIO_CHUNK, chunk))
+
+            while True:
+                message = websocket.receive()
+                if message.get('text') and json.loads(message['text']).get('status') == 'idle':
+                    break
+
+            websocket.send_json({'type': 'end_session'})
+
+    # Assert
+    stt.transcribe.assert_not_called()
+    stt.transcribe_pcm.assert_called_once()
+    samples, sample_rate = stt.transcribe_pcm.call_args[0]
+    assert sample_rate == 16000
+
+    # Leading silence is trimmed to the pre-roll
+    assert samples.nbytes < len(silence) * 10 + len(speech) + len(silence) * 8
+
+
+def test_websocket_commits_speculative_response():
+    """Test that a response started during the hangover is used when the transcript matches"""
+    # Arrange
+    stt, llm, tts = _fake_services()
+    llm.stream_chat = MagicMock(side_effect=llm.stream_chat)
+    client = TestClient(app)
+
+    t = np.arange(16000 * 300 // 1000) / 16000
+    speech = (np.sin(2 * np.pi * 440 * t) * 16000).astype("<i2").tobytes()
+    silence = bytes(16000 * 100 // 1000 * 2)
+
+    with patch('app.websocket.handlers.STTService', return_value=stt), \
+         patch('app.websocket.handlers.LLMService', return_value=llm), \
+         patch('app.websocket.handlers.TTSService', return_value=tts), \
+         patch('app.websocket.handlers.settings.SPECULATIVE_LLM', True):
+        with client.websocket_connect(
+            "/ws/voice-agent/receptionist?format=pcm16&sample_rate=16000"
+        ) as websocket:
+            websocket.receive_json()
+
+            # Act: speech, then silence past the pause and the hangover
+            for chunk in [silence] * 2 + [speech] + [silence] * 8:
+                websocket.send_bytes(encode_frame(FrameType.AUDIO_CHUNK, chunk))
+
+            messages = []
+            while True:
+                message = websocket.receive()
+                if message.get('text'):
+                    messages.append(json.loads(message['text']))
+                    if messages[-1].get('status') == 'idle':
+                        break
+
+            websocket.send_json({'type': 'end_session'})
+
+    # Assert: speculative and final transcriptions, but only one LLM request
+    assert stt.transcribe_pcm.call_count == 2
+    llm.stream_chat.assert_called_once()
+    assert llm.stream_chat.call_args.kwargs['message'] == "What are your hours?"
+    final = [m for m in messages if m['type'] == 'llm_response' and m['is_final']]
+    assert final[0]['text'] == "We open at nine. We close at five."
+
+
+def test_websocket_streams_partial_transcripts():
+    """Test that partial transcriptions arrive while the caller is speaking"""
+    # Arrange
+    stt, llm, tts = _fake_services()
+    client = TestClient(app)
+
+    t = np.arange(16000 * 300 // 1000) / 16000
+    speech = (np.sin(2 * np.pi * 440 * t) * 16000).astype("<i2").tobytes()
+    silence = bytes(16000 * 100 // 1000 * 2)
+
+    with patch('app.websocket.handlers.STTService', return_value=stt), \
+         patch('app.websocket.handlers.LLMService', return_value=llm), \
+         patch('app.websocket.handlers.TTSService', return_value=tts), \
+         patch('app.websocket.handlers.settings.STREAMING_STT', True):
+        with client.websocket_connect(
+            "/ws/voice-agent/receptionist?format=pcm16&sample_rate=16000"
+        ) as websocket:
+            websocket.receive_json()
+
+            # Act: 1.2 s of speech covers at least one 600 ms interval
+            for chunk in [silence] * 2 + [speech] * 4 + [silence] * 8:
+                websocket.send_bytes(encode_frame(FrameType.AUDIO_CHUNK, chunk))
+
+            messages = []
+            while True:
+                message = websocket.receive()
+                if message.get('text'):
+                    messages.append(json.loads(message['text']))
+                    if messages[-1].get('status') == 'idle':
+                        break
+
+            websocket.send_json({'type': 'end_session'})
+
+    # Assert: partials first, then the transcript of the whole utterance
+    transcriptions = [m for m in messages if m['type'] == 'transcription']
+    assert len(transcriptions) >= 2
+    assert all(not m['is_final'] for m in transcriptions[:-1])
+    assert transcriptions[0]['text'] == "What are your hours?"
+    assert 'stable_text' in transcriptions[0]
+    assert transcriptions[-1]['is_final']
+
+
+def test_websocket_reports_turn_timings():
+    """Test that the idle status_update carries per-stage timings when enabled"""
+    # Arrange
+    stt, llm, tts = _fake_services()
+    client = TestClient(app)
+
+    t = np.arange(16000 * 300 // 1000) / 16000
+    speech = (np.sin(2 * np.pi * 440 * t) * 16000).astype("<i2").tobytes()
+    silence = bytes(16000 * 100 // 1000 * 2)
+
+    with patch('app.websocket.handlers.STTService', return_value=stt), \
+         patch('app.websocket.handlers.LLMService', return_value=llm), \
+         patch('app.websocket.handlers.TTSService', return_value=tts), \
+         patch('app.websocket.handlers.settings.TRACING_STATUS_UPDATES', True):
+        with client.websocket_connect(
+            "/ws/voice-agent/receptionist?format=pcm16&sample_rate=16000"
+        ) as websocket:
+            websocket.receive_json()
+
+            # Act
+            for chunk in [silence] * 2 + [speech] + [silence] * 8:
+                websocket.send_bytes(encode_frame(FrameType.AUDIO_CHUNK, chunk))
+
+            while True:
+                message = websocket.receive()
+                if message.get('text') and json.loads(message['text']).get('status') == 'idle':
+                    status = json.loads(message['text'])
+                    break
+
+            websocket.send_json({'type': 'end_session'})
+
+    # Assert
+    assert status['turn_id'] == 1
+    stages = [
+        "turn", "receive", "decode", "vad", "stt", "llm", "llm.ttft", "tts.segment", "tts.ttfb"
+    ]
+    for stage in stages:
+        assert stage in status['timings']
+
+
+def test_websocket_streams_greeting_on_connect():
+    """Test that the agent greeting is spoken right after connecting"""
+    # Arrange
+    stt, llm, tts = _fake_services()
+    client = TestClient(app)
+
+    with patch('app.websocket.handlers.TTSService', return_value=tts), \
+         patch('app.websocket.handlers.settings.ELEVENLABS_API_KEY', 'test_api_key'):
+        with client.websocket_connect("/ws/voice-agent/receptionist?binary=true") as websocket:
+            # Act
+            established = websocket.receive_json()
+            greeting = websocket.receive_json()
+            frame = decode_frame(websocket.receive_bytes())
+
+            websocket.send_json({'type': 'end_session'})
+
+    # Assert
+    assert established['type'] == 'connection_established'
+    assert greeting == {
+        'type': 'llm_response',
+        'text': 'Thank you for calling. How can I help you today?',
+        'is_final': True
+    }
+    assert frame.payload == greeting['text'].encode()
+    assert frame.is_final
+
+
+def test_websocket_resumes_session_without_greeting():
+    """Test that reconnecting with ?session_id resumes history and skips the greeting"""
+    # Arrange
+    stt, llm, tts = _fake_services()
+    tts_factory = MagicMock(return_value=tts)
+    client = TestClient(app)
+
+    with patch('app.websocket.handlers.TTSService', tts_factory), \
+         patch('app.websocket.handlers.settings.ELEVENLABS_API_KEY', 'test_api_key'):
+        with client.websocket_connect("/ws/voice-agent/receptionist?binary=true") as websocket:
+            session_id = websocket.receive_json()['session_id']
+            websocket.receive_json()  # greeting text
+            websocket.receive_bytes()  # greeting audio
+            websocket.close()  # dropped, not ended
+
+        # Act
+        with client.websocket_connect(
+            f"/ws/voice-agent/receptionist?binary=true&session_id={session_id}"
+        ) as websocket:
+            established = websocket.receive_json()
+            websocket.send_json({'type': 'end_session'})
+
+    # Assert
+    assert established['session_id'] == session_id
+    assert tts_factory.call_count == 1
+
+
+def test_websocket_barge_in_interrupts_agent():
+    """Test that caller speech cancels the in-flight turn and flushes audio"""
+    # Arrange
+    stt, llm, _ = _fake_services()
+    tts_aborted = []
+
+    async def slow_synthesize_stream(text, voice_id):
+        try:
+            yield text.encode()
+            await asyncio.sleep(10)
+        finally:
+            tts_aborted.append(text)
+
+    tts = MagicMock()
+    tts.synthesize_stream = slow_synthesize_stream
+    client = TestClient(app)
+
+    t = np.arange(16000 * 300 // 1000) / 16000
+    speech = (np.sin(2 * np.pi * 440 * t) * 16000).astype("<i2").tobytes()
+    silence = bytes(16000 * 100 // 1000 * 2)
+
+    with patch('app.websocket.handlers.STTService', return_value=stt), \
+         patch('app.websocket.handlers.LLMService', return_value=llm), \
+         patch('app.websocket.handlers.TTSService', return_value=tts):
+        with client.websocket_connect(
+            "/ws/voice-agent/receptionist?format=pcm16&sample_rate=16000"
+        ) as websocket:
+            websocket.receive_json()
+            for chunk in [speech] + [silence] * 8:
+                websocket.send_bytes(encode_frame(FrameType.AUDIO_CHUNK, chunk))
+
+            # Wait until the agent is speaking (binary AUDIO_RESPONSE frame)
+            while websocket.receive().get('bytes') is None:
+                pass
+
+            # Act: the caller talks over the agent
+            websocket.send_bytes(encode_frame(FrameType.AUDIO_CHUNK, speech))
+
+            messages = []
+            while not messages or messages[-1]['type'] != 'flush_audio':
+                messages.append(websocket.receive_json())
+
+            websocket.send_json({'type': 'end_session'})
+
+    # Assert
+    assert messages[-1] == {'type': 'flush_audio'}
+    assert tts_aborted == ["We open at nine."]
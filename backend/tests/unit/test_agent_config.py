@@ -162,4 +162,45 @@ def test_agent_descriptions():
     for agent_id, config in agents.items():
         assert isinstance(config.description, str)
         assert len(config.description) > 0
-        assert config.description != config.name  # Description should be different from name
\ No newline at end of file
+        assert config.description != config.name  # Description should be different from name
+
+def test_agent_greetings():
+    """Test that all agents have a spoken greeting and it defaults to None"""
+    # Arrange
+    agents = get_all_agents()
+    config = AgentConfig(
+        id='test_agent',
+        name='Test Agent',
+        description='A test agent',
+        prompt='You are a test agent',
+        voice_id='test_voice_id'
+    )
+
+    # Act & Assert
+    assert config.greeting is None
+    for agent_id, agent in agents.items():
+        assert isinstance(agent.greeting, str)
+        assert agent.greeting.strip()
+
+
+def test_agent_model_parameters():
+    """Test model parameter defaults and that agents use valid latency tiers"""
+    # Arrange
+    agents = get_all_agents()
+    config = AgentConfig(
+        id='test_agent',
+        name='Test Agent',
+        description='A test agent',
+        prompt='You are a test agent',
+        voice_id='test_voice_id'
+    )
+
+    # Act & Assert
+    assert config.model is None
+    assert config.stop is None
+    assert config.latency_tier == "standard"
+    assert agents['receptionist'].latency_tier == "fast"
+    for agent in agents.values():
+        assert agent.latency_tier in ("fast", "standard")
+        assert 0 <= agent.temperature <= 2
+        assert agent.max_tokens > 0
@@ -0,0 +1,186 @@
+import pytest
+import numpy as np
+from app.services.audio_analysis import (
+    MIN_DBFS,
+    clipped_fraction,
+    detect_clipping,
+    downmix,
+    frame_dbfs,
+    frame_signal,
+    frame_stats,
+    peak_dbfs,
+    resample,
+    trim_silence,
+    zero_crossing_rate,
+)
+
+SAMPLE_RATE = 16000
+
+
+def _tone(ms, freq=440, amplitude=0.5, sample_rate=SAMPLE_RATE):
+    t = np.arange(sample_rate * ms // 1000) / sample_rate
+    return (np.sin(2 * np.pi * freq * t) * amplitude * 32767).astype(np.int16)
+
+
+def _silence(ms, sample_rate=SAMPLE_RATE):
+    return np.zeros(sample_rate * ms // 1000, dtype=np.int16)
+
+
+def test_frame_signal_drops_partial_tail():
+    """Test that frame_signal() returns whole frames only"""
+    # Arrange & Act
+    frames = frame_signal(np.arange(10, dtype=np.int16), 4)
+
+    # Assert
+    assert frames.shape == (2, 4)
+    assert frames[1].tolist() == [4, 5, 6, 7]
+
+
+def test_frame_dbfs_levels():
+    """Test frame_dbfs() for silence and a full-scale square wave"""
+    # Arrange
+    frames = np.array([[0, 0, 0, 0], [32767, -32768, 32767, -32768]], dtype=np.int16)
+
+    # Act
+    levels = frame_dbfs(frames)
+
+    # Assert
+    assert levels[0] == MIN_DBFS
+    assert levels[1] == pytest.approx(0.0, abs=0.01)
+
+
+def test_peak_dbfs():
+    """Test peak_dbfs() for half-scale audio and empty input"""
+    # Act & Assert
+    assert peak_dbfs(np.array([0, 16384, -100], dtype=np.int16)) == pytest.approx(-6.02, abs=0.01)
+    assert peak_dbfs(np.array([], dtype=np.int16)) == MIN_DBFS
+
+
+def test_zero_crossing_rate():
+    """Test zero-crossing rate for alternating and constant frames"""
+    # Arrange
+    frames = np.array([[1, -1, 1, -1, 1], [5, 5, 5, 5, 5]], dtype=np.int16)
+
+    # Act
+    zcr = zero_crossing_rate(frames)
+
+    # Assert
+    assert zcr.tolist() == [1.0, 0.0]
+
+
+def test_clipping_detection():
+    """Test clipped fraction and clipping detection"""
+    # Arrange
+    samples = np.array([32767, -32768, 100, 200], dtype=np.int16)
+
+    # Act & Assert
+    assert clipped_fraction(samples) == 0.5
+    assert detect_clipping(samples)
+    assert not detect_clipping(_tone(100))
+    assert clipped_fraction(np.array([], dtype=np.int16)) == 0.0
+
+
+def test_frame_stats_one_entry_per_frame():
+    """Test that frame_stats() returns per-frame arrays"""
+    # Arrange
+    samples = np.concatenate([_silence(40), _tone(60)])
+
+    # Act
+    stats = frame_stats(samples, SAMPLE_RATE, frame_ms=20)
+
+    # Assert
+    assert stats.frame_samples == 320
+    assert len(stats.dbfs) == len(stats.peak_dbfs) == len(stats.zero_crossing_rate) == 5
+    assert stats.dbfs[0] == MIN_DBFS
+    assert stats.dbfs[-1] == pytest.approx(-9.03, abs=0.1)
+
+
+def test_trim_silence_keeps_padded_speech():
+    """Test that leading/trailing silence is trimmed with padding"""
+    # Arrange
+    speech = _tone(200)
+    samples = np.concatenate([_silence(500), speech, _silence(500)])
+
+    # Act
+    trimmed = trim_silence(samples, SAMPLE_RATE, padding_ms=100)
+
+    # Assert
+    padding = SAMPLE_RATE // 10
+    assert len(trimmed) == len(speech) + 2 * padding
+    assert np.array_equal(trimmed[padding:padding + len(speech)], speech)
+
+
+def test_trim_silence_all_silent_returns_empty():
+    """Test that all-silent input trims to nothing"""
+    # Act
+    trimmed = trim_silence(_silence(300), SAMPLE_RATE)
+
+    # Assert
+    assert trimmed.size == 0
+
+
+def test_trim_silence_short_input_unchanged():
+    """Test that input shorter than a frame is returned as-is"""
+    # Arrange
+    samples = np.array([0, 1, 2], dtype=np.int16)
+
+    # Act & Assert
+    assert trim_silence(samples, SAMPLE_RATE) is samples
+
+
+def test_downmix_averages_channels():
+    """Test that interleaved stereo is averaged to mono"""
+    # Arrange
+    stereo = np.array([100, 300, -200, -400], dtype=np.int16)
+
+    # Act
+    mono = downmix(stereo, 2)
+
+    # Assert
+    assert mono.tolist() == [200, -300]
+
+
+def test_resample_same_rate_unchanged():
+    """Test that equal rates return the input"""
+    # Arrange
+    samples = _tone(100)
+
+    # Act & Assert
+    assert resample(samples, SAMPLE_RATE, SAMPLE_RATE) is samples
+
+
+def test_resample_downsample_preserves_tone():
+    """Test that 48 kHz → 16 kHz keeps length ratio and in-band level"""
+    # Arrange
+    samples = _tone(500, freq=440, sample_rate=48000)
+
+    # Act
+    resampled = resample(samples, 48000, 16000)
+
+    # Assert
+    assert resampled.dtype == np.int16
+    assert len(resampled) == len(samples) // 3
+    core = resampled[200:-200]
+    assert frame_dbfs(core[np.newaxis, :])[0] == pytest.approx(-9.03, abs=0.5)
+
+
+def test_resample_downsample_attenuates_aliases():
+    """Test that content above the new Nyquist frequency is filtered"""
+    # Arrange
+    samples = _tone(500, freq=12000, sample_rate=48000)
+
+    # Act
+    resampled = resample(samples, 48000, 16000)
+
+    # Assert
+    core = resampled[200:-200]
+    assert frame_dbfs(core[np.newaxis, :])[0] < -40
+
+
+def test_resample_upsample_length():
+    """Test that upsampling scales the number of samples"""
+    # Act
+    resampled = resample(_tone(100, sample_rate=8000), 8000, 16000)
+
+    # Assert
+    assert len(resampled) == 1600
@@ -0,0 +1,155 @@
+import pytest
+import asyncio
+import shutil
+import numpy as np
+from app.services.audio_decoder import PCMDecoder, StreamingDecoder
+
+
+class PassthroughDecoder(StreamingDecoder):
+    """StreamingDecoder driven by `cat` so tests don't need ffmpeg"""
+
+    def _command(self):
+        return [shutil.which("cat")]
+
+
+class HangingDecoder(StreamingDecoder):
+    """StreamingDecoder whose process ignores EOF on stdin and never exits"""
+
+    def _command(self):
+        return [shutil.which("sleep"), "30"]
+
+
+def _pcm(values):
+    return np.array(values, dtype=np.int16).tobytes()
+
+
+@pytest.mark.asyncio
+async def test_pcm_decoder_returns_samples():
+    """Test that PCMDecoder returns int16 samples"""
+    # Arrange
+    decoder = PCMDecoder(sample_rate=8000)
+
+    # Act
+    samples = await decoder.feed(_pcm([1, -2, 3]))
+
+    # Assert
+    assert samples.dtype == np.int16
+    assert samples.tolist() == [1, -2, 3]
+
+
+@pytest.mark.asyncio
+async def test_pcm_decoder_carries_odd_byte():
+    """Test that a split 16-bit word is completed by the next chunk"""
+    # Arrange
+    decoder = PCMDecoder()
+    data = _pcm([1000, -1000])
+
+    # Act
+    first = await decoder.feed(data[:3])
+    second = await decoder.feed(data[3:])
+
+    # Assert
+    assert first.tolist() == [1000]
+    assert second.tolist() == [-1000]
+
+
+@pytest.mark.asyncio
+async def test_pcm_decoder_tracks_duration_and_level():
+    """Test running duration, level and peak statistics"""
+    # Arrange
+    decoder = PCMDecoder(sample_rate=100)
+
+    # Act
+    await decoder.feed(_pcm([0] * 50))
+    silent = decoder.is_silent()
+    await decoder.feed(_pcm([16384, -16384] * 25))
+
+    # Assert
+    assert silent is True
+    assert decoder.duration == pytest.approx(1.0)
+    assert decoder.level_dbfs == pytest.approx(-6.02, abs=0.01)
+    assert decoder.peak_dbfs == pytest.approx(-6.02, abs=0.01)
+    assert decoder.is_silent() is False
+
+
+@pytest.mark.asyncio
+async def test_streaming_decoder_collects_output_across_feeds():
+    """Test that output from the long-lived process is returned incrementally"""
+    # Arrange
+    decoder = PassthroughDecoder(sample_rate=16000)
+    values = list(range(-500, 500))
+
+    # Act
+    collected = []
+    for i in range(0, len(values), 100):
+        collected.extend((await decoder.feed(_pcm(values[i:i + 100]))).tolist())
+    collected.extend((await decoder.close()).tolist())
+
+    # Assert
+    assert collected == values
+    assert decoder.samples_decoded == len(values)
+
+
+@pytest.mark.asyncio
+async def test_streaming_decoder_restarts_after_close():
+    """Test that feeding after close starts a new process"""
+    # Arrange
+    decoder = PassthroughDecoder()
+    await decoder.feed(_pcm([1, 2]))
+    await decoder.close()
+
+    # Act
+    samples = await decoder.feed(_pcm([3, 4]))
+    samples = np.concatenate([samples, await decoder.close()])
+
+    # Assert
+    assert samples.tolist() == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_streaming_decoder_close_without_start():
+    """Test that close() is safe before any audio was fed"""
+    # Arrange
+    decoder = StreamingDecoder()
+
+    # Act
+    samples = await decoder.close()
+
+    # Assert
+    assert samples.size == 0
+
+
+@pytest.mark.asyncio
+async def test_streaming_decoder_close_kills_hung_process():
+    """Test that close() kills a process that does not exit within close_timeout"""
+    # Arrange
+    decoder = HangingDecoder(close_timeout=0.1)
+    await decoder.feed(_pcm([1, 2]))
+    process = decoder._process
+
+    # Act
+    samples = await asyncio.wait_for(decoder.close(), 2.0)
+
+    # Assert
+    assert samples.size == 0
+    assert process.returncode is not None
+    assert decoder._process is None
+
+
+def test_streaming_decoder_command():
+    """Test the ffmpeg command decodes stdin to mono s16le at sample_rate"""
+    # Arrange
+    decoder = StreamingDecoder(
+        sample_rate=24000, input_format="webm", ffmpeg_path="/usr/bin/ffmpeg"
+    )
+
+    # Act
+    command = decoder._command()
+
+    # Assert
+    assert command[0] == "/usr/bin/ffmpeg"
+    assert command[command.index("-f") + 1] == "webm"
+    assert command[command.index("-i") + 1] == "pipe:0"
+    assert command[command.index("-ar") + 1] == "24000"
+    assert command[command.index("-ac") + 1] == "1"
+    assert command[-1] == "pipe:1"
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch, MagicMock
 import io
+import wave
 from app.services.audio_processor import AudioProcessor
 
 
@@ -234,4 +235,33 @@ def test_audio_processor_various_formats():
             # Verify from_file was called with correct format for duration check
             mock_audio_segment.from_file.assert_called()
             last_call = mock_audio_segment.from_file.call_args
-            assert isinstance(last_call[0][0], io.BytesIO)
\ No newline at end of file
+            assert isinstance(last_call[0][0], io.BytesIO)
+
+def test_pcm_to_wav_round_trip():
+    """Test that pcm_to_wav() wraps PCM in a readable WAV"""
+    # Arrange
+    pcm = bytes(range(256)) * 4
+
+    # Act
+    result = AudioProcessor.pcm_to_wav(pcm, 16000)
+
+    # Assert
+    with wave.open(io.BytesIO(result), "rb") as wav:
+        assert wav.getframerate() == 16000
+        assert wav.getnchannels() == 1
+        assert wav.getsampwidth() == 2
+        assert wav.readframes(wav.getnframes()) == pcm
+
+
+def test_analyze_pcm_returns_frame_stats():
+    """Test that analyze_pcm() returns one entry per whole frame"""
+    # Arrange
+    pcm = bytes(16000 * 2 // 10) + b"\x01"  # 100 ms of silence plus a stray byte
+
+    # Act
+    stats = AudioProcessor.analyze_pcm(pcm, 16000, frame_ms=20)
+
+    # Assert
+    assert len(stats.dbfs) == 5
+    assert stats.frame_samples == 320
+    assert all(level == -100.0 for level in stats.dbfs)
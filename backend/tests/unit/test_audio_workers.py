@@ -0,0 +1,137 @@
+import pytest
+import asyncio
+import threading
+import numpy as np
+from app.services.audio_workers import AudioPoolSaturated, AudioWorkerPool
+from app.services.stt_preprocessor import STTPreprocessor, UploadPolicy
+
+
+def _square(x):
+    return x * x
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+@pytest.fixture
+def pool():
+    pool = AudioWorkerPool(cpu_workers=1, io_workers=2, max_pending=4, queue_timeout=1.0)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_uses_process_pool(pool):
+    """Test that run_cpu() runs a module-level function in a worker process"""
+    # Act
+    result = await pool.run_cpu(_square, 7)
+
+    # Assert
+    assert result == 49
+    assert pool.completed == 1
+
+
+@pytest.mark.asyncio
+async def test_run_io_runs_off_event_loop_thread(pool):
+    """Test that run_io() runs in an audio-io thread"""
+    # Act
+    name = await pool.run_io(lambda: threading.current_thread().name)
+
+    # Assert
+    assert name.startswith("audio-io")
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_counted_and_raised(pool):
+    """Test that exceptions propagate and are counted"""
+    # Act & Assert
+    with pytest.raises(ValueError, match="boom"):
+        await pool.run_io(_fail)
+
+    assert pool.failed == 1
+    assert pool.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_slot_until_job_completes():
+    """Test that a cancelled waiter's slot is only released when its executor job finishes"""
+    # Arrange
+    pool = AudioWorkerPool(cpu_workers=1, io_workers=1, max_pending=1, queue_timeout=0.05)
+    release = threading.Event()
+    caller = asyncio.create_task(pool.run_io(release.wait))
+    await asyncio.sleep(0.05)
+
+    try:
+        # Act
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        # Assert: the job still runs, so its slot is still taken
+        assert pool.in_flight == 1
+        with pytest.raises(AudioPoolSaturated):
+            await pool.run_io(lambda: None)
+
+        release.set()
+        for _ in range(100):
+            if pool.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.in_flight == 0
+        assert await pool.run_io(lambda: "free") == "free"
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_after_timeout():
+    """Test that callers are rejected when no slot frees up in time"""
+    # Arrange
+    pool = AudioWorkerPool(cpu_workers=1, io_workers=1, max_pending=1, queue_timeout=0.05)
+    release = threading.Event()
+    blocker = asyncio.create_task(pool.run_io(release.wait))
+    await asyncio.sleep(0.01)
+
+    try:
+        # Act & Assert
+        assert pool.queue_depth == 1
+        with pytest.raises(AudioPoolSaturated):
+            await pool.run_io(_square, 2)
+
+        assert pool.rejected == 1
+    finally:
+        release.set()
+        await blocker
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_stats_snapshot(pool):
+    """Test that stats() reports pool counters"""
+    # Arrange
+    await pool.run_io(_square, 3)
+
+    # Act
+    stats = pool.stats()
+
+    # Assert
+    assert stats['completed'] == 1
+    assert stats['queue_depth'] == 0
+    assert stats['max_pending'] == 4
+
+
+@pytest.mark.asyncio
+async def test_preprocessor_runs_in_pool(pool):
+    """Test that STTPreprocessor offloads its NumPy stage to the pool"""
+    # Arrange
+    preprocessor = STTPreprocessor(UploadPolicy(trim_silence=False), pool=pool)
+    samples = np.full(48000, 1000, dtype=np.int16)
+
+    # Act
+    prepared = await preprocessor.prepare(samples, 48000)
+
+    # Assert
+    assert prepared.duration == pytest.approx(1.0, abs=0.01)
+    assert pool.completed == 1
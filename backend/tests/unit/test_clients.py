@@ -0,0 +1,119 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+import aiohttp
+from app.services.clients import ClientRegistry
+from app.services.stt_service import STTService
+from app.services.llm_service import LLMService
+from app.services.tts_service import TTSService
+
+
+@pytest.mark.asyncio
+async def test_create_builds_pooled_clients():
+    """Test that create() builds an OpenAI client and pooled ElevenLabs session"""
+    # Arrange
+    with patch('app.services.clients.settings') as mock_settings:
+        mock_settings.OPENAI_API_KEY = "test_api_key"
+        mock_settings.HTTP_MAX_CONNECTIONS = 10
+        mock_settings.HTTP_MAX_KEEPALIVE_CONNECTIONS = 5
+        mock_settings.HTTP_KEEPALIVE_EXPIRY = 30.0
+        mock_settings.HTTP_CONNECT_TIMEOUT = 2.0
+        mock_settings.HTTP_READ_TIMEOUT = 10.0
+        mock_settings.HTTP2_ENABLED = True
+
+        # Act
+        registry = ClientRegistry.create()
+
+    # Assert
+    try:
+        assert registry.openai is not None
+        assert isinstance(registry.elevenlabs, aiohttp.ClientSession)
+        assert registry.elevenlabs.connector.limit == 10
+    finally:
+        await registry.close()
+
+    assert registry.elevenlabs.closed
+
+
+@pytest.mark.asyncio
+async def test_create_without_openai_key():
+    """Test that create() skips the OpenAI client when no key is set"""
+    # Arrange
+    with patch('app.services.clients.settings') as mock_settings:
+        mock_settings.OPENAI_API_KEY = ""
+        mock_settings.HTTP_MAX_CONNECTIONS = 10
+        mock_settings.HTTP_KEEPALIVE_EXPIRY = 30.0
+        mock_settings.HTTP_CONNECT_TIMEOUT = 2.0
+        mock_settings.HTTP_READ_TIMEOUT = 10.0
+
+        # Act
+        registry = ClientRegistry.create()
+
+    # Assert
+    assert registry.openai is None
+    await registry.close()
+    assert registry.elevenlabs.closed
+
+
+@pytest.mark.asyncio
+async def test_close_closes_all_clients():
+    """Test that close() closes both clients"""
+    # Arrange
+    openai_client = AsyncMock()
+    session = AsyncMock()
+    registry = ClientRegistry(openai=openai_client, elevenlabs=session)
+
+    # Act
+    await registry.close()
+
+    # Assert
+    openai_client.close.assert_called_once()
+    session.close.assert_called_once()
+
+
+def test_services_use_injected_openai_client():
+    """Test that STT and LLM services reuse the injected client"""
+    # Arrange
+    client = MagicMock()
+
+    # Act
+    stt = STTService(client=client)
+    llm = LLMService(client=client)
+
+    # Assert
+    assert stt.client is client
+    assert llm.client is client
+
+
+@pytest.mark.asyncio
+async def test_tts_uses_shared_session():
+    """Test that TTSService streams through the shared session"""
+    # Arrange
+    async def iter_chunked(size):
+        yield b"chunk_1"
+        yield b"chunk_2"
+
+    response = MagicMock()
+    response.status = 200
+    response.content.iter_chunked = iter_chunked
+
+    session = MagicMock()
+    session.post.return_value.__aenter__.return_value = response
+
+    with patch('app.services.tts_service.settings') as mock_settings, \
+         patch('aiohttp.ClientSession') as mock_client_session:
+        mock_settings.ELEVENLABS_API_KEY = "test_api_key"
+        service = TTSService(session=session)
+
+        # Act
+        chunks = [
+            chunk async for chunk in service.synthesize_stream(
+                text="Hello",
+                voice_id="test_voice_id"
+            )
+        ]
+
+    # Assert
+    assert chunks == [b"chunk_1", b"chunk_2"]
+    session.post.assert_called_once()
+    session.close.assert_not_called()
+    mock_client_session.assert_not_called()
@@ -1,10 +1,21 @@
 import pytest
+import asyncio
+import base64
+import json
 from unittest.mock import AsyncMock, MagicMock
-from fastapi import WebSocket
+from fastapi import WebSocket, WebSocketDisconnect
 from app.websocket.manager import ConnectionManager
+from app.websocket.frames import FrameType, decode_frame
+from app.websocket.session_store import InMemorySessionStore
+from app.services.history import HistoryManager, message_tokens
 from datetime import datetime, timezone
 
 
+def _sent_json(mock_websocket):
+    """Decode the JSON text frames sent to a mock WebSocket"""
+    return [json.loads(c.args[0]) for c in mock_websocket.send_text.call_args_list]
+
+
 @pytest.mark.asyncio
 async def test_connect_creates_session():
     """Test that connect() creates a new session"""
@@ -102,7 +113,7 @@ async def test_send_message_sends_json():
     await manager.send_message(session_id, message)
 
     # Assert
-    mock_websocket.send_json.assert_called_once_with(message)
+    assert _sent_json(mock_websocket) == [message]
 
 
 @pytest.mark.asyncio
@@ -117,6 +128,47 @@ async def test_send_message_handles_disconnected_session():
     await manager.send_message(session_id, message)
 
 
+@pytest.mark.asyncio
+async def test_send_bytes_sends_binary():
+    """Test that send_bytes() sends binary data to WebSocket"""
+    # Arrange
+    manager = ConnectionManager()
+    session_id = "test_session_id"
+    mock_websocket = AsyncMock(spec=WebSocket)
+    manager.active_connections[session_id] = mock_websocket
+
+    # Act
+    await manager.send_bytes(session_id, b"frame")
+
+    # Assert
+    mock_websocket.send_bytes.assert_called_once_with(b"frame")
+
+
+@pytest.mark.asyncio
+async def test_send_bytes_handles_disconnected_session():
+    """Test that send_bytes() handles disconnected session gracefully"""
+    # Arrange
+    manager = ConnectionManager()
+
+    # Act & Assert (should not raise exception)
+    await manager.send_bytes("nonexistent_session_id", b"frame")
+
+
+@pytest.mark.asyncio
+async def test_connect_binary_audio_flag():
+    """Test that connect() records the binary audio preference"""
+    # Arrange
+    manager = ConnectionManager()
+    mock_websocket = AsyncMock(spec=WebSocket)
+
+    # Act
+    session_id = await manager.connect(mock_websocket, "receptionist", binary_audio=True)
+
+    # Assert
+    assert manager.sessions[session_id]['binary_audio'] is True
+    assert manager.sessions[session_id]['audio_sequence'] == 0
+
+
 def test_get_session_returns_session():
     """Test that get_session() returns session dict if exists"""
     # Arrange
@@ -192,4 +244,367 @@ def test_update_session_handles_nonexistent():
     manager.update_session(session_id, updates)
 
     # Assert
-    assert len(manager.sessions) == 0
\ No newline at end of file
+    assert len(manager.sessions) == 0
+
+
+@pytest.mark.asyncio
+async def test_append_history_records_locally_and_in_store():
+    """Test that append_history() updates the session and the store"""
+    # Arrange
+    store = InMemorySessionStore()
+    manager = ConnectionManager(store=store)
+    session_id = await manager.connect(AsyncMock(spec=WebSocket), "receptionist")
+    turn = [{'role': 'user', 'content': 'hi'}, {'role': 'assistant', 'content': 'Hello!'}]
+
+    # Act
+    await manager.append_history(session_id, turn, turns=1)
+
+    # Assert
+    assert manager.sessions[session_id]['conversation_history'] == turn
+    assert manager.sessions[session_id]['message_count'] == 1
+    record = await store.load(session_id)
+    assert record.history == turn
+    assert record.message_count == 1
+
+
+@pytest.mark.asyncio
+async def test_append_history_evicts_and_summarizes_past_budget():
+    """Test that old messages are evicted locally and in the store, then summarized"""
+    # Arrange
+    store = InMemorySessionStore()
+    summarizer = AsyncMock(return_value="Caller asked about hours.")
+    turn = [{'role': 'user', 'content': 'hi'}, {'role': 'assistant', 'content': 'Hello!'}]
+    history = HistoryManager(
+        max_tokens=sum(message_tokens(m) for m in turn),
+        summarizer=summarizer
+    )
+    manager = ConnectionManager(store=store, history=history)
+    session_id = await manager.connect(AsyncMock(spec=WebSocket), "receptionist")
+    await manager.append_history(session_id, [{'role': 'user', 'content': 'hours?'}], turns=1)
+
+    # Act
+    await manager.append_history(session_id, turn, turns=1)
+    await manager.sessions[session_id]['summary_task']
+
+    # Assert
+    assert manager.sessions[session_id]['conversation_history'] == turn
+    summarizer.assert_awaited_once_with("", [{'role': 'user', 'content': 'hours?'}])
+    assert manager.prompt_history(session_id)[0]['content'].endswith("Caller asked about hours.")
+    record = await store.load(session_id)
+    assert record.history == turn
+    assert record.summary == "Caller asked about hours."
+    assert record.message_count == 2
+
+
+@pytest.mark.asyncio
+async def test_connect_resumes_session_from_store():
+    """Test that a reconnect on another manager resumes the stored history"""
+    # Arrange
+    store = InMemorySessionStore()
+    first = ConnectionManager(store=store)
+    session_id = await first.connect(AsyncMock(spec=WebSocket), "receptionist")
+    await first.append_history(session_id, [{'role': 'assistant', 'content': 'Hello!'}])
+    first.disconnect(session_id)
+
+    # Act
+    second = ConnectionManager(store=store)
+    resumed_id = await second.connect(
+        AsyncMock(spec=WebSocket), "receptionist", resume_id=session_id
+    )
+
+    # Assert
+    assert resumed_id == session_id
+    assert second.sessions[session_id]['conversation_history'] == [
+        {'role': 'assistant', 'content': 'Hello!'}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_connect_ignores_unknown_or_foreign_resume_id():
+    """Test that resume_id for an unknown session or another agent starts fresh"""
+    # Arrange
+    store = InMemorySessionStore()
+    manager = ConnectionManager(store=store)
+    sales_id = await manager.connect(AsyncMock(spec=WebSocket), "sales")
+    manager.disconnect(sales_id)
+
+    # Act
+    unknown = await manager.connect(AsyncMock(spec=WebSocket), "receptionist", resume_id="nope")
+    foreign = await manager.connect(AsyncMock(spec=WebSocket), "receptionist", resume_id=sales_id)
+
+    # Assert
+    assert unknown != "nope"
+    assert foreign != sales_id
+    assert (await store.load(sales_id)).agent_id == "sales"
+
+
+@pytest.mark.asyncio
+async def test_session_survives_store_failures():
+    """Test that store errors are logged without breaking the session"""
+    # Arrange
+    store = AsyncMock(spec=InMemorySessionStore)
+    store.create.side_effect = ConnectionError("store down")
+    store.append_history.side_effect = ConnectionError("store down")
+    manager = ConnectionManager(store=store)
+
+    # Act
+    session_id = await manager.connect(AsyncMock(spec=WebSocket), "receptionist")
+    await manager.append_history(session_id, [{'role': 'user', 'content': 'hi'}])
+
+    # Assert
+    history = manager.sessions[session_id]['conversation_history']
+    assert history == [{'role': 'user', 'content': 'hi'}]
+
+
+@pytest.mark.asyncio
+async def test_end_session_deletes_stored_session():
+    """Test that end_session() removes the session from the store"""
+    # Arrange
+    store = InMemorySessionStore()
+    manager = ConnectionManager(store=store)
+    session_id = await manager.connect(AsyncMock(spec=WebSocket), "receptionist")
+
+    # Act
+    await manager.end_session(session_id)
+
+    # Assert
+    assert await store.load(session_id) is None
+
+
+def _scripted_receive(*messages):
+    """receive() that returns messages in order, then blocks forever"""
+    queue = asyncio.Queue()
+    for message in messages:
+        queue.put_nowait(message)
+    return queue.get
+
+
+@pytest.mark.asyncio
+async def test_run_passes_messages_to_handle_in_order():
+    """Test that run() feeds received messages to handle until it returns False"""
+    # Arrange
+    manager = ConnectionManager()
+    mock_websocket = AsyncMock(spec=WebSocket)
+    session_id = await manager.connect(mock_websocket, "receptionist")
+    handled = []
+
+    async def handle(message):
+        handled.append(message)
+        await manager.send_message(session_id, {"echo": message})
+        return message != "end"
+
+    # Act
+    await manager.run(session_id, _scripted_receive("a", "b", "end", "ignored"), handle)
+
+    # Assert
+    assert handled == ["a", "b", "end"]
+    assert _sent_json(mock_websocket) == [
+        {"echo": "a"}, {"echo": "b"}, {"echo": "end"}
+    ]
+    assert session_id not in manager.channels
+
+
+@pytest.mark.asyncio
+async def test_run_queues_sends_for_the_writer():
+    """Test that send_message()/send_bytes() go through the outbound queue while running"""
+    # Arrange
+    manager = ConnectionManager()
+    mock_websocket = AsyncMock(spec=WebSocket)
+    session_id = await manager.connect(mock_websocket, "receptionist")
+    depths = []
+
+    async def handle(message):
+        await manager.send_bytes(session_id, b"frame")
+        depths.append(manager.queue_depths(session_id))
+        return False
+
+    # Act
+    await manager.run(session_id, _scripted_receive("go"), handle)
+
+    # Assert
+    assert depths == [(0, 1)]
+    mock_websocket.send_bytes.assert_called_once_with(b"frame")
+    assert manager.queue_depths(session_id) is None
+
+
+@pytest.mark.asyncio
+async def test_run_propagates_disconnect_and_cancels_worker():
+    """Test that a reader disconnect ends run() and cancels the worker"""
+    # Arrange
+    manager = ConnectionManager()
+    session_id = await manager.connect(AsyncMock(spec=WebSocket), "receptionist")
+    worker_cancelled = asyncio.Event()
+    script = iter(["slow", WebSocketDisconnect(1000)])
+
+    async def receive():
+        item = next(script)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def handle(message):
+        try:
+            await asyncio.sleep(10)
+        finally:
+            worker_cancelled.set()
+
+    # Act & Assert
+    with pytest.raises(WebSocketDisconnect):
+        await manager.run(session_id, receive, handle)
+
+    assert worker_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_run_propagates_handle_errors():
+    """Test that an exception in handle() ends run() with that exception"""
+    # Arrange
+    manager = ConnectionManager()
+    session_id = await manager.connect(AsyncMock(spec=WebSocket), "receptionist")
+
+    async def handle(message):
+        raise RuntimeError("boom")
+
+    # Act & Assert
+    with pytest.raises(RuntimeError, match="boom"):
+        await manager.run(session_id, _scripted_receive("x"), handle)
+
+
+@pytest.mark.asyncio
+async def test_run_drops_sends_after_socket_failure():
+    """Test that a failed send closes the outbound queue instead of blocking senders"""
+    # Arrange
+    manager = ConnectionManager()
+    mock_websocket = AsyncMock(spec=WebSocket)
+    mock_websocket.send_text.side_effect = RuntimeError("socket closed")
+    session_id = await manager.connect(mock_websocket, "receptionist")
+
+    async def handle(message):
+        for i in range(3):
+            await manager.send_message(session_id, {"n": i})
+            await asyncio.sleep(0)
+        return False
+
+    # Act
+    await manager.run(session_id, _scripted_receive("go"), handle)
+
+    # Assert
+    mock_websocket.send_text.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_send_audio_uses_binary_frames_with_sequence():
+    """Test that send_audio() sends numbered AUDIO_RESPONSE frames to binary sessions"""
+    # Arrange
+    manager = ConnectionManager()
+    mock_websocket = AsyncMock(spec=WebSocket)
+    session_id = await manager.connect(mock_websocket, "receptionist", binary_audio=True)
+
+    # Act
+    await manager.send_audio(session_id, b"one")
+    await manager.send_audio(session_id, b"", is_final=True)
+
+    # Assert
+    frames = [decode_frame(c.args[0]) for c in mock_websocket.send_bytes.call_args_list]
+    assert [(f.type, f.payload, f.sequence, f.is_final) for f in frames] == [
+        (FrameType.AUDIO_RESPONSE, b"one", 0, False),
+        (FrameType.AUDIO_RESPONSE, b"", 1, True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_audio_falls_back_to_base64_json():
+    """Test that send_audio() sends base64 JSON to text sessions and skips empty markers"""
+    # Arrange
+    manager = ConnectionManager()
+    mock_websocket = AsyncMock(spec=WebSocket)
+    session_id = await manager.connect(mock_websocket, "receptionist")
+
+    # Act
+    await manager.send_audio(session_id, b"one")
+    await manager.send_audio(session_id, b"", is_final=True)
+
+    # Assert
+    assert _sent_json(mock_websocket) == [{
+        'type': 'audio_response',
+        'data': base64.b64encode(b"one").decode()
+    }]
+
+
+@pytest.mark.asyncio
+async def test_run_coalesces_queued_audio_and_status():
+    """Test that the writer merges queued audio chunks and drops superseded statuses"""
+    # Arrange
+    manager = ConnectionManager()
+    mock_websocket = AsyncMock(spec=WebSocket)
+    session_id = await manager.connect(mock_websocket, "receptionist", binary_audio=True)
+
+    async def handle(message):
+        await manager.send_message(session_id, {'type': 'status_update', 'status': 'processing'})
+        await manager.send_message(session_id, {'type': 'status_update', 'status': 'idle'})
+        for chunk in [b"a", b"b", b"c"]:
+            await manager.send_audio(session_id, chunk)
+        await manager.send_audio(session_id, b"", is_final=True)
+        return False
+
+    # Act
+    await manager.run(session_id, _scripted_receive("go"), handle)
+
+    # Assert
+    assert _sent_json(mock_websocket) == [{'type': 'status_update', 'status': 'idle'}]
+    frames = [decode_frame(c.args[0]) for c in mock_websocket.send_bytes.call_args_list]
+    assert [(f.payload, f.is_final) for f in frames] == [(b"abc", True)]
+
+
+@pytest.mark.asyncio
+async def test_flush_audio_drops_queued_audio_and_keeps_messages():
+    """Test that flush_audio() drops unsent audio and keeps other messages in order"""
+    # Arrange
+    manager = ConnectionManager()
+    mock_websocket = AsyncMock(spec=WebSocket)
+    session_id = await manager.connect(mock_websocket, "receptionist", binary_audio=True)
+    dropped = []
+
+    async def handle(message):
+        await manager.send_audio(session_id, b"old-1")
+        await manager.send_message(session_id, {'type': 'transcription', 'is_final': True})
+        await manager.send_audio(session_id, b"old-2")
+        dropped.append(manager.flush_audio(session_id))
+        await manager.send_message(session_id, {'type': 'flush_audio'})
+        return False
+
+    # Act
+    await manager.run(session_id, _scripted_receive("go"), handle)
+
+    # Assert
+    assert dropped == [2]
+    assert [m['type'] for m in _sent_json(mock_websocket)] == ['transcription', 'flush_audio']
+    mock_websocket.send_bytes.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_flush_audio_drops_audio_held_for_coalescing(monkeypatch):
+    """Test that audio the writer is holding is not sent after the flush"""
+    # Arrange
+    monkeypatch.setattr("app.websocket.manager.settings.WS_COALESCE_MS", 1000)
+    manager = ConnectionManager()
+    mock_websocket = AsyncMock(spec=WebSocket)
+    session_id = await manager.connect(mock_websocket, "receptionist", binary_audio=True)
+    sent = []
+    mock_websocket.send_text.side_effect = lambda text: sent.append(json.loads(text)['type'])
+    mock_websocket.send_bytes.side_effect = lambda data: sent.append(decode_frame(data).payload)
+
+    async def handle(message):
+        await manager.send_audio(session_id, b"old")
+        await asyncio.sleep(0.05)  # the writer takes it and waits for more audio
+
+        manager.flush_audio(session_id)
+        await manager.send_message(session_id, {'type': 'flush_audio'})
+        await manager.send_audio(session_id, b"new", is_final=True)
+        return False
+
+    # Act
+    await manager.run(session_id, _scripted_receive("go"), handle)
+
+    # Assert
+    assert sent == ['flush_audio', b"new"]
@@ -0,0 +1,82 @@
+import pytest
+from app.websocket.frames import (
+    FRAME_HEADER,
+    BinaryFrame,
+    FrameType,
+    decode_frame,
+    encode_frame,
+)
+
+
+def test_encode_decode_round_trip():
+    """Test that encoded frames decode back to the same values"""
+    # Arrange
+    payload = b"\x00\x01raw-audio\xff"
+
+    # Act
+    frame = decode_frame(encode_frame(FrameType.AUDIO_CHUNK, payload, sequence=42))
+
+    # Assert
+    assert frame == BinaryFrame(
+        type=FrameType.AUDIO_CHUNK,
+        sequence=42,
+        payload=payload,
+        is_final=False,
+    )
+
+
+def test_encode_sets_final_flag():
+    """Test that is_final is carried in the flags byte"""
+    # Arrange & Act
+    frame = decode_frame(encode_frame(FrameType.AUDIO_RESPONSE, b"", is_final=True))
+
+    # Assert
+    assert frame.type == FrameType.AUDIO_RESPONSE
+    assert frame.is_final is True
+    assert frame.payload == b""
+
+
+def test_encode_header_size():
+    """Test that the header adds a fixed 8 bytes"""
+    # Arrange & Act
+    data = encode_frame(FrameType.AUDIO_CHUNK, b"abcd")
+
+    # Assert
+    assert FRAME_HEADER.size == 8
+    assert len(data) == 12
+
+
+def test_encode_wraps_sequence():
+    """Test that sequence numbers wrap at 32 bits"""
+    # Arrange & Act
+    frame = decode_frame(encode_frame(FrameType.AUDIO_CHUNK, b"", sequence=2**32 + 5))
+
+    # Assert
+    assert frame.sequence == 5
+
+
+def test_decode_truncated_frame_raises_error():
+    """Test that truncated frames raise ValueError"""
+    # Act & Assert
+    with pytest.raises(ValueError, match="too short"):
+        decode_frame(b"\x01\x01")
+
+
+def test_decode_unknown_version_raises_error():
+    """Test that unknown versions raise ValueError"""
+    # Arrange
+    data = FRAME_HEADER.pack(99, FrameType.AUDIO_CHUNK, 0, 0)
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="Unsupported frame version"):
+        decode_frame(data)
+
+
+def test_decode_unknown_type_raises_error():
+    """Test that unknown frame types raise ValueError"""
+    # Arrange
+    data = FRAME_HEADER.pack(1, 77, 0, 0)
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="Unknown frame type"):
+        decode_frame(data)
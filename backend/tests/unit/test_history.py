@@ -0,0 +1,176 @@
+import pytest
+from unittest.mock import AsyncMock
+from app.services.history import (
+    MESSAGE_OVERHEAD_TOKENS,
+    HistoryManager,
+    count_tokens,
+    message_tokens,
+    select_window,
+)
+
+
+def _turns(count, words=1):
+    """Alternating user/assistant messages"""
+    return [
+        {'role': "user" if i % 2 == 0 else "assistant", 'content': " ".join([f"m{i}"] * words)}
+        for i in range(count)
+    ]
+
+
+def test_count_tokens_empty_and_growing():
+    """Test that count_tokens() is 0 for empty text and grows with length"""
+    # Act & Assert
+    assert count_tokens("") == 0
+    assert 0 < count_tokens("hello") < count_tokens("hello there, how are you today?")
+
+
+def test_count_tokens_is_cached():
+    """Test that repeated counts of the same text hit the cache"""
+    # Arrange
+    text = "a message only this test counts"
+    count_tokens(text)
+    hits = count_tokens.cache_info().hits
+
+    # Act
+    count_tokens(text)
+
+    # Assert
+    assert count_tokens.cache_info().hits == hits + 1
+
+
+def test_select_window_keeps_newest_within_budget():
+    """Test that select_window() keeps the newest messages that fit"""
+    # Arrange
+    history = _turns(6, words=20)
+    per_message = message_tokens(history[0])
+
+    # Act
+    window = select_window(history, max_tokens=per_message * 2 + 1)
+
+    # Assert
+    assert window == history[-2:]
+
+
+def test_select_window_caps_message_count():
+    """Test that select_window() honours max_messages"""
+    # Arrange
+    history = _turns(15)
+
+    # Act
+    window = select_window(history, max_tokens=10_000, max_messages=10)
+
+    # Assert
+    assert window == history[-10:]
+
+
+def test_select_window_keeps_leading_summary():
+    """Test that a leading system summary survives trimming"""
+    # Arrange
+    summary = {'role': 'system', 'content': 'Summary of the earlier conversation: hours'}
+    history = [summary, *_turns(6, words=20)]
+    budget = message_tokens(summary) + message_tokens(history[1])
+
+    # Act
+    window = select_window(history, max_tokens=budget, max_messages=10)
+
+    # Assert
+    assert window == [summary, history[-1]]
+
+
+def test_trim_evicts_oldest_past_max_tokens():
+    """Test that trim() evicts the oldest messages in place"""
+    # Arrange
+    history = _turns(6)
+    manager = HistoryManager(max_tokens=sum(message_tokens(m) for m in history[-4:]))
+
+    # Act
+    evicted = manager.trim(history)
+
+    # Assert
+    assert [m['content'] for m in evicted] == ["m0", "m1"]
+    assert [m['content'] for m in history] == ["m2", "m3", "m4", "m5"]
+
+
+def test_trim_keeps_newest_message():
+    """Test that trim() never evicts the newest message"""
+    # Arrange
+    history = _turns(2, words=50)
+    manager = HistoryManager(max_tokens=MESSAGE_OVERHEAD_TOKENS)
+
+    # Act
+    manager.trim(history)
+
+    # Assert
+    assert len(history) == 1
+    assert history[0]['role'] == "assistant"
+
+
+@pytest.mark.asyncio
+async def test_summarize_without_summarizer_keeps_summary():
+    """Test that summarize() is a no-op without a summarizer"""
+    # Act & Assert
+    assert await HistoryManager().summarize("so far", _turns(2)) == "so far"
+
+
+@pytest.mark.asyncio
+async def test_summarize_calls_summarizer():
+    """Test that summarize() passes the summary and evicted messages on"""
+    # Arrange
+    summarizer = AsyncMock(return_value="new summary")
+    evicted = _turns(2)
+
+    # Act
+    result = await HistoryManager(summarizer=summarizer).summarize("old", evicted)
+
+    # Assert
+    assert result == "new summary"
+    summarizer.assert_awaited_once_with("old", evicted)
+
+
+def test_prompt_history_puts_summary_first():
+    """Test that prompt_history() prepends the summary as a system message"""
+    # Arrange
+    history = _turns(2)
+
+    # Act & Assert
+    assert HistoryManager.prompt_history(history) is history
+    assert HistoryManager.prompt_history(history, "hours asked")[0] == {
+        'role': 'system',
+        'content': 'Summary of the earlier conversation: hours asked',
+    }
+
+
+def test_select_window_moves_start_in_blocks():
+    """Test that the window start stays put as history grows, then jumps a block"""
+    # Arrange
+    history = _turns(20)
+
+    # Act
+    starts = [
+        len(history[:n])
+        - len(select_window(history[:n], max_tokens=10_000, max_messages=10, block=6))
+        for n in range(10, 21, 2)
+    ]
+
+    # Assert
+    assert starts == [0, 6, 6, 6, 12, 12]
+
+
+def test_trim_evicts_whole_blocks():
+    """Test that trim() rounds eviction up to a block"""
+    # Arrange
+    history = _turns(8)
+    manager = HistoryManager(max_tokens=sum(message_tokens(m) for m in history[-7:]), block=4)
+
+    # Act
+    evicted = manager.trim(history)
+
+    # Assert
+    assert len(evicted) == 4
+    assert len(history) == 4
+
+
+def test_trim_empty_history():
+    """Test that trim() leaves an empty history alone"""
+    # Act & Assert
+    assert HistoryManager(block=4).trim([]) == []
@@ -0,0 +1,67 @@
+from collections import deque
+from app.services.latency_stats import LatencyStats, agent_latency, latency_summary, percentile
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles"""
+    # Arrange
+    samples = deque(float(i) for i in range(1, 101))
+
+    # Act & Assert
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile(samples, 100) == 100.0
+    assert percentile(deque(), 50) is None
+
+
+def test_summary_reports_milliseconds():
+    """Test that summary() reports counts and millisecond percentiles"""
+    # Arrange
+    stats = LatencyStats()
+    stats.record(0.5, ttft=0.1)
+    stats.record(0.7)
+    stats.record_error()
+
+    # Act
+    summary = stats.summary()
+
+    # Assert
+    assert summary['requests'] == 3
+    assert summary['errors'] == 1
+    assert summary['ttft_p50_ms'] == 100.0
+    assert summary['total_p95_ms'] == 700.0
+
+
+def test_summary_without_samples():
+    """Test that summary() reports None percentiles without samples"""
+    # Act
+    summary = LatencyStats().summary()
+
+    # Assert
+    assert summary['requests'] == 0
+    assert summary['ttft_p50_ms'] is None
+
+
+def test_window_bounds_samples():
+    """Test that only the most recent window samples are kept"""
+    # Arrange
+    stats = LatencyStats(window=2)
+
+    # Act
+    for total in (1.0, 2.0, 3.0):
+        stats.record(total)
+
+    # Assert
+    assert list(stats.total) == [2.0, 3.0]
+    assert stats.requests == 3
+
+
+def test_agent_latency_registry():
+    """Test that stats are created once per agent and summarized together"""
+    # Act
+    stats = agent_latency("test_registry_agent")
+    stats.record(0.2)
+
+    # Assert
+    assert agent_latency("test_registry_agent") is stats
+    assert latency_summary()["test_registry_agent"]['requests'] == 1
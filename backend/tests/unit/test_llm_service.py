@@ -1,6 +1,9 @@
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
-from app.services.llm_service import LLMService
+from app.agents.config import AgentConfig, get_agent_config
+from app.config import settings
+from app.services.latency_stats import agent_latency
+from app.services.llm_service import LLMService, ModelParams, PromptUsage
 
 
 @pytest.mark.asyncio
@@ -146,12 +149,13 @@ async def test_chat_limits_conversation_history():
         role = "user" if i % 2 == 0 else "assistant"
         long_history.append({"role": role, "content": f"Message {i}"})
 
-    # Act
-    await service.chat(
-        message="Current message",
-        agent_prompt="You are a helpful assistant.",
-        conversation_history=long_history
-    )
+    # Act (without block alignment the window is exactly the last 10)
+    with patch('app.services.llm_service.settings.HISTORY_WINDOW_BLOCK', 1):
+        await service.chat(
+            message="Current message",
+            agent_prompt="You are a helpful assistant.",
+            conversation_history=long_history
+        )
 
     # Assert
     call_args = mock_client.chat.completions.create.call_args
@@ -168,6 +172,122 @@ async def test_chat_limits_conversation_history():
     assert history_in_call[-1]["content"] == "Message 14"  # Last of the history
 
 
+@pytest.mark.asyncio
+async def test_chat_limits_history_to_token_budget():
+    """Test that chat() drops older history that does not fit the token budget"""
+    # Arrange
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+
+    mock_client = AsyncMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+    service = LLMService(client=mock_client)
+
+    long_history = [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i} " + "word " * 500}
+        for i in range(4)
+    ]
+
+    # Act
+    with patch('app.services.llm_service.settings.HISTORY_TOKEN_BUDGET', 1000):
+        await service.chat(
+            message="Current message",
+            agent_prompt="You are a helpful assistant.",
+            conversation_history=long_history
+        )
+
+    # Assert
+    messages = mock_client.chat.completions.create.call_args[1]['messages']
+    history_in_call = messages[1:-1]
+    assert 0 < len(history_in_call) < len(long_history)
+    assert history_in_call[-1] == long_history[-1]
+
+
+@pytest.mark.asyncio
+async def test_chat_keeps_prompt_prefix_stable_across_turns():
+    """Test that consecutive turns extend the previous prompt instead of sliding it"""
+    # Arrange
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+
+    mock_client = AsyncMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+    service = LLMService(client=mock_client)
+
+    history = [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i}"}
+        for i in range(14)
+    ]
+
+    # Act: two turns later the history has grown by two messages
+    prompts = []
+    for turn in range(2):
+        await service.chat(
+            message=f"Turn {turn}",
+            agent_prompt="You are a helpful assistant.",
+            conversation_history=history
+        )
+        prompts.append(mock_client.chat.completions.create.call_args[1]['messages'])
+        history = history + [
+            {"role": "user", "content": f"Turn {turn}"},
+            {"role": "assistant", "content": "ok"},
+        ]
+
+    # Assert: the second prompt starts with everything but the last message of the first
+    assert prompts[1][:len(prompts[0]) - 1] == prompts[0][:-1]
+
+
+@pytest.mark.asyncio
+async def test_chat_reports_cached_prompt_tokens():
+    """Test that chat() exposes the provider's cached token count"""
+    # Arrange
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="Hello!"))]
+    mock_response.usage = MagicMock(
+        prompt_tokens=1200,
+        completion_tokens=12,
+        prompt_tokens_details=MagicMock(cached_tokens=1024),
+    )
+
+    mock_client = AsyncMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+    service = LLMService(client=mock_client)
+
+    # Act
+    result = await service.chat(message="Hi", agent_prompt="You are a helpful assistant.")
+
+    # Assert
+    assert result == "Hello!"
+    assert result.usage == PromptUsage(prompt_tokens=1200, cached_tokens=1024, completion_tokens=12)
+    assert result.usage.cache_hit_ratio == pytest.approx(1024 / 1200)
+    assert service.last_usage == result.usage
+
+
+@pytest.mark.asyncio
+async def test_summarize_folds_evicted_messages():
+    """Test that summarize() sends the old summary and evicted messages"""
+    # Arrange
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content=" Caller asked about hours. "))]
+
+    mock_client = AsyncMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+    service = LLMService(client=mock_client)
+
+    # Act
+    result = await service.summarize("Caller is Ana.", [
+        {"role": "user", "content": "What are your hours?"},
+        {"role": "assistant", "content": "Nine to five."},
+    ])
+
+    # Assert
+    assert result == "Caller asked about hours."
+    prompt = mock_client.chat.completions.create.call_args[1]['messages'][1]['content']
+    assert "Caller is Ana." in prompt
+    assert "user: What are your hours?" in prompt
+    assert "assistant: Nine to five." in prompt
+
+
 @pytest.mark.asyncio
 async def test_chat_uses_correct_parameters():
     """Test that chat() uses correct model parameters"""
@@ -200,6 +320,81 @@ async def test_chat_uses_correct_parameters():
     assert call_args[1]['max_tokens'] == 150
 
 
+@pytest.mark.asyncio
+async def test_chat_uses_agent_model_parameters():
+    """Test that chat() sends the agent's model, temperature, max_tokens and stop"""
+    # Arrange
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+
+    mock_client = AsyncMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+    service = LLMService(client=mock_client)
+    params = ModelParams(model="gpt-4o", temperature=0.2, max_tokens=80, stop=["\n\n"])
+
+    # Act
+    await service.chat(message="Hi", agent_prompt="You are a test assistant.", params=params)
+
+    # Assert
+    call_args = mock_client.chat.completions.create.call_args
+    assert call_args[1]['model'] == "gpt-4o"
+    assert call_args[1]['temperature'] == 0.2
+    assert call_args[1]['max_tokens'] == 80
+    assert call_args[1]['stop'] == ["\n\n"]
+
+
+def test_model_params_for_agent_routes_fast_tier():
+    """Test that fast-tier agents use the fast model unless they name one"""
+    # Arrange
+    agent = AgentConfig(
+        id='fast_agent', name='Fast', description='Fast agent', prompt='Be quick',
+        voice_id='voice', temperature=0.4, max_tokens=60, stop=["."], latency_tier="fast"
+    )
+
+    # Act
+    params = ModelParams.for_agent(agent)
+    pinned = ModelParams.for_agent(AgentConfig(
+        id='pinned', name='Pinned', description='Pinned model', prompt='Be quick',
+        voice_id='voice', model="gpt-4o", latency_tier="fast"
+    ))
+
+    # Assert
+    assert params.request_kwargs() == {
+        'model': settings.OPENAI_FAST_MODEL,
+        'temperature': 0.4,
+        'max_tokens': 60,
+        'stop': ["."],
+    }
+    assert params.agent_id == 'fast_agent'
+    assert pinned.request_kwargs()['model'] == "gpt-4o"
+    kwargs = ModelParams.for_agent(get_agent_config('sales')).request_kwargs()
+    assert kwargs['model'] == settings.OPENAI_MODEL
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_records_agent_latency():
+    """Test that stream_chat() records time to first token for the agent"""
+    # Arrange
+    stream = FakeStream([_stream_chunk("Hi"), _stream_chunk(" there")])
+    mock_client = AsyncMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=stream)
+    service = LLMService(client=mock_client)
+    stats = agent_latency("latency_test_agent")
+
+    # Act
+    async for _ in service.stream_chat(
+        message="Hi",
+        agent_prompt="You are a test assistant.",
+        params=ModelParams(agent_id="latency_test_agent")
+    ):
+        pass
+
+    # Assert
+    assert stats.requests == 1
+    assert len(stats.ttft) == 1
+    assert stats.total[0] >= stats.ttft[0]
+
+
 @pytest.mark.asyncio
 async def test_chat_handles_api_error():
     """Test that chat() properly handles API errors"""
@@ -276,4 +471,133 @@ def test_llm_service_repr():
 
     # Act & Assert
     repr_str = repr(service)
-    assert "LLMService" in repr_str
\ No newline at end of file
+    assert "LLMService" in repr_str
+
+def _stream_chunk(content):
+    """Build a streaming chunk with a single delta"""
+    return MagicMock(choices=[MagicMock(delta=MagicMock(content=content))])
+
+
+class FakeStream:
+    """Minimal async stream matching the OpenAI streaming response"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_yields_deltas():
+    """Test that stream_chat() yields text deltas in order"""
+    # Arrange
+    stream = FakeStream([
+        _stream_chunk("Hello"),
+        _stream_chunk(None),
+        MagicMock(choices=[]),
+        _stream_chunk(" there!"),
+    ])
+
+    mock_client = AsyncMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=stream)
+
+    with patch('app.services.llm_service.AsyncOpenAI', return_value=mock_client):
+        service = LLMService()
+
+    # Act
+    deltas = [
+        delta async for delta in service.stream_chat(
+            message="Hi",
+            agent_prompt="You are a helpful assistant."
+        )
+    ]
+
+    # Assert
+    assert deltas == ["Hello", " there!"]
+    assert stream.closed
+    call_args = mock_client.chat.completions.create.call_args
+    assert call_args[1]['stream'] is True
+    assert call_args[1]['messages'][-1] == {"role": "user", "content": "Hi"}
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_records_usage_from_final_chunk():
+    """Test that stream_chat() requests usage and stores the cached token count"""
+    # Arrange
+    usage = MagicMock(
+        prompt_tokens=1100,
+        completion_tokens=3,
+        prompt_tokens_details=MagicMock(cached_tokens=1024),
+    )
+    stream = FakeStream([_stream_chunk("Hi"), MagicMock(choices=[], usage=usage)])
+
+    mock_client = AsyncMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=stream)
+    service = LLMService(client=mock_client)
+
+    # Act
+    deltas = [
+        delta async for delta in service.stream_chat(
+            message="Hi",
+            agent_prompt="You are a helpful assistant."
+        )
+    ]
+
+    # Assert
+    assert deltas == ["Hi"]
+    assert service.last_usage == PromptUsage(
+        prompt_tokens=1100, cached_tokens=1024, completion_tokens=3
+    )
+    call_args = mock_client.chat.completions.create.call_args
+    assert call_args[1]['stream_options'] == {"include_usage": True}
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_empty_message_raises_error():
+    """Test that stream_chat() rejects empty messages"""
+    # Arrange
+    with patch('app.services.llm_service.AsyncOpenAI'):
+        service = LLMService()
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="Message cannot be empty"):
+        async for delta in service.stream_chat(
+            message="",
+            agent_prompt="You are a helpful assistant."
+        ):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_closes_stream_on_early_exit():
+    """Test that stream_chat() closes the upstream stream when abandoned"""
+    # Arrange
+    stream = FakeStream([_stream_chunk("One"), _stream_chunk("Two")])
+
+    mock_client = AsyncMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=stream)
+
+    with patch('app.services.llm_service.AsyncOpenAI', return_value=mock_client):
+        service = LLMService()
+
+    # Act
+    tokens = service.stream_chat(
+        message="Hi",
+        agent_prompt="You are a helpful assistant."
+    )
+    await tokens.__anext__()
+    await tokens.aclose()
+
+    # Assert
+    assert stream.closed
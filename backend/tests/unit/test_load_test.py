@@ -0,0 +1,79 @@
+import wave
+import numpy as np
+from benchmarks.load_test import (
+    CallerResult, TurnTimings, build_report, chunked, load_audio, summarize
+)
+
+
+def test_summarize_reports_percentiles_in_ms():
+    """Test that latency samples become millisecond percentiles"""
+    # Act
+    summary = summarize([0.1, 0.2, 0.3, 0.4])
+
+    # Assert
+    assert summary == {
+        'count': 4, 'p50': 200.0, 'p95': 400.0, 'p99': 400.0, 'mean': 250.0, 'max': 400.0
+    }
+
+
+def test_summarize_without_samples():
+    """Test that an empty stage reports None percentiles"""
+    # Act
+    summary = summarize([])
+
+    # Assert
+    assert summary['count'] == 0
+    assert summary['p50'] is None and summary['mean'] is None
+
+
+def test_build_report_collects_stages_and_errors():
+    """Test that every caller and turn contributes to the report"""
+    # Arrange
+    results = [
+        CallerResult(connect=0.01, turns=[TurnTimings(0.5, 0.9, 1.5), TurnTimings(0.6, None, 1.6)]),
+        CallerResult(error="TimeoutError: "),
+    ]
+
+    # Act
+    report = build_report(results)
+
+    # Assert
+    assert report['sessions'] == 2
+    assert report['completed'] == 1
+    assert report['turns'] == 2
+    assert report['errors'] == ["TimeoutError: "]
+    assert report['latency_ms']['first_transcript']['count'] == 2
+    assert report['latency_ms']['first_audio']['count'] == 1
+
+
+def test_load_audio_converts_recording(tmp_path):
+    """Test that a stereo 8 kHz recording becomes 16 kHz mono PCM"""
+    # Arrange
+    path = tmp_path / "caller.wav"
+    with wave.open(str(path), "wb") as recording:
+        recording.setnchannels(2)
+        recording.setsampwidth(2)
+        recording.setframerate(8000)
+        recording.writeframes(np.zeros(8000 * 2, dtype="<i2").tobytes())
+
+    # Act
+    pcm = load_audio(str(path))
+
+    # Assert
+    assert len(pcm) == 16000 * 2
+
+
+def test_load_audio_defaults_to_synthetic_speech():
+    """Test that a synthetic utterance is used without a recording"""
+    # Act & Assert
+    assert len(load_audio(None)) > 0
+
+
+def test_chunked_splits_by_duration():
+    """Test that PCM is cut into chunk_ms frames"""
+    # Act
+    chunks = chunked(bytes(16000 * 2), chunk_ms=20)
+
+    # Assert
+    assert len(chunks) == 50
+    assert all(len(c) == 640 for c in chunks)
@@ -0,0 +1,182 @@
+import pytest
+import asyncio
+import numpy as np
+from app.services.audio_workers import AudioWorkerPool
+from app.services.latency_stats import agent_latency
+from app.services.llm_service import ModelParams
+from app.services.local_providers import (
+    LatencyDistribution, LocalLLMService, LocalProviders, LocalSTTService,
+    LocalTTSService, ThroughputLimit, split_tokens, synthetic_speech
+)
+from app.services.stt_preprocessor import STTPreprocessor
+
+
+def _speech(ms=300):
+    t = np.arange(16000 * ms // 1000) / 16000
+    return (np.sin(2 * np.pi * 440 * t) * 16000).astype("<i2")
+
+
+def test_fixed_latency():
+    """Test that a fixed distribution always returns its mean"""
+    # Act & Assert
+    assert LatencyDistribution(mean_ms=250, jitter_ms=50, kind="fixed").sample() == 0.25
+    assert LatencyDistribution().sample() == 0.0
+
+
+@pytest.mark.parametrize("kind", ["uniform", "normal", "lognormal"])
+def test_latency_is_seeded(kind):
+    """Test that the same seed repeats the same samples, around the mean"""
+    # Arrange
+    a = LatencyDistribution(mean_ms=200, jitter_ms=50, kind=kind, seed=7)
+    b = LatencyDistribution(mean_ms=200, jitter_ms=50, kind=kind, seed=7)
+
+    # Act
+    samples = [a.sample() for _ in range(2000)]
+
+    # Assert
+    assert samples[:20] == [b.sample() for _ in range(20)]
+    assert min(samples) >= 0
+    assert 0.18 < sum(samples) / len(samples) < 0.22
+
+
+def test_latency_rejects_unknown_distribution():
+    """Test that an unknown distribution name is rejected"""
+    # Act & Assert
+    with pytest.raises(ValueError):
+        LatencyDistribution(kind="pareto")
+
+
+@pytest.mark.asyncio
+async def test_throughput_limit_caps_concurrency():
+    """Test that requests over max_concurrent wait for a slot"""
+    # Arrange
+    limit = ThroughputLimit(max_concurrent=2)
+
+    async def request():
+        async with limit.slot():
+            await asyncio.sleep(0.01)
+
+    # Act
+    await asyncio.gather(*(request() for _ in range(6)))
+
+    # Assert
+    assert limit.peak == 2
+    assert limit.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_local_stt_cycles_transcripts():
+    """Test that transcripts are returned in turn and silence skips the request"""
+    # Arrange
+    stt = LocalSTTService(["one", "two"], LatencyDistribution())
+
+    # Act
+    results = [await stt.transcribe_pcm(_speech(), 16000) for _ in range(3)]
+    silent = await stt.transcribe_pcm(np.zeros(1600, dtype=np.int16), 16000)
+
+    # Assert
+    assert results == ["one", "two", "one"]
+    assert silent == ""
+    assert stt.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_local_stt_runs_preprocessor_in_pool():
+    """Test that PCM is conditioned in the worker pool and encoded before the fake upload"""
+    # Arrange
+    pool = AudioWorkerPool(cpu_workers=1, io_workers=1, max_pending=2, queue_timeout=5.0)
+    stt = LocalSTTService(["one"], LatencyDistribution(), preprocessor=STTPreprocessor(pool=pool))
+    stereo = np.repeat(_speech(), 2)  # 16 kHz stereo, 300 ms
+
+    # Act
+    try:
+        result = await stt.transcribe_pcm(stereo, 16000, channels=2)
+    finally:
+        pool.shutdown()
+
+    # Assert
+    assert result == "one"
+    assert pool.completed == 1
+    assert stt.bytes_uploaded == 44 + len(_speech()) * 2  # mono 16-bit WAV
+
+
+@pytest.mark.asyncio
+async def test_local_stt_rejects_empty_audio():
+    """Test that empty encoded audio is rejected like STTService"""
+    # Act & Assert
+    with pytest.raises(ValueError):
+        await LocalSTTService(["one"], LatencyDistribution()).transcribe(b"")
+
+
+@pytest.mark.asyncio
+async def test_local_llm_streams_canned_response():
+    """Test that the canned response streams as word deltas and is recorded"""
+    # Arrange
+    llm = LocalLLMService("We open at nine.", LatencyDistribution())
+    params = ModelParams(agent_id="local-test")
+
+    # Act
+    tokens = [t async for t in llm.stream_chat("Hours?", "You are helpful.", params=params)]
+
+    # Assert
+    assert tokens == ["We", " open", " at", " nine."]
+    assert llm.last_usage.completion_tokens == 4
+    assert llm.last_usage.prompt_tokens > 0
+    assert agent_latency("local-test").requests == 1
+
+
+@pytest.mark.asyncio
+async def test_local_llm_validates_input():
+    """Test that prompts are validated like LLMService"""
+    # Act & Assert
+    with pytest.raises(ValueError):
+        await LocalLLMService("Hi", LatencyDistribution()).chat("", "You are helpful.")
+
+
+def test_split_tokens_round_trips():
+    """Test that deltas join back to the original text"""
+    # Act & Assert
+    assert "".join(split_tokens("  Hello there,  world ")) == "  Hello there,  world"
+
+
+def test_synthetic_speech():
+    """Test that synthetic audio is deterministic and scales with the text"""
+    # Act & Assert
+    assert synthetic_speech("Hello there") == synthetic_speech("Hello there")
+    assert len(synthetic_speech("one two three four")) > len(synthetic_speech("one"))
+
+
+@pytest.mark.asyncio
+async def test_local_tts_streams_synthetic_audio():
+    """Test that synthetic audio is streamed in chunks"""
+    # Arrange
+    tts = LocalTTSService(LatencyDistribution())
+
+    # Act
+    chunks = [c async for c in tts.synthesize_stream("Hello there, how are you?", "voice")]
+
+    # Assert
+    assert len(chunks) > 1
+    assert b"".join(chunks) == synthetic_speech("Hello there, how are you?")
+
+    with pytest.raises(ValueError):
+        [c async for c in tts.synthesize_stream(" ", "voice")]
+
+
+def test_local_providers_share_limits():
+    """Test that every session's services share the process-wide limits"""
+    # Arrange
+    providers = LocalProviders(
+        LatencyDistribution(), LatencyDistribution(), LatencyDistribution(), max_concurrent=4
+    )
+
+    # Act
+    stt1, llm1, tts1 = providers.create_services()
+    stt2, llm2, tts2 = providers.create_services()
+
+    # Assert
+    assert stt1 is not stt2
+    assert stt1.limit is stt2.limit
+    assert llm1.limit is llm2.limit
+    assert tts1.limit is tts2.limit
+    assert tts1.limit.max_concurrent == 4
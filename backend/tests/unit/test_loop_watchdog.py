@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import pytest
+import time
+from app.services.loop_watchdog import LoopWatchdog, parse_task_name
+from app.services.metrics import LOOP_STALLS
+
+
+def test_parse_turn_task_name():
+    """Test that turn tasks are split into session and turn id"""
+    assert parse_task_name("turn:abc-123:4") == ("turn", "abc-123", "4")
+
+
+def test_parse_session_task_name():
+    """Test that per-session tasks carry the session id"""
+    assert parse_task_name("writer:abc-123") == ("writer", "abc-123", None)
+    assert parse_task_name("tracer") == ("tracer", None, None)
+
+
+def test_parse_unknown_task_name():
+    """Test that unnamed tasks and plain callbacks are told apart"""
+    assert parse_task_name("Task-17") == ("other", None, None)
+    assert parse_task_name(None) == ("callback", None, None)
+
+
+def _block(seconds):
+    time.sleep(seconds)
+
+
+async def _blocking_turn():
+    _block(0.3)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_reports_blocking_task(caplog):
+    """Test that a blocked loop is attributed to the running task with a stack sample"""
+    # Arrange
+    watchdog = LoopWatchdog(threshold=0.05, interval=0.01)
+    stalls_before = sum(LOOP_STALLS.labels("turn").counts)
+    watchdog.start()
+    await asyncio.sleep(0.05)
+
+    # Act
+    with caplog.at_level(logging.WARNING, logger="app.services.loop_watchdog"):
+        await asyncio.create_task(_blocking_turn(), name="turn:s1:3")
+        await asyncio.sleep(0.1)
+    watchdog.stop()
+
+    # Assert
+    report = watchdog.reports[-1]
+    assert (report.kind, report.session_id, report.turn_id) == ("turn", "s1", "3")
+    assert report.blocked_ms >= 250
+    assert "_block" in report.stack
+    assert sum(LOOP_STALLS.labels("turn").counts) == stalls_before + 1
+    assert "session s1, turn 3" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_watchdog_quiet_when_loop_is_responsive():
+    """Test that short callbacks are not reported"""
+    # Arrange
+    watchdog = LoopWatchdog(threshold=0.2, interval=0.01)
+    watchdog.start()
+
+    # Act
+    for _ in range(10):
+        _block(0.005)
+        await asyncio.sleep(0.01)
+    watchdog.stop()
+
+    # Assert
+    assert len(watchdog.reports) == 0
@@ -0,0 +1,144 @@
+import asyncio
+import pytest
+import time
+from unittest.mock import MagicMock
+from app.services.metrics import (
+    LOOP_LAG, UPSTREAM_ERRORS, UPSTREAM_LATENCY, Counter, Gauge, Histogram, LoopLagMonitor,
+    MetricsRegistry, REGISTRY, observe_upstream, register_session_metrics
+)
+from app.websocket.manager import manager as real_manager
+
+
+def test_counter_renders_total_samples():
+    """Test that counters render one _total sample per label combination"""
+    # Arrange
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("test_messages", "Messages", ["direction"]))
+
+    # Act
+    counter.labels("in").inc()
+    counter.labels(direction="in").inc(2)
+    counter.labels("out").inc(0.5)
+    text = registry.render()
+
+    # Assert
+    assert "# TYPE test_messages counter" in text
+    assert 'test_messages_total{direction="in"} 3' in text
+    assert 'test_messages_total{direction="out"} 0.5' in text
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that histogram buckets are cumulative and end with +Inf"""
+    # Arrange
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("test_latency", "Latency", buckets=(0.1, 1.0)))
+
+    # Act
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    text = registry.render()
+
+    # Assert
+    assert 'test_latency_bucket{le="0.1"} 2' in text
+    assert 'test_latency_bucket{le="1"} 3' in text
+    assert 'test_latency_bucket{le="+Inf"} 4' in text
+    assert "test_latency_count 4" in text
+    assert "test_latency_sum 3.65" in text
+
+
+def test_gauge_function_is_read_at_scrape_time():
+    """Test that a function gauge reflects the value when rendered"""
+    # Arrange
+    registry = MetricsRegistry()
+    gauge = registry.register(Gauge("test_depth", "Depth", ["queue"]))
+    depths = {("inbound",): 1}
+    gauge.set_function(lambda: depths)
+
+    # Act
+    depths[("inbound",)] = 7
+    text = registry.render()
+
+    # Assert
+    assert 'test_depth{queue="inbound"} 7' in text
+
+
+def test_labels_are_escaped():
+    """Test that quotes and backslashes in label values are escaped"""
+    # Arrange
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("test_escaped", "Escaped", ["name"]))
+
+    # Act
+    counter.labels('a "b" \\c').inc()
+
+    # Assert
+    assert 'test_escaped_total{name="a \\"b\\" \\\\c"} 1' in registry.render()
+
+
+def test_duplicate_registration_rejected():
+    """Test that a metric name can only be registered once"""
+    registry = MetricsRegistry()
+    registry.register(Counter("test_once", "Once"))
+
+    with pytest.raises(ValueError):
+        registry.register(Counter("test_once", "Again"))
+
+
+def test_observe_upstream_records_latency_and_errors():
+    """Test that completed requests are timed and failed requests counted"""
+    # Arrange
+    latency = UPSTREAM_LATENCY.labels("unit", "ok")
+    errors = UPSTREAM_ERRORS.labels("unit", "fail")
+
+    # Act
+    with observe_upstream("unit", "ok"):
+        pass
+    with pytest.raises(RuntimeError):
+        with observe_upstream("unit", "fail"):
+            raise RuntimeError("upstream down")
+
+    # Assert
+    assert sum(latency.counts) == 1
+    assert errors.value == 1
+    assert sum(UPSTREAM_LATENCY.labels("unit", "fail").counts) == 0
+
+
+def test_session_metrics_read_from_manager():
+    """Test that active sessions and summed queue depths come from the manager"""
+    # Arrange
+    manager = MagicMock()
+    manager.active_connections = {"a": object(), "b": object()}
+    manager.channels = {"a": object(), "b": object()}
+    manager.queue_depths = lambda sid: {"a": (1, 4), "b": (2, 6)}[sid]
+
+    # Act
+    register_session_metrics(manager)
+    try:
+        text = REGISTRY.render()
+    finally:
+        register_session_metrics(real_manager)
+
+    # Assert
+    assert "voice_agent_active_sessions 2" in text
+    assert 'voice_agent_queue_depth{queue="inbound"} 3' in text
+    assert 'voice_agent_queue_depth{queue="outbound"} 10' in text
+    assert 'voice_agent_queue_depth_max{queue="outbound"} 6' in text
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_measures_blocking():
+    """Test that blocking the event loop shows up as lag"""
+    # Arrange
+    monitor = LoopLagMonitor(interval=0.01)
+    lag_before = LOOP_LAG.labels().sum
+    monitor.start()
+    await asyncio.sleep(0.015)
+
+    # Act
+    time.sleep(0.1)  # block the loop
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+
+    # Assert
+    assert LOOP_LAG.labels().sum - lag_before >= 0.05
+    assert monitor._task is None
@@ -0,0 +1,85 @@
+from app.websocket.outbound import coalesce, wants_more
+
+
+def _audio(chunk, is_final=False):
+    return ("audio", (chunk, is_final))
+
+
+def _status(status):
+    return ("json", {"type": "status_update", "status": status})
+
+
+def test_coalesce_merges_adjacent_audio():
+    """Test that adjacent audio chunks become one frame"""
+    # Act
+    result = coalesce([_audio(b"aa"), _audio(b"bb"), _audio(b"", True)], frame_bytes=100)
+
+    # Assert
+    assert result == [_audio(b"aabb", True)]
+
+
+def test_coalesce_respects_frame_bytes():
+    """Test that merged frames do not exceed frame_bytes"""
+    # Act
+    result = coalesce([_audio(b"aaa"), _audio(b"bbb"), _audio(b"ccc")], frame_bytes=6)
+
+    # Assert
+    assert result == [_audio(b"aaabbb"), _audio(b"ccc")]
+
+
+def test_coalesce_does_not_merge_across_messages():
+    """Test that other messages split audio runs and keep their position"""
+    # Arrange
+    text = ("json", {"type": "llm_response", "text": "Hi"})
+
+    # Act
+    result = coalesce([_audio(b"aa"), text, _audio(b"bb")], frame_bytes=100)
+
+    # Assert
+    assert result == [_audio(b"aa"), text, _audio(b"bb")]
+
+
+def test_coalesce_does_not_merge_past_final():
+    """Test that a final chunk closes its frame"""
+    # Act
+    result = coalesce([_audio(b"aa", True), _audio(b"bb")], frame_bytes=100)
+
+    # Assert
+    assert result == [_audio(b"aa", True), _audio(b"bb")]
+
+
+def test_coalesce_keeps_only_last_status():
+    """Test that superseded status updates are dropped"""
+    # Arrange
+    transcription = ("json", {"type": "transcription", "text": "Hi"})
+
+    # Act
+    result = coalesce(
+        [_status("processing"), transcription, _status("generating_audio")],
+        frame_bytes=100
+    )
+
+    # Assert
+    assert result == [transcription, _status("generating_audio")]
+
+
+def test_coalesce_drops_superseded_partial_transcriptions():
+    """Test that only the newest partial transcription, and every final one, is sent"""
+    # Arrange
+    first = ("json", {"type": "transcription", "text": "What", "is_final": False})
+    second = ("json", {"type": "transcription", "text": "What are", "is_final": False})
+    final = ("json", {"type": "transcription", "text": "What are your hours?", "is_final": True})
+
+    # Act & Assert
+    assert coalesce([first, second], frame_bytes=100) == [second]
+    assert coalesce([first, _audio(b"aa"), final], frame_bytes=100) == [_audio(b"aa"), final]
+
+
+def test_wants_more_for_short_open_audio_run():
+    """Test that the writer waits only for short, unfinished audio runs"""
+    # Act & Assert
+    assert wants_more([_audio(b"aa")], frame_bytes=100)
+    assert not wants_more([_audio(b"a" * 100)], frame_bytes=100)
+    assert not wants_more([_audio(b"aa", True)], frame_bytes=100)
+    assert not wants_more([_status("idle")], frame_bytes=100)
+    assert not wants_more([], frame_bytes=100)
@@ -0,0 +1,83 @@
+import pytest
+import json
+from unittest.mock import patch
+from pydantic import ValidationError
+from app.websocket import serialization
+from app.websocket.serialization import (
+    JSONSerializer,
+    OrjsonSerializer,
+    create_serializer,
+    parse_message,
+)
+from app.websocket.types import MessageType
+
+requires_orjson = pytest.mark.skipif(serialization.orjson is None, reason="orjson not installed")
+
+
+@requires_orjson
+def test_create_serializer_auto_prefers_orjson():
+    """Test that "auto" picks orjson when it is installed"""
+    # Act & Assert
+    assert isinstance(create_serializer("auto"), OrjsonSerializer)
+
+
+def test_create_serializer_stdlib():
+    """Test that "stdlib" forces the standard library encoder"""
+    # Act
+    serializer = create_serializer("stdlib")
+
+    # Assert
+    assert type(serializer) is JSONSerializer
+
+
+def test_create_serializer_falls_back_without_orjson():
+    """Test that a missing orjson falls back to the standard library"""
+    # Arrange
+    with patch('app.websocket.serialization.orjson', None):
+        # Act
+        serializer = create_serializer("orjson")
+
+    # Assert
+    assert type(serializer) is JSONSerializer
+
+
+@pytest.mark.parametrize("serializer", [
+    JSONSerializer(),
+    pytest.param(OrjsonSerializer(), marks=requires_orjson),
+])
+def test_serializers_produce_equivalent_json(serializer):
+    """Test that both encoders emit the same compact JSON"""
+    # Arrange
+    message = {'type': MessageType.LLM_RESPONSE, 'text': 'Café – ok', 'is_final': True}
+
+    # Act
+    text = serializer.dumps(message)
+
+    # Assert
+    assert json.loads(text) == {'type': 'llm_response', 'text': 'Café – ok', 'is_final': True}
+    assert text == '{"type":"llm_response","text":"Café – ok","is_final":true}'
+
+
+def test_parse_message_validates_raw_text():
+    """Test that parse_message() validates JSON text directly"""
+    # Act
+    message = parse_message('{"type": "audio_chunk", "data": "AAA=", "is_final": true}')
+
+    # Assert
+    assert message.type == MessageType.AUDIO_CHUNK
+    assert message.data == "AAA="
+    assert message.is_final is True
+
+
+def test_parse_message_rejects_malformed_json():
+    """Test that malformed JSON raises ValidationError"""
+    # Act & Assert
+    with pytest.raises(ValidationError):
+        parse_message('{"type": ')
+
+
+def test_parse_message_rejects_unknown_type():
+    """Test that unknown message types raise ValidationError"""
+    # Act & Assert
+    with pytest.raises(ValidationError):
+        parse_message('{"type": "bogus"}')
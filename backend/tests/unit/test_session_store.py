@@ -0,0 +1,220 @@
+import pytest
+from datetime import datetime, timezone
+from app.websocket.session_store import (
+    InMemorySessionStore,
+    RedisSessionStore,
+    SessionRecord,
+    create_session_store,
+)
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio.Redis (decode_responses=True) for RedisSessionStore"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.lists = {}
+        self.ttls = {}
+        self.closed = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.lists.pop(key, None)
+            self.ttls.pop(key, None)
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = str(int(fields.get(field, 0)) + amount)
+
+    async def ltrim(self, key, start, end):
+        values = self.lists.get(key, [])
+        self.lists[key] = values[start:] if end == -1 else values[start:end + 1]
+
+    async def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    async def lrange(self, key, start, end):
+        values = self.lists.get(key, [])
+        return values[start:] if end == -1 else values[start:end + 1]
+
+    async def expire(self, key, seconds):
+        if key in self.hashes or key in self.lists:
+            self.ttls[key] = seconds
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def buffer(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return buffer
+
+    async def execute(self):
+        results = [
+            await getattr(self.client, name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+        self.commands = []
+        return results
+
+
+def _record(**kwargs):
+    return SessionRecord(
+        agent_id="receptionist",
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        **kwargs
+    )
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    if request.param == "memory":
+        return InMemorySessionStore()
+    return RedisSessionStore(FakeRedis(), prefix="test:")
+
+
+@pytest.mark.asyncio
+async def test_store_round_trips_record(store):
+    """Test that a created session loads back unchanged"""
+    # Arrange
+    record = _record(message_count=2, history=[{'role': 'user', 'content': 'hi'}])
+
+    # Act
+    await store.create("s1", record)
+    loaded = await store.load("s1")
+
+    # Assert
+    assert loaded == record
+
+
+@pytest.mark.asyncio
+async def test_store_appends_history_and_counts_turns(store):
+    """Test that append_history() extends history and message_count"""
+    # Arrange
+    await store.create("s1", _record())
+
+    # Act
+    await store.append_history("s1", [{'role': 'assistant', 'content': 'Hello'}])
+    await store.append_history("s1", [
+        {'role': 'user', 'content': 'hi'},
+        {'role': 'assistant', 'content': 'How can I help?'},
+    ], turns=1)
+    loaded = await store.load("s1")
+
+    # Assert
+    assert [m['content'] for m in loaded.history] == ['Hello', 'hi', 'How can I help?']
+    assert loaded.message_count == 1
+
+
+@pytest.mark.asyncio
+async def test_store_trims_history_and_keeps_summary(store):
+    """Test that keep trims to the newest messages and the summary is stored"""
+    # Arrange
+    await store.create("s1", _record(history=[{'role': 'user', 'content': 'old'}]))
+
+    # Act
+    await store.append_history("s1", [
+        {'role': 'user', 'content': 'hi'},
+        {'role': 'assistant', 'content': 'Hello'},
+    ], turns=1, keep=2)
+    await store.set_summary("s1", "Caller said something old.")
+    loaded = await store.load("s1")
+
+    # Assert
+    assert [m['content'] for m in loaded.history] == ['hi', 'Hello']
+    assert loaded.summary == "Caller said something old."
+
+
+@pytest.mark.asyncio
+async def test_store_returns_none_for_unknown_or_deleted(store):
+    """Test that unknown and deleted sessions load as None"""
+    # Arrange
+    await store.create("s1", _record())
+
+    # Act
+    await store.delete("s1")
+
+    # Assert
+    assert await store.load("s1") is None
+    assert await store.load("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_store_returns_copies():
+    """Test that mutating a loaded record does not change the store"""
+    # Arrange
+    store = InMemorySessionStore()
+    await store.create("s1", _record())
+
+    # Act
+    (await store.load("s1")).history.append({'role': 'user', 'content': 'x'})
+
+    # Assert
+    assert (await store.load("s1")).history == []
+
+
+@pytest.mark.asyncio
+async def test_memory_store_expires_sessions():
+    """Test that sessions expire ttl seconds after the last write"""
+    # Arrange
+    store = InMemorySessionStore(ttl=0)
+
+    # Act
+    await store.create("s1", _record())
+
+    # Assert
+    assert await store.load("s1") is None
+    assert len(store) == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_store_sets_ttl_and_closes():
+    """Test that Redis keys get the TTL and close() closes the client"""
+    # Arrange
+    client = FakeRedis()
+    store = RedisSessionStore(client, prefix="test:", ttl=60)
+
+    # Act
+    await store.create("s1", _record())
+    await store.append_history("s1", [{'role': 'user', 'content': 'hi'}])
+    await store.close()
+
+    # Assert
+    assert client.ttls == {"test:s1:meta": 60, "test:s1:history": 60}
+    assert client.closed
+
+
+def test_create_session_store_defaults_to_memory():
+    """Test that the default backend is in-memory"""
+    # Act & Assert
+    assert isinstance(create_session_store(), InMemorySessionStore)
+
+
+def test_create_session_store_rejects_unknown_backend():
+    """Test that an unknown backend raises ValueError"""
+    # Act & Assert
+    with pytest.raises(ValueError):
+        create_session_store("memcached")
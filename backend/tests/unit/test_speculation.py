@@ -0,0 +1,116 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock
+from app.services.speculation import Speculation, normalize_transcript, transcripts_match
+
+
+def _generate(tokens, gate=None):
+    async def generate(transcript):
+        for token in tokens:
+            if gate is not None:
+                await gate.wait()
+            yield token
+    return generate
+
+
+def test_normalize_transcript():
+    """Test that case, punctuation and spacing are ignored"""
+    # Act & Assert
+    assert normalize_transcript("  What are your HOURS?! ") == "what are your hours"
+
+
+def test_transcripts_match():
+    """Test matching of close, different and empty transcripts"""
+    # Act & Assert
+    assert transcripts_match("What are your hours", "What are your hours?")
+    assert transcripts_match("what are your hours", "what are you hours", threshold=0.9)
+    assert not transcripts_match("What are your hours", "Can I book an appointment?")
+    assert not transcripts_match("", "")
+
+
+@pytest.mark.asyncio
+async def test_speculation_commits_buffered_and_live_tokens():
+    """Test that committed tokens include those buffered before and after the commit"""
+    # Arrange
+    gate = asyncio.Event()
+    speculation = Speculation(
+        transcribe=AsyncMock(return_value="What are your hours?"),
+        generate=_generate(["We open", " at nine."], gate),
+    )
+
+    # Act
+    assert await speculation.matches("what are your hours")
+    gate.set()
+    tokens = [token async for token in speculation.tokens()]
+
+    # Assert
+    assert tokens == ["We open", " at nine."]
+    assert speculation.done
+
+
+@pytest.mark.asyncio
+async def test_speculation_does_not_match_different_transcript():
+    """Test that a different final transcript does not match"""
+    # Arrange
+    speculation = Speculation(
+        transcribe=AsyncMock(return_value="What are your hours?"),
+        generate=_generate(["We open at nine."]),
+    )
+
+    # Act & Assert
+    assert not await speculation.matches("Can I speak to a doctor?")
+    await speculation.cancel()
+
+
+@pytest.mark.asyncio
+async def test_speculation_cancel_closes_llm_stream():
+    """Test that cancel() aborts the speculative LLM stream"""
+    # Arrange
+    closed = asyncio.Event()
+
+    async def generate(transcript):
+        try:
+            yield "We open"
+            await asyncio.Event().wait()
+        finally:
+            closed.set()
+
+    speculation = Speculation(transcribe=AsyncMock(return_value="Hours?"), generate=generate)
+    await speculation.matches("Hours?")
+    await asyncio.sleep(0)
+
+    # Act
+    await speculation.cancel()
+
+    # Assert
+    assert closed.is_set()
+    assert speculation.done
+
+
+@pytest.mark.asyncio
+async def test_speculation_failed_transcription_does_not_match():
+    """Test that a failed speculative STT call never matches"""
+    # Arrange
+    speculation = Speculation(
+        transcribe=AsyncMock(side_effect=RuntimeError("STT down")),
+        generate=_generate(["unused"]),
+    )
+
+    # Act & Assert
+    assert not await speculation.matches("Hours?")
+
+
+@pytest.mark.asyncio
+async def test_speculation_reraises_llm_error_on_commit():
+    """Test that an LLM error surfaces to the turn that commits"""
+    # Arrange
+    async def generate(transcript):
+        yield "We"
+        raise RuntimeError("LLM down")
+
+    speculation = Speculation(transcribe=AsyncMock(return_value="Hours?"), generate=generate)
+
+    # Act & Assert
+    with pytest.raises(RuntimeError, match="LLM down"):
+        async for _ in speculation.tokens():
+            pass
@@ -0,0 +1,223 @@
+import pytest
+import asyncio
+from app.services.speech_pipeline import (
+    SentenceSegmenter,
+    segment_stream,
+    stream_tts_immediately,
+)
+
+
+async def _tokens(*parts):
+    for part in parts:
+        yield part
+
+
+class FakeTTSService:
+    """Records synthesized segments and yields one chunk per segment"""
+
+    def __init__(self):
+        self.segments = []
+
+    async def synthesize_stream(self, text, voice_id):
+        self.segments.append(text)
+        yield f"audio:{text}".encode()
+
+
+def test_segmenter_emits_sentence_after_whitespace():
+    """Test that a sentence is emitted once its trailing whitespace arrives"""
+    # Arrange
+    segmenter = SentenceSegmenter()
+
+    # Act
+    first = segmenter.feed("Hello there.")
+    second = segmenter.feed(" How")
+
+    # Assert
+    assert first == []
+    assert second == ["Hello there."]
+    assert segmenter.flush() == "How"
+
+
+def test_segmenter_does_not_split_decimals():
+    """Test that decimals are not treated as sentence boundaries"""
+    # Arrange
+    segmenter = SentenceSegmenter()
+
+    # Act
+    segments = segmenter.feed("It costs 3.50 dollars. ")
+
+    # Assert
+    assert segments == ["It costs 3.50 dollars."]
+
+
+def test_segmenter_splits_long_sentence_at_clause():
+    """Test that long sentences are split at clause boundaries"""
+    # Arrange
+    segmenter = SentenceSegmenter(min_clause_chars=20)
+
+    # Act
+    short = segmenter.feed("Sure, ")
+    long = segmenter.feed("I can book that appointment for you, just a moment")
+
+    # Assert
+    assert short == []
+    assert long == ["Sure, I can book that appointment for you,"]
+    assert segmenter.flush() == "just a moment"
+
+
+def test_segmenter_forces_split_at_max_chars():
+    """Test that text without punctuation is cut at a word boundary"""
+    # Arrange
+    segmenter = SentenceSegmenter(max_chars=20)
+
+    # Act
+    segments = segmenter.feed("one two three four five six")
+
+    # Assert
+    assert segments == ["one two three four"]
+    assert segmenter.flush() == "five six"
+
+
+def test_segmenter_flush_empty_returns_none():
+    """Test that flush() returns None when nothing is pending"""
+    # Arrange
+    segmenter = SentenceSegmenter()
+
+    # Act & Assert
+    assert segmenter.flush() is None
+
+
+@pytest.mark.asyncio
+async def test_segment_stream_yields_segments_and_tail():
+    """Test that segment_stream() yields sentences and the trailing text"""
+    # Arrange
+    tokens = _tokens("Hi", "! I'm", " here", ". Ask", " away")
+
+    # Act
+    segments = [segment async for segment in segment_stream(tokens)]
+
+    # Assert
+    assert segments == ["Hi!", "I'm here.", "Ask away"]
+
+
+@pytest.mark.asyncio
+async def test_stream_tts_immediately_synthesizes_each_segment():
+    """Test that each segment is synthesized in order"""
+    # Arrange
+    tts = FakeTTSService()
+    seen = []
+
+    async def on_segment(segment):
+        seen.append(segment)
+
+    # Act
+    chunks = [
+        chunk async for chunk in stream_tts_immediately(
+            _tokens("First one. ", "Second one."),
+            tts,
+            "voice",
+            on_segment=on_segment
+        )
+    ]
+
+    # Assert
+    assert chunks == [b"audio:First one.", b"audio:Second one."]
+    assert tts.segments == ["First one.", "Second one."]
+    assert seen == ["First one.", "Second one."]
+
+
+@pytest.mark.asyncio
+async def test_stream_tts_immediately_starts_before_llm_finishes():
+    """Test that TTS starts while the token stream is still open"""
+    # Arrange
+    tts = FakeTTSService()
+    release = asyncio.Event()
+
+    async def slow_tokens():
+        yield "Ready now. "
+        await release.wait()
+        yield "Later."
+
+    stream = stream_tts_immediately(slow_tokens(), tts, "voice")
+
+    # Act
+    first = await asyncio.wait_for(stream.__anext__(), timeout=1)
+    release.set()
+    rest = [chunk async for chunk in stream]
+
+    # Assert
+    assert first == b"audio:Ready now."
+    assert rest == [b"audio:Later."]
+
+
+@pytest.mark.asyncio
+async def test_stream_tts_immediately_propagates_llm_error():
+    """Test that token stream errors reach the consumer"""
+    # Arrange
+    tts = FakeTTSService()
+
+    async def failing_tokens():
+        yield "Partial. "
+        raise Exception("LLM stream failed")
+
+    # Act & Assert
+    with pytest.raises(Exception, match="LLM stream failed"):
+        async for chunk in stream_tts_immediately(failing_tokens(), tts, "voice"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stream_tts_immediately_closes_tokens_on_early_exit():
+    """Test that the token stream is closed when the consumer stops early"""
+    # Arrange
+    tts = FakeTTSService()
+    closed = asyncio.Event()
+
+    async def endless_tokens():
+        try:
+            while True:
+                yield "More. "
+                await asyncio.sleep(0)
+        finally:
+            closed.set()
+
+    stream = stream_tts_immediately(endless_tokens(), tts, "voice")
+
+    # Act
+    await stream.__anext__()
+    await stream.aclose()
+
+    # Assert
+    assert closed.is_set()
+
+
+@pytest.mark.asyncio
+async def test_stream_tts_immediately_aborts_tts_on_cancel():
+    """Test that cancelling the consumer closes the in-flight TTS stream"""
+    # Arrange
+    tts_closed = asyncio.Event()
+    started = asyncio.Event()
+
+    class SlowTTSService:
+        async def synthesize_stream(self, text, voice_id):
+            try:
+                yield b"first"
+                started.set()
+                await asyncio.sleep(10)
+                yield b"never"
+            finally:
+                tts_closed.set()
+
+    async def consume():
+        async for _ in stream_tts_immediately(_tokens("Hello there. "), SlowTTSService(), "voice"):
+            pass
+
+    task = asyncio.create_task(consume())
+    await started.wait()
+
+    # Act
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    # Assert
+    assert tts_closed.is_set()
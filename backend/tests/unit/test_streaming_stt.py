@@ -0,0 +1,138 @@
+import pytest
+import numpy as np
+from unittest.mock import AsyncMock, MagicMock
+from app.services.streaming_stt import (
+    StreamingTranscriber, TranscriptionBackend, WhisperBackend, create_stt_backend
+)
+
+SAMPLE_RATE = 16000
+
+
+class ScriptedBackend(TranscriptionBackend):
+    """Returns queued transcripts and records the audio it was given"""
+
+    def __init__(self, *transcripts):
+        self.transcripts = list(transcripts)
+        self.calls = []
+
+    async def transcribe(self, samples, sample_rate):
+        self.calls.append(samples.copy())
+        return self.transcripts.pop(0)
+
+
+def _pcm(ms, amplitude=3000):
+    samples = np.full(SAMPLE_RATE * ms // 1000, amplitude, dtype=np.int16)
+    samples[::2] *= -1
+    return samples.tobytes()
+
+
+@pytest.mark.asyncio
+async def test_commits_words_consecutive_passes_agree_on():
+    """Test that only the agreed prefix becomes stable"""
+    # Arrange
+    backend = ScriptedBackend("what are", "what are your ours", "what are your hours today")
+    transcriber = StreamingTranscriber(backend, SAMPLE_RATE, interval_ms=500)
+
+    # Act
+    results = []
+    for _ in range(3):
+        transcriber.feed(_pcm(500))
+        results.append(await transcriber.update())
+
+    # Assert
+    assert [r.stable for r in results] == ["", "what are", "what are your"]
+    assert results[-1].text == "what are your hours today"
+
+
+@pytest.mark.asyncio
+async def test_stable_prefix_never_shrinks():
+    """Test that a revised hypothesis does not retract stable words"""
+    # Arrange
+    backend = ScriptedBackend("book a table", "book a table", "look a cable")
+    transcriber = StreamingTranscriber(backend, SAMPLE_RATE)
+
+    # Act
+    for _ in range(3):
+        transcriber.feed(_pcm(600))
+        partial = await transcriber.update()
+
+    # Assert
+    assert partial.stable == "book a table"
+    assert partial.text == "book a table"
+
+
+@pytest.mark.asyncio
+async def test_due_after_interval():
+    """Test that a pass is due once interval_ms of new audio arrived"""
+    # Arrange
+    transcriber = StreamingTranscriber(ScriptedBackend("hi"), SAMPLE_RATE, interval_ms=600)
+
+    # Act & Assert
+    transcriber.feed(_pcm(300))
+    assert not transcriber.due
+    transcriber.feed(_pcm(300))
+    assert transcriber.due
+    await transcriber.update()
+    assert not transcriber.due
+
+
+@pytest.mark.asyncio
+async def test_rolls_full_window_at_quietest_point():
+    """Test that a full window is committed up to its quietest frame"""
+    # Arrange
+    backend = ScriptedBackend("first sentence", "second")
+    transcriber = StreamingTranscriber(backend, SAMPLE_RATE, window_ms=1000)
+    transcriber.feed(_pcm(700) + _pcm(40, amplitude=0) + _pcm(260))
+
+    # Act
+    partial = await transcriber.update()
+
+    # Assert
+    head, tail = backend.calls
+    assert len(head) == SAMPLE_RATE * 700 // 1000
+    assert len(head) + len(tail) == SAMPLE_RATE
+    assert partial.stable == "first sentence"
+    assert partial.text == "first sentence second"
+
+
+@pytest.mark.asyncio
+async def test_reset_starts_a_new_utterance():
+    """Test that reset forgets audio and committed text"""
+    # Arrange
+    transcriber = StreamingTranscriber(ScriptedBackend("one", "one", "two"), SAMPLE_RATE)
+    for _ in range(2):
+        transcriber.feed(_pcm(600))
+        await transcriber.update()
+
+    # Act
+    transcriber.reset()
+    transcriber.feed(_pcm(600))
+    partial = await transcriber.update()
+
+    # Assert
+    assert partial.text == "two"
+    assert partial.stable == ""
+
+
+@pytest.mark.asyncio
+async def test_whisper_backend_uses_transcribe_pcm():
+    """Test that the whisper backend goes through STTService.transcribe_pcm"""
+    # Arrange
+    stt_service = MagicMock()
+    stt_service.transcribe_pcm = AsyncMock(return_value="hello")
+    samples = np.zeros(160, dtype=np.int16)
+
+    # Act
+    text = await create_stt_backend(stt_service, "whisper").transcribe(samples, SAMPLE_RATE)
+
+    # Assert
+    assert text == "hello"
+    stt_service.transcribe_pcm.assert_awaited_once_with(samples, SAMPLE_RATE)
+
+
+def test_create_stt_backend_rejects_unknown_backend():
+    """Test that an unknown backend name is rejected"""
+    # Act & Assert
+    assert isinstance(create_stt_backend(MagicMock()), WhisperBackend)
+    with pytest.raises(ValueError):
+        create_stt_backend(MagicMock(), "nope")
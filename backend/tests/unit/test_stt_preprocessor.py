@@ -0,0 +1,129 @@
+import pytest
+import io
+import shutil
+import wave
+import numpy as np
+from app.services.stt_preprocessor import STTPreprocessor, UploadPolicy
+
+
+def _tone(ms, sample_rate, amplitude=0.5):
+    t = np.arange(sample_rate * ms // 1000) / sample_rate
+    return (np.sin(2 * np.pi * 300 * t) * amplitude * 32767).astype(np.int16)
+
+
+def _silence(ms, sample_rate):
+    return np.zeros(sample_rate * ms // 1000, dtype=np.int16)
+
+
+def _read_wav(data):
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        return wav.getframerate(), wav.getnchannels(), wav.getnframes()
+
+
+@pytest.mark.asyncio
+async def test_prepare_trims_and_resamples_to_wav():
+    """Test that prepare() trims silence and resamples 48 kHz to 16 kHz WAV"""
+    # Arrange
+    preprocessor = STTPreprocessor(UploadPolicy(padding_ms=0))
+    samples = np.concatenate([_silence(500, 48000), _tone(300, 48000), _silence(500, 48000)])
+
+    # Act
+    prepared = await preprocessor.prepare(samples, 48000)
+
+    # Assert
+    assert prepared.filename == "audio.wav"
+    rate, channels, frames = _read_wav(prepared.data)
+    assert rate == 16000
+    assert channels == 1
+    assert frames == pytest.approx(16000 * 0.3, abs=16000 * 0.02)
+    assert prepared.duration == pytest.approx(0.3, abs=0.02)
+
+
+@pytest.mark.asyncio
+async def test_prepare_downmixes_stereo():
+    """Test that interleaved stereo is uploaded as mono"""
+    # Arrange
+    preprocessor = STTPreprocessor(UploadPolicy(trim_silence=False))
+    mono = _tone(100, 16000)
+    stereo = np.repeat(mono, 2)
+
+    # Act
+    prepared = await preprocessor.prepare(stereo, 16000, channels=2)
+
+    # Assert
+    rate, channels, frames = _read_wav(prepared.data)
+    assert channels == 1
+    assert frames == len(mono)
+
+
+@pytest.mark.asyncio
+async def test_prepare_silent_audio_returns_none():
+    """Test that all-silent audio is not uploaded"""
+    # Arrange
+    preprocessor = STTPreprocessor(UploadPolicy())
+
+    # Act
+    prepared = await preprocessor.prepare(_silence(500, 16000), 16000)
+
+    # Assert
+    assert prepared is None
+
+
+@pytest.mark.asyncio
+async def test_prepare_keeps_silence_when_trimming_disabled():
+    """Test that trim_silence=False uploads the full buffer"""
+    # Arrange
+    preprocessor = STTPreprocessor(UploadPolicy(trim_silence=False))
+
+    # Act
+    prepared = await preprocessor.prepare(_silence(500, 16000), 16000)
+
+    # Assert
+    assert _read_wav(prepared.data)[2] == 8000
+
+
+@pytest.mark.asyncio
+async def test_prepare_opus_uses_encoder_output(tmp_path):
+    """Test that the opus format uploads the encoder's output as .ogg"""
+    # Arrange: a stand-in encoder that echoes stdin back
+    encoder = tmp_path / "fake-ffmpeg"
+    encoder.write_text("#!/bin/sh\nexec cat\n")
+    encoder.chmod(0o755)
+
+    preprocessor = STTPreprocessor(
+        UploadPolicy(format="opus", trim_silence=False),
+        ffmpeg_path=str(encoder)
+    )
+    samples = _tone(20, 16000)
+
+    # Act
+    prepared = await preprocessor.prepare(samples, 16000)
+
+    # Assert
+    assert prepared.filename == "audio.ogg"
+    assert prepared.data == samples.tobytes()
+
+
+@pytest.mark.asyncio
+async def test_prepare_opus_encoder_failure_raises():
+    """Test that a failing encoder raises RuntimeError"""
+    # Arrange
+    preprocessor = STTPreprocessor(
+        UploadPolicy(format="opus", trim_silence=False),
+        ffmpeg_path=shutil.which("false")
+    )
+
+    # Act & Assert
+    with pytest.raises(RuntimeError, match="Opus encoding failed"):
+        await preprocessor.prepare(_tone(20, 16000), 16000)
+
+
+def test_upload_policy_from_settings():
+    """Test that the default policy comes from settings"""
+    # Arrange & Act
+    policy = UploadPolicy.from_settings()
+
+    # Assert
+    assert policy.sample_rate == 16000
+    assert policy.format == "wav"
+    assert policy.trim_silence is True
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 import io
+import numpy as np
 from app.services.stt_service import STTService
 
 
@@ -165,4 +166,47 @@ def test_stt_service_repr():
 
     # Act & Assert
     repr_str = repr(service)
-    assert "STTService" in repr_str
\ No newline at end of file
+    assert "STTService" in repr_str
+
+@pytest.mark.asyncio
+async def test_transcribe_pcm_uploads_prepared_audio():
+    """Test that transcribe_pcm() uploads the preprocessed audio"""
+    # Arrange
+    mock_client = AsyncMock()
+    mock_client.audio.transcriptions.create = AsyncMock(return_value="Hello")
+
+    preprocessor = MagicMock()
+    preprocessor.prepare = AsyncMock(
+        return_value=MagicMock(data=b"RIFFwav", filename="audio.wav")
+    )
+
+    service = STTService(client=mock_client, preprocessor=preprocessor)
+    samples = np.zeros(160, dtype=np.int16)
+
+    # Act
+    result = await service.transcribe_pcm(samples, 48000)
+
+    # Assert
+    assert result == "Hello"
+    preprocessor.prepare.assert_called_once_with(samples, 48000, 1)
+    call_args = mock_client.audio.transcriptions.create.call_args
+    assert call_args[1]['file'].name == "audio.wav"
+    assert call_args[1]['file'].getvalue() == b"RIFFwav"
+
+
+@pytest.mark.asyncio
+async def test_transcribe_pcm_skips_silent_audio():
+    """Test that transcribe_pcm() does not call the API for silence"""
+    # Arrange
+    mock_client = AsyncMock()
+    preprocessor = MagicMock()
+    preprocessor.prepare = AsyncMock(return_value=None)
+
+    service = STTService(client=mock_client, preprocessor=preprocessor)
+
+    # Act
+    result = await service.transcribe_pcm(np.zeros(160, dtype=np.int16), 16000)
+
+    # Assert
+    assert result == ""
+    mock_client.audio.transcriptions.create.assert_not_called()
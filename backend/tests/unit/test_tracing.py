@@ -0,0 +1,208 @@
+import pytest
+from unittest.mock import AsyncMock
+from app.services.tracing import (
+    LogSpanExporter, TracedTTS, Tracer, TurnTrace, UtteranceTiming,
+    create_span_exporter, otlp_attributes, traced_tokens
+)
+
+
+async def _tokens(items, closed=None):
+    try:
+        for item in items:
+            yield item
+    finally:
+        if closed is not None:
+            closed.append(True)
+
+
+def test_span_ends_when_block_raises():
+    """Test that a failing stage still gets an end time"""
+    # Arrange
+    trace = TurnTrace("s1", turn_id=1)
+
+    # Act
+    with pytest.raises(RuntimeError):
+        with trace.span("stt"):
+            raise RuntimeError("boom")
+
+    # Assert
+    assert trace.spans[0].end_ns is not None
+
+
+def test_summary_sums_repeated_stages():
+    """Test that repeated stage spans are summed per name"""
+    # Arrange
+    trace = TurnTrace("s1", start_ns=0)
+    trace.add("tts.segment", 0, 2_000_000)
+    trace.add("tts.segment", 5_000_000, 8_000_000)
+    trace.root.end_ns = 10_000_000
+
+    # Act
+    summary = trace.summary()
+
+    # Assert
+    assert summary == {'turn': 10.0, 'tts.segment': 5.0}
+
+
+def test_to_otlp_links_spans_to_turn():
+    """Test the OTLP/JSON layout, parent links and identity attributes"""
+    # Arrange
+    trace = TurnTrace("s1", turn_id=3, agent_id="receptionist")
+    with trace.span("stt", audio_bytes=640):
+        pass
+    trace.end(outcome="completed")
+
+    # Act
+    spans = trace.to_otlp()['resourceSpans'][0]['scopeSpans'][0]['spans']
+
+    # Assert
+    root, stt = spans
+    assert root['name'] == "turn" and 'parentSpanId' not in root
+    assert stt['parentSpanId'] == root['spanId']
+    assert stt['traceId'] == root['traceId'] and len(root['traceId']) == 32
+    assert {'key': 'session.id', 'value': {'stringValue': 's1'}} in root['attributes']
+    assert {'key': 'turn.id', 'value': {'intValue': '3'}} in root['attributes']
+    assert {'key': 'audio_bytes', 'value': {'intValue': '640'}} in stt['attributes']
+    assert int(root['endTimeUnixNano']) >= int(root['startTimeUnixNano'])
+
+
+def test_otlp_attributes_types():
+    """Test that attribute values get their OTLP types and None is skipped"""
+    # Act
+    encoded = otlp_attributes({'a': True, 'b': 1.5, 'c': "x", 'd': None})
+
+    # Assert
+    assert encoded == [
+        {'key': 'a', 'value': {'boolValue': True}},
+        {'key': 'b', 'value': {'doubleValue': 1.5}},
+        {'key': 'c', 'value': {'stringValue': 'x'}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_traced_tokens_records_ttft_and_total():
+    """Test that LLM spans are recorded around the token stream"""
+    # Arrange
+    trace = TurnTrace("s1")
+
+    # Act
+    tokens = [t async for t in traced_tokens(trace, _tokens(["a", "b"]), speculative=True)]
+
+    # Assert
+    assert tokens == ["a", "b"]
+    llm, ttft = trace.spans
+    assert (llm.name, ttft.name) == ("llm", "llm.ttft")
+    assert llm.attributes == {'speculative': True, 'tokens': 2}
+    assert ttft.start_ns == llm.start_ns
+
+
+@pytest.mark.asyncio
+async def test_traced_tokens_closes_wrapped_stream():
+    """Test that closing the wrapper early closes the upstream stream"""
+    # Arrange
+    closed = []
+    stream = traced_tokens(TurnTrace("s1"), _tokens(["a", "b", "c"], closed))
+
+    # Act
+    await stream.__anext__()
+    await stream.aclose()
+
+    # Assert
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_traced_tts_records_segments_and_first_byte():
+    """Test that each segment is a span and the turn's first byte is marked once"""
+    # Arrange
+    class FakeTTS:
+        async def synthesize_stream(self, text, voice_id):
+            yield b"a"
+            yield b"b"
+
+    trace = TurnTrace("s1")
+    tts = TracedTTS(FakeTTS(), trace)
+
+    # Act
+    for text in ["Hello.", "Bye."]:
+        assert [c async for c in tts.synthesize_stream(text, "voice")] == [b"a", b"b"]
+
+    # Assert
+    names = [s.name for s in trace.spans]
+    assert names.count("tts.segment") == 2
+    assert names.count("tts.ttfb") == 1
+    assert 'ttfb_ms' in trace.spans[0].attributes
+
+
+def test_utterance_timing_starts_trace_at_last_chunk():
+    """Test that the trace starts when the endpointing chunk was read"""
+    # Arrange
+    timing = UtteranceTiming()
+    timing.record(0, 1_000_000, 3_000_000, 4_000_000)
+    timing.record(10_000_000, 12_000_000, 13_000_000, 15_000_000)
+
+    # Act
+    trace = timing.start_trace("s1", "receptionist")
+
+    # Assert
+    assert trace.root.start_ns == 10_000_000
+    receive, decode, vad = trace.spans
+    assert receive.duration_ms == 2.0 and receive.attributes == {'chunks': 2}
+    assert decode.duration_ms == 1.0 and decode.attributes == {'utterance_ms': 3.0}
+    assert vad.duration_ms == 2.0 and vad.attributes == {'utterance_ms': 3.0}
+    assert timing.chunks == 0
+
+
+@pytest.mark.asyncio
+async def test_tracer_exports_buffered_traces_once():
+    """Test that flush exports everything buffered exactly once"""
+    # Arrange
+    exporter = LogSpanExporter()
+    exporter.export = AsyncMock()
+    tracer = Tracer(exporter)
+    trace = TurnTrace("s1")
+    trace.end()
+    tracer.record(trace)
+
+    # Act
+    await tracer.flush()
+    await tracer.flush()
+
+    # Assert
+    exporter.export.assert_awaited_once_with([trace])
+
+
+@pytest.mark.asyncio
+async def test_tracer_drops_rejected_batch():
+    """Test that an export failure drops the batch without raising"""
+    # Arrange
+    exporter = LogSpanExporter()
+    exporter.export = AsyncMock(side_effect=ConnectionError("collector down"))
+    tracer = Tracer(exporter)
+    tracer.record(TurnTrace("s1"))
+
+    # Act
+    await tracer.flush()
+
+    # Assert
+    assert tracer.dropped == 1
+
+
+def test_tracer_without_exporter_discards():
+    """Test that traces are not buffered while tracing is disabled"""
+    # Arrange
+    tracer = Tracer()
+
+    # Act
+    tracer.record(TurnTrace("s1"))
+
+    # Assert
+    assert "buffered=0" in repr(tracer)
+
+
+def test_create_span_exporter_rejects_unknown():
+    """Test exporter selection"""
+    # Act & Assert
+    assert isinstance(create_span_exporter("log"), LogSpanExporter)
+    with pytest.raises(ValueError):
+        create_span_exporter("zipkin")
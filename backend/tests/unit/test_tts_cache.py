@@ -0,0 +1,264 @@
+import pytest
+from types import SimpleNamespace
+from app.services.tts_cache import CHUNK_SIZE, PhraseCache, cache_key, warm_cache
+from app.services.tts_service import TTSService
+
+SETTINGS = {"stability": 0.5, "similarity_boost": 0.75}
+
+
+def _service(cache, chunks=(b"aa", b"bb"), fail=False):
+    """TTSService whose API stream is replaced by canned chunks."""
+    service = TTSService(cache=cache)
+    service.api_calls = []
+
+    async def fake_stream(text, voice_id):
+        service.api_calls.append((voice_id, text))
+        if fail:
+            raise Exception("TTS API error: down")
+        for chunk in chunks:
+            yield chunk
+
+    service._stream_api = fake_stream
+    return service
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_cache_key_ignores_whitespace():
+    """Test that equivalent text maps to the same key"""
+    # Act & Assert
+    normalized = cache_key("v", "Hello, there", "m", SETTINGS)
+    assert cache_key("v", "Hello,  there ", "m", SETTINGS) == normalized
+
+
+def test_cache_key_differs_by_voice_model_and_settings():
+    """Test that voice, model and voice settings are part of the key"""
+    # Arrange
+    base = cache_key("v", "Hello", "m", SETTINGS)
+
+    # Act & Assert
+    assert cache_key("other", "Hello", "m", SETTINGS) != base
+    assert cache_key("v", "Hello", "other", SETTINGS) != base
+    assert cache_key("v", "Hello", "m", {**SETTINGS, "stability": 0.9}) != base
+
+
+@pytest.mark.asyncio
+async def test_get_returns_stored_audio():
+    """Test that get() returns audio stored with put()"""
+    # Arrange
+    cache = PhraseCache()
+    await cache.put("k", b"audio")
+
+    # Act & Assert
+    assert await cache.get("k") == b"audio"
+    assert await cache.get("missing") is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_put_evicts_least_recently_used():
+    """Test that the memory tier stays under max_bytes"""
+    # Arrange
+    cache = PhraseCache(max_bytes=10)
+    await cache.put("a", b"12345")
+    await cache.put("b", b"12345")
+    await cache.get("a")  # a becomes most recently used
+
+    # Act
+    await cache.put("c", b"12345")
+
+    # Assert
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"12345"
+    assert cache.size == 10
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_new_instance(tmp_path):
+    """Test that phrases written to disk are loaded by a fresh cache"""
+    # Arrange
+    await PhraseCache(cache_dir=str(tmp_path)).put("abcdef", b"audio")
+    cache = PhraseCache(cache_dir=str(tmp_path))
+
+    # Act
+    audio = await cache.get("abcdef")
+
+    # Assert
+    assert audio == b"audio"
+    assert cache.disk_hits == 1
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_evicts_least_recently_used(tmp_path):
+    """Test that the disk tier stays under disk_max_bytes"""
+    # Arrange
+    cache = PhraseCache(cache_dir=str(tmp_path), disk_max_bytes=10)
+    await cache.put("aa01", b"12345")
+    await cache.put("bb02", b"12345")
+    cache._entries.clear()  # force the next lookup to disk
+    await cache.get("aa01")  # aa01 becomes most recently used on disk
+
+    # Act
+    await cache.put("cc03", b"12345")
+
+    # Assert
+    files = sorted(path.stem for path in tmp_path.glob("*/*.mp3"))
+    assert files == ["aa01", "cc03"]
+    assert cache.disk_size == 10
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_indexes_existing_files(tmp_path):
+    """Test that files left by a previous process count toward the disk cap"""
+    # Arrange
+    await PhraseCache(cache_dir=str(tmp_path)).put("aa01", b"12345")
+    cache = PhraseCache(cache_dir=str(tmp_path), disk_max_bytes=8)
+
+    # Act
+    await cache.put("bb02", b"12345")
+
+    # Assert
+    assert [path.stem for path in tmp_path.glob("*/*.mp3")] == ["bb02"]
+    assert cache.disk_size == 5
+
+
+def test_accepts_only_pinned_text_by_default():
+    """Test that unpinned text is cached only when max_text_chars opts in"""
+    # Arrange
+    default = PhraseCache(pinned=["Hello,  there"])
+    short_text = PhraseCache(max_text_chars=5)
+
+    # Act & Assert
+    assert default.accepts("Hello, there")
+    assert not default.accepts("Hi")
+    assert short_text.accepts("Hi")
+    assert not short_text.accepts("Hello, there")
+
+
+@pytest.mark.asyncio
+async def test_stream_replays_in_chunks():
+    """Test that cached audio is replayed in CHUNK_SIZE pieces"""
+    # Arrange
+    cache = PhraseCache()
+    audio = b"x" * (CHUNK_SIZE * 2 + 10)
+
+    # Act
+    chunks = await _collect(cache.stream(audio))
+
+    # Assert
+    assert [len(c) for c in chunks] == [CHUNK_SIZE, CHUNK_SIZE, 10]
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_serves_repeat_from_cache():
+    """Test that a repeated pinned phrase is not synthesized twice"""
+    # Arrange
+    service = _service(PhraseCache(pinned=["Hello"]))
+
+    # Act
+    first = await _collect(service.synthesize_stream(text="Hello", voice_id="v"))
+    second = await _collect(service.synthesize_stream(text=" Hello ", voice_id="v"))
+
+    # Assert
+    assert first == [b"aa", b"bb"]
+    assert b"".join(second) == b"aabb"
+    assert service.api_calls == [("v", "Hello")]
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_skips_cache_for_unpinned_text():
+    """Test that LLM sentences are not cached by default"""
+    # Arrange
+    cache = PhraseCache()
+    service = _service(cache)
+
+    # Act
+    await _collect(service.synthesize_stream(text="Sure.", voice_id="v"))
+
+    # Assert
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_skips_cache_for_long_text():
+    """Test that text longer than max_text_chars is never cached"""
+    # Arrange
+    cache = PhraseCache(max_text_chars=5)
+    service = _service(cache)
+
+    # Act
+    await _collect(service.synthesize_stream(text="A longer sentence", voice_id="v"))
+
+    # Assert
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_does_not_cache_aborted_stream():
+    """Test that a stream closed early is not stored"""
+    # Arrange
+    cache = PhraseCache(pinned=["Hello"])
+    service = _service(cache)
+    stream = service.synthesize_stream(text="Hello", voice_id="v")
+
+    # Act
+    await anext(stream)
+    await stream.aclose()
+
+    # Assert
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_synthesizes_each_voice_once():
+    """Test that warm_cache() covers every agent voice and skips cached phrases"""
+    # Arrange
+    service = _service(PhraseCache())
+    agents = [
+        SimpleNamespace(voice_id="v1", greeting=None),
+        SimpleNamespace(voice_id="v2", greeting=None),
+        SimpleNamespace(voice_id="v1", greeting=None),
+    ]
+
+    # Act
+    warmed, failed = await warm_cache(service, agents, ["Hi", "Pardon?"])
+    await warm_cache(service, agents, ["Hi", "Pardon?"])
+
+    # Assert
+    assert (warmed, failed) == (4, 0)
+    assert len(service.api_calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_counts_failures():
+    """Test that warm_cache() logs and counts failures without raising"""
+    # Arrange
+    service = _service(PhraseCache(), fail=True)
+
+    # Act
+    agents = [SimpleNamespace(voice_id="v", greeting=None)]
+    warmed, failed = await warm_cache(service, agents, ["Hi"])
+
+    # Assert
+    assert (warmed, failed) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_pins_long_greetings():
+    """Test that greetings are warmed and cached even past max_text_chars"""
+    # Arrange
+    cache = PhraseCache(max_text_chars=5)
+    service = _service(cache)
+    agent = SimpleNamespace(voice_id="v", greeting="Thank you for calling, how can I help?")
+
+    # Act
+    await warm_cache(service, [agent], [])
+    await _collect(service.synthesize_stream(text=agent.greeting, voice_id="v"))
+
+    # Assert
+    assert len(cache) == 1
+    assert len(service.api_calls) == 1
@@ -0,0 +1,101 @@
+import pytest
+import asyncio
+from app.websocket.turns import TurnController
+
+
+@pytest.mark.asyncio
+async def test_start_runs_turn_in_background():
+    """Test that start() runs the turn without blocking the caller"""
+    # Arrange
+    controller = TurnController("session")
+    release = asyncio.Event()
+    done = []
+
+    async def turn():
+        await release.wait()
+        done.append(True)
+
+    # Act
+    task = await controller.start(turn())
+
+    # Assert
+    assert controller.active
+    assert controller.turn_id == 1
+    assert task.get_name() == "turn:session:1"
+
+    release.set()
+    await controller.wait()
+    assert done == [True]
+    assert not controller.active
+
+
+@pytest.mark.asyncio
+async def test_interrupt_cancels_running_turn():
+    """Test that interrupt() cancels the turn and runs its cleanup"""
+    # Arrange
+    controller = TurnController("session")
+    cleaned_up = []
+
+    async def turn():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            cleaned_up.append(True)
+
+    await controller.start(turn())
+    await asyncio.sleep(0)
+
+    # Act
+    interrupted = await controller.interrupt()
+
+    # Assert
+    assert interrupted
+    assert cleaned_up == [True]
+    assert controller.interruptions == 1
+    assert not controller.active
+
+
+@pytest.mark.asyncio
+async def test_interrupt_without_turn_returns_false():
+    """Test that interrupt() is a no-op when nothing is running"""
+    # Arrange
+    controller = TurnController("session")
+
+    # Act & Assert
+    assert await controller.interrupt() is False
+    assert controller.interruptions == 0
+
+
+@pytest.mark.asyncio
+async def test_start_supersedes_previous_turn():
+    """Test that starting a turn cancels the unfinished one"""
+    # Arrange
+    controller = TurnController("session")
+    first = await controller.start(asyncio.sleep(10))
+
+    # Act
+    second = await controller.start(asyncio.sleep(0))
+    await controller.wait()
+
+    # Assert
+    assert first.cancelled()
+    assert second.done() and not second.cancelled()
+    assert controller.turn_id == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_turn_is_logged(caplog):
+    """Test that a failing turn is logged rather than lost"""
+    # Arrange
+    controller = TurnController("session")
+
+    async def turn():
+        raise RuntimeError("boom")
+
+    # Act
+    task = await controller.start(turn())
+    await controller.wait()
+
+    # Assert
+    assert isinstance(task.exception(), RuntimeError)
+    assert "turn:session:1 failed" in caplog.text
@@ -0,0 +1,147 @@
+import numpy as np
+from app.services.vad import VADConfig, VADEvent, VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+
+
+def _tone(ms, amplitude=0.5):
+    """16-bit PCM sine tone"""
+    t = np.arange(SAMPLE_RATE * ms // 1000) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 440 * t) * amplitude * 32767).astype("<i2").tobytes()
+
+
+def _silence(ms):
+    """16-bit PCM digital silence"""
+    return bytes(SAMPLE_RATE * ms // 1000 * 2)
+
+
+def _detector(**overrides):
+    config = VADConfig(sample_rate=SAMPLE_RATE, frame_ms=20, min_speech_ms=60,
+                       hangover_ms=200, **overrides)
+    return VoiceActivityDetector(config)
+
+
+def test_speech_start_after_min_speech():
+    """Test that SPEECH_START is emitted once enough speech is seen"""
+    # Arrange
+    vad = _detector()
+
+    # Act
+    short = vad.process(_tone(40))
+    more = vad.process(_tone(40))
+
+    # Assert
+    assert short == []
+    assert more == [VADEvent.SPEECH_START]
+    assert vad.in_speech
+
+
+def test_speech_end_after_hangover():
+    """Test that SPEECH_END is emitted after hangover_ms of silence"""
+    # Arrange
+    vad = _detector()
+    vad.process(_tone(200))
+
+    # Act
+    pause = vad.process(_silence(100))
+    end = vad.process(_silence(100))
+
+    # Assert
+    assert pause == []
+    assert end == [VADEvent.SPEECH_END]
+    assert not vad.in_speech
+
+
+def test_short_noise_burst_ignored():
+    """Test that bursts shorter than min_speech_ms are ignored"""
+    # Arrange
+    vad = _detector()
+
+    # Act
+    events = vad.process(_tone(20) + _silence(300))
+
+    # Assert
+    assert events == []
+    assert not vad.in_speech
+
+
+def test_short_pause_does_not_end_utterance():
+    """Test that pauses shorter than the hangover keep the utterance open"""
+    # Arrange
+    vad = _detector()
+
+    # Act
+    events = vad.process(_tone(200) + _silence(100) + _tone(200) + _silence(200))
+
+    # Assert
+    assert events == [VADEvent.SPEECH_START, VADEvent.SPEECH_END]
+
+
+def test_quiet_audio_below_threshold_is_silence():
+    """Test that audio below threshold_db is treated as silence"""
+    # Arrange
+    vad = _detector(threshold_db=-20.0)
+
+    # Act
+    events = vad.process(_tone(300, amplitude=0.01))
+
+    # Assert
+    assert events == []
+
+
+def test_handles_chunks_that_split_frames():
+    """Test that odd-sized chunks are reassembled into frames"""
+    # Arrange
+    vad = _detector()
+    audio = _tone(200) + _silence(300)
+
+    # Act
+    events = []
+    for i in range(0, len(audio), 333):
+        events.extend(vad.process(audio[i:i + 333]))
+
+    # Assert
+    assert events == [VADEvent.SPEECH_START, VADEvent.SPEECH_END]
+
+
+def test_reset_clears_state():
+    """Test that reset() returns the detector to idle"""
+    # Arrange
+    vad = _detector()
+    vad.process(_tone(200))
+
+    # Act
+    vad.reset()
+
+    # Assert
+    assert not vad.in_speech
+    assert vad.process(_silence(300)) == []
+
+
+
+def test_pause_and_resume_within_hangover():
+    """Test that PAUSE fires after pause_ms of silence and RESUME when speech returns"""
+    # Arrange
+    vad = _detector(pause_ms=80)
+    vad.process(_tone(100))
+
+    # Act
+    paused = vad.process(_silence(100))
+    resumed = vad.process(_tone(20))
+    ended = vad.process(_silence(200))
+
+    # Assert
+    assert paused == [VADEvent.PAUSE]
+    assert resumed == [VADEvent.RESUME]
+    assert ended == [VADEvent.PAUSE, VADEvent.SPEECH_END]
+    assert not vad.paused
+
+
+def test_pause_disabled_by_default():
+    """Test that PAUSE/RESUME are not emitted without pause_ms"""
+    # Arrange
+    vad = _detector()
+    vad.process(_tone(100))
+
+    # Act & Assert
+    assert vad.process(_silence(200)) == [VADEvent.SPEECH_END]
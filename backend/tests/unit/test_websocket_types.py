@@ -13,6 +13,7 @@ def test_message_type_enum_values():
     assert MessageType.LLM_RESPONSE == "llm_response"
     assert MessageType.AUDIO_RESPONSE == "audio_response"
     assert MessageType.STATUS_UPDATE == "status_update"
+    assert MessageType.FLUSH_AUDIO == "flush_audio"
     assert MessageType.ERROR == "error"
 
 